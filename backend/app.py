@@ -1,29 +1,30 @@
 import traceback
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import (
-    create_access_token, create_refresh_token,
+    create_access_token, create_refresh_token, decode_token,
     jwt_required, get_jwt_identity, get_jwt
 )
 from datetime import datetime
 import os
-from dotenv import load_dotenv
+import codecs
+import hmac
+import click
 
-from config import Config
-from extensions import db, jwt, migrate
-from services.auth_service import AuthService
-from services.user_service import UserService
-from services.pet_service import PetService
-from services.event_service import EventService
+from config import Config  # Also loads environment variables from .env
+from extensions import (
+    db, jwt, limiter, config_limit, init_limiter, init_migrate, last_login_buffer,
+    token_denylist, place_index
+)
+import models  # noqa: F401 -- registers every table on db.metadata before services load
 from middleware.error_handlers import register_error_handlers
 from middleware.validators import validate_request
+from commands import register_commands
 from utils import slack
+from utils.lazy import LazyService
 from utils.responses import success_response, error_response
 from utils.enums import UserRoles
 
-# Load environment variables
-load_dotenv()
-
 def create_app(config_class=Config):
     """Application factory pattern"""
     app = Flask(__name__)
@@ -32,7 +33,16 @@ def create_app(config_class=Config):
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
+    last_login_buffer.init_app(app)
+    token_denylist.init_app(app)
+    place_index.init_app(app)
+    init_limiter(app)
+    
+    # Buffered last_login writes go out at the end of a request once due
+    @app.teardown_request
+    def flush_last_logins(exc):
+        if last_login_buffer.loaded:
+            last_login_buffer.flush_if_due()
     
     # CORS configuration
     CORS(app, 
@@ -44,11 +54,31 @@ def create_app(config_class=Config):
     # Register error handlers
     register_error_handlers(app)
     
-    # Initialize services
-    auth_service = AuthService()
-    user_service = UserService()
-    pet_service = PetService()
-    event_service = EventService()
+    # Register CLI commands; migrations are only wired up under the flask CLI
+    register_commands(app)
+    if click.get_current_context(silent=True) is not None:
+        init_migrate(app)
+    
+    # Initialize services (modules are imported on first use)
+    auth_service = LazyService('services.auth_service', 'AuthService')
+    user_service = LazyService('services.user_service', 'UserService')
+    pet_service = LazyService('services.pet_service', 'PetService')
+    event_service = LazyService('services.event_service', 'EventService')
+    ledger_service = LazyService('services.ledger_service', 'LedgerService')
+    feed_service = LazyService('services.feed_service', 'FeedService')
+    import_service = LazyService('services.import_service', 'EventImportService')
+    check_in_service = LazyService('services.check_in_service', 'CheckInService')
+    notification_service = LazyService('services.notification_service', 'NotificationService')
+    outbox_service = LazyService('services.outbox_service', 'OutboxService')
+    
+    # Local outbox mode: run side effects in-process once a write request has
+    # committed, instead of in a separate `flask outbox work` process
+    if app.config['OUTBOX_MODE'] == 'local':
+        @app.after_request
+        def drain_outbox(response):
+            if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+                outbox_service.drain()
+            return response
     
     # ============== JWT Configuration ==============
     
@@ -83,9 +113,15 @@ def create_app(config_class=Config):
         """Handle revoked token"""
         return error_response("Token has been revoked", 401)
     
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        """In-memory denylist lookup, no DB access per request"""
+        return token_denylist.is_revoked(jwt_payload['jti'])
+    
     # ============== Health Check ==============
     
     @app.route('/api/health', methods=['GET'])
+    @limiter.exempt
     def health_check():
         """System health check endpoint"""
         return success_response({
@@ -95,9 +131,37 @@ def create_app(config_class=Config):
             'timestamp': datetime.utcnow().isoformat()
         })
     
+    # ============== Internal Endpoints ==============
+    
+    @app.route('/api/internal/outbox/drain', methods=['GET'])
+    @limiter.exempt
+    def drain_outbox_cron():
+        """
+        Process pending outbox messages (Vercel cron)
+        Requires: Authorization: Bearer <CRON_SECRET>
+        """
+        secret = app.config.get('CRON_SECRET')
+        if not secret:
+            return error_response("Not found", 404)
+        
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f'Bearer {secret}'.encode()):
+            return error_response("Unauthorized", 401)
+        
+        result = outbox_service.drain(app.config['OUTBOX_CRON_MAX_MESSAGES'])
+        if not result['success']:
+            return error_response(result['error'], 500)
+        
+        return success_response({
+            'processed': result['processed'],
+            'retried': result['retried'],
+            'failed': result['failed']
+        })
+    
     # ============== Authentication Endpoints ==============
 
     @app.route('/api/v1/auth/google', methods=['POST'])
+    @config_limit('RATELIMIT_AUTH')
     @validate_request(['google_id', 'email', 'name'])
     def google_auth():
         """
@@ -162,6 +226,7 @@ def create_app(config_class=Config):
             return error_response(f"Authentication failed: {str(e)}", 500)
     
     @app.route('/api/v1/auth/refresh', methods=['POST'])
+    @config_limit('RATELIMIT_AUTH')
     @jwt_required(refresh=True)
     def refresh():
         """Refresh access token using refresh token"""
@@ -189,9 +254,68 @@ def create_app(config_class=Config):
         except Exception as e:
             return error_response(f"Token refresh failed: {str(e)}", 500)
     
+    @app.route('/api/v1/auth/logout', methods=['POST'])
+    @config_limit('RATELIMIT_AUTH')
+    @jwt_required(verify_type=False)
+    def logout():
+        """
+        Revoke the presented token
+        Optional: refresh_token (also revoked if it belongs to the same user)
+        """
+        try:
+            jwt_payload = get_jwt()
+            result = auth_service.revoke_token(jwt_payload)
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            data = request.get_json(silent=True) or {}
+            if data.get('refresh_token'):
+                try:
+                    refresh_payload = decode_token(data['refresh_token'], allow_expired=True)
+                except Exception:
+                    return error_response("Invalid refresh token", 400)
+                
+                if refresh_payload.get('sub') == jwt_payload.get('sub'):
+                    auth_service.revoke_token(refresh_payload)
+            
+            return success_response({'message': 'Logged out successfully'})
+            
+        except Exception as e:
+            return error_response(f"Logout failed: {str(e)}", 500)
+    
+    @app.route('/api/v1/auth/revoke', methods=['POST'])
+    @config_limit('RATELIMIT_AUTH')
+    @jwt_required()
+    @validate_request(['token'])
+    def revoke_token():
+        """
+        Revoke a specific token (own tokens, or any token for admins)
+        Required: token
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            try:
+                token_payload = decode_token(request.get_json()['token'], allow_expired=True)
+            except Exception:
+                return error_response("Invalid token", 400)
+            
+            is_admin = get_jwt().get('role') == UserRoles.ADMIN.value
+            if token_payload.get('sub') != current_user_id and not is_admin:
+                return error_response("Cannot revoke another user's token", 403)
+            
+            result = auth_service.revoke_token(token_payload)
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response({'message': 'Token revoked'})
+            
+        except Exception as e:
+            return error_response(f"Token revocation failed: {str(e)}", 500)
+    
     # ============== User Profile Endpoints ==============
     
     @app.route('/api/v1/profile', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
     @jwt_required()
     def get_profile():
         """Get authenticated user's profile with pets"""
@@ -208,6 +332,7 @@ def create_app(config_class=Config):
             return error_response(f"Failed to fetch profile: {str(e)}", 500)
     
     @app.route('/api/v1/profile', methods=['PUT'])
+    @config_limit('RATELIMIT_WRITE')
     @jwt_required()
     def update_profile():
         """Update user profile"""
@@ -225,9 +350,94 @@ def create_app(config_class=Config):
         except Exception as e:
             return error_response(f"Profile update failed: {str(e)}", 500)
     
+    @app.route('/api/v1/notifications', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
+    @jwt_required()
+    def get_notifications():
+        """
+        Authenticated user's notifications, newest first
+        Query params:
+        - cursor: next_cursor from the previous page
+        - per_page: items per page (default 20, max 100)
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            per_page = request.args.get('per_page', 20, type=int)
+            
+            if per_page < 1:
+                return error_response("Invalid pagination parameters", 400)
+            
+            if per_page > 100:
+                return error_response("Maximum 100 items per page", 400)
+            
+            result = notification_service.get_notifications(
+                current_user_id, request.args.get('cursor'), per_page
+            )
+            
+            if not result['success']:
+                return error_response(result['error'], 400)
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Failed to fetch notifications: {str(e)}", 500)
+    
+    # ============== Ledger Endpoints ==============
+    
+    @app.route('/api/v1/ledger/export', methods=['GET'])
+    @config_limit('RATELIMIT_EXPORT')
+    @jwt_required()
+    def export_ledger():
+        """
+        Stream full coin history as NDJSON or CSV
+        Query params:
+        - format: 'ndjson' (default) or 'csv'
+        - start_date, end_date: ISO datetimes bounding created_at (optional)
+        - owner_id: export another user's history (Admin only)
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            owner_id = request.args.get('owner_id', type=int)
+            
+            if owner_id and owner_id != current_user_id:
+                if get_jwt().get('role') != UserRoles.ADMIN.value:
+                    return error_response("Admin privileges required", 403)
+            else:
+                owner_id = current_user_id
+            
+            export_format = request.args.get('format', 'ndjson').lower()
+            if export_format not in ('ndjson', 'csv'):
+                return error_response("Format must be 'ndjson' or 'csv'", 400)
+            
+            try:
+                start_date = request.args.get('start_date')
+                end_date = request.args.get('end_date')
+                start_date = datetime.fromisoformat(start_date) if start_date else None
+                end_date = datetime.fromisoformat(end_date) if end_date else None
+            except ValueError:
+                return error_response("Invalid date format. Use ISO format", 400)
+            
+            if start_date and end_date and start_date >= end_date:
+                return error_response("end_date must be after start_date", 400)
+            
+            mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+            filename = f"ledger_{owner_id}.{export_format}"
+            
+            return Response(
+                stream_with_context(ledger_service.export_transactions(
+                    owner_id, export_format, start_date, end_date
+                )),
+                mimetype=mimetype,
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
+            )
+            
+        except Exception as e:
+            return error_response(f"Failed to export ledger: {str(e)}", 500)
+    
     # ============== Pet Management Endpoints ==============
     
     @app.route('/api/v1/pets', methods=['POST'])
+    @config_limit('RATELIMIT_WRITE')
     @jwt_required()
     @validate_request(['name', 'species'])
     def add_pet():
@@ -252,6 +462,7 @@ def create_app(config_class=Config):
             return error_response(f"Failed to add pet: {str(e)}", 500)
     
     @app.route('/api/v1/pets/<int:pet_id>', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
     @jwt_required()
     def get_pet(pet_id):
         """Get pet details"""
@@ -268,6 +479,7 @@ def create_app(config_class=Config):
             return error_response(f"Failed to fetch pet: {str(e)}", 500)
     
     @app.route('/api/v1/pets/<int:pet_id>', methods=['PUT'])
+    @config_limit('RATELIMIT_WRITE')
     @jwt_required()
     def update_pet(pet_id):
         """Update pet details"""
@@ -288,6 +500,7 @@ def create_app(config_class=Config):
     # ============== Event Endpoints ==============
     
     @app.route('/api/v1/events/nearby', methods=['GET'])
+    @config_limit('RATELIMIT_SEARCH')
     @jwt_required(optional=True)
     def get_nearby_events():
         """
@@ -297,20 +510,16 @@ def create_app(config_class=Config):
         - For coordinates: latitude, longitude, radius_km
         - For area: city, state (optional), country (optional)
         - page, per_page for pagination
+        - pagination=cursor (area search) for keyset paging: pass back
+          next_cursor as cursor; include_total=true adds an approximate total
+        - pet_id: only events the (caller's) pet can attend, by species and age
+        - species: only events open to this species
+        - q: keywords matched against name, description, venue and type;
+          results are ranked by relevance (page pagination only)
         """
         try:
             current_user_id = get_jwt_identity()
-            search_params = {
-                'search_type': request.args.get('search_type', 'coordinates'),
-                'latitude': request.args.get('latitude', type=float),
-                'longitude': request.args.get('longitude', type=float),
-                'radius_km': request.args.get('radius_km', 10, type=float),
-                'city': request.args.get('city'),
-                'state': request.args.get('state'),
-                'country': request.args.get('country'),
-                'page': request.args.get('page', 1, type=int),
-                'per_page': request.args.get('per_page', 10, type=int)
-            }
+            search_params = event_service.search_params_from_args(request.args)
             
             # Validate pagination
             if search_params['page'] < 1 or search_params['per_page'] < 1:
@@ -334,7 +543,105 @@ def create_app(config_class=Config):
         except Exception as e:
             return error_response(f"Failed to fetch events: {str(e)}", 500)
     
+    @app.route('/api/v1/places/autocomplete', methods=['GET'])
+    @config_limit('RATELIMIT_AUTOCOMPLETE')
+    def autocomplete_places():
+        """
+        Suggest city, state, country and venue names for area search
+        Query params:
+        - q: text typed so far
+        - types: comma-separated subset of city,state,country,venue (default all)
+        - limit: maximum suggestions (default 10, max 25)
+        """
+        try:
+            prefix = request.args.get('q', '')
+            limit = request.args.get('limit', 10, type=int)
+            kinds = [kind for kind in request.args.get('types', '').split(',') if kind]
+            
+            if limit < 1 or limit > 25:
+                return error_response("limit must be between 1 and 25", 400)
+            
+            from utils.place_index import PLACE_KINDS
+            unknown = set(kinds) - set(PLACE_KINDS)
+            if unknown:
+                return error_response(f"Unknown place types: {', '.join(sorted(unknown))}", 400)
+            
+            return success_response({
+                'suggestions': place_index.suggest(prefix, limit, kinds)
+            })
+            
+        except Exception as e:
+            return error_response(f"Failed to fetch suggestions: {str(e)}", 500)
+    
+    @app.route('/api/v1/feed', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
+    @jwt_required()
+    def get_feed():
+        """
+        Events for you: nearby, open to your pets, not yet registered, soonest first
+        Query params:
+        - page, per_page for pagination
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            page = request.args.get('page', 1, type=int)
+            per_page = request.args.get('per_page', 20, type=int)
+            
+            if page < 1 or per_page < 1:
+                return error_response("Invalid pagination parameters", 400)
+            
+            if per_page > 100:
+                return error_response("Maximum 100 items per page", 400)
+            
+            result = feed_service.get_feed(current_user_id, page, per_page)
+            
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Failed to fetch feed: {str(e)}", 500)
+    
+    @app.route('/api/v1/registrations', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
+    @jwt_required()
+    def get_registrations():
+        """
+        Authenticated user's event registrations, most recent first
+        (registrations for archived events follow the live ones)
+        Query params:
+        - when: 'upcoming' or 'past' (default both)
+        - cursor: next_cursor from the previous page
+        - per_page: items per page (default 20, max 100)
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            per_page = request.args.get('per_page', 20, type=int)
+            
+            if per_page < 1:
+                return error_response("Invalid pagination parameters", 400)
+            
+            if per_page > 100:
+                return error_response("Maximum 100 items per page", 400)
+            
+            result = event_service.get_user_registrations(
+                current_user_id,
+                when=request.args.get('when'),
+                cursor=request.args.get('cursor'),
+                per_page=per_page
+            )
+            
+            if not result['success']:
+                return error_response(result['error'], 400)
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Failed to fetch registrations: {str(e)}", 500)
+    
     @app.route('/api/v1/events/<int:event_id>/register', methods=['POST'])
+    @config_limit('RATELIMIT_WRITE')
     @jwt_required()
     def register_for_event(event_id):
         """
@@ -359,15 +666,157 @@ def create_app(config_class=Config):
         except Exception as e:
             return error_response(f"Registration failed: {str(e)}", 500)
     
+    @app.route('/api/v1/events/<int:event_id>/register', methods=['DELETE'])
+    @config_limit('RATELIMIT_WRITE')
+    @jwt_required()
+    def cancel_registration(event_id):
+        """
+        Cancel your registration for an event
+        Coins paid are refunded and the first user on the waitlist takes the spot
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            
+            result = event_service.cancel_registration(event_id, current_user_id)
+            
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Cancellation failed: {str(e)}", 500)
+    
+    @app.route('/api/v1/events/<int:event_id>/cancel', methods=['POST'])
+    @config_limit('RATELIMIT_WRITE')
+    @jwt_required()
+    def cancel_event(event_id):
+        """
+        Cancel an event (Admin only)
+        Every registration is cancelled and refunded, and the waitlist cleared
+        Optional: reason (shown to attendees)
+        """
+        try:
+            # Check admin role
+            jwt_data = get_jwt()
+            if jwt_data.get('role') != UserRoles.ADMIN.value:
+                return error_response("Admin privileges required", 403)
+            
+            data = request.get_json(silent=True) or {}
+            
+            result = event_service.cancel_event(event_id, reason=data.get('reason'))
+            
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Failed to cancel event: {str(e)}", 500)
+    
+    @app.route('/api/v1/events/<int:event_id>/waitlist', methods=['POST'])
+    @config_limit('RATELIMIT_WRITE')
+    @jwt_required()
+    def join_waitlist(event_id):
+        """
+        Join the waitlist of a full event
+        Optional: pet_ids (array of pet IDs to register when promoted)
+        Coins are charged on promotion, not now
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            data = request.get_json(silent=True) or {}
+            
+            result = event_service.join_waitlist(
+                event_id=event_id,
+                user_id=current_user_id,
+                pet_ids=data.get('pet_ids', [])
+            )
+            
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response(result['data'], 201)
+            
+        except Exception as e:
+            return error_response(f"Failed to join waitlist: {str(e)}", 500)
+    
+    @app.route('/api/v1/events/<int:event_id>/waitlist', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
+    @jwt_required()
+    def get_waitlist_position(event_id):
+        """Your position on an event's waitlist (1 = next in line)"""
+        try:
+            current_user_id = get_jwt_identity()
+            
+            result = event_service.get_waitlist_position(event_id, current_user_id)
+            
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Failed to fetch waitlist position: {str(e)}", 500)
+    
+    @app.route('/api/v1/events/<int:event_id>/waitlist', methods=['DELETE'])
+    @config_limit('RATELIMIT_WRITE')
+    @jwt_required()
+    def leave_waitlist(event_id):
+        """Leave an event's waitlist"""
+        try:
+            current_user_id = get_jwt_identity()
+            
+            result = event_service.leave_waitlist(event_id, current_user_id)
+            
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Failed to leave waitlist: {str(e)}", 500)
+    
+    @app.route('/api/v1/events/<int:event_id>/check-in', methods=['POST'])
+    @config_limit('RATELIMIT_WRITE')
+    @jwt_required()
+    @validate_request(['registrations'])
+    def check_in_registrations(event_id):
+        """
+        Check in a batch of attendees (event creator, admins and moderators)
+        Required: registrations - registration IDs, QR tokens, or objects
+                  {"registration_id" | "token", "scanned_at" (optional ISO)}
+        Safe to replay: entries already checked in are reported, not changed
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            
+            result = check_in_service.check_in(
+                event_id=event_id,
+                entries=request.get_json()['registrations'],
+                user_id=current_user_id,
+                user_role=get_jwt().get('role')
+            )
+            
+            if not result['success']:
+                return error_response(result['error'], result.get('status_code', 400))
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Check-in failed: {str(e)}", 500)
+    
     @app.route('/api/v1/events', methods=['POST'])
+    @config_limit('RATELIMIT_WRITE')
     @jwt_required()
     @validate_request(['name', 'event_type', 'start_datetime', 'end_datetime', 
-                      'address', 'city', 'latitude', 'longitude'])
+                      'address', 'city'])
     def create_event():
         """
         Create a new event (Admin only)
         Required: name, event_type, start_datetime, end_datetime, 
-                 address, city, latitude, longitude
+                 address, city
+        latitude/longitude default to the pincode or city centroid when omitted
         """
         try:
             # Check admin role
@@ -389,7 +838,73 @@ def create_app(config_class=Config):
         except Exception as e:
             return error_response(f"Failed to create event: {str(e)}", 500)
     
+    @app.route('/api/v1/events/import', methods=['POST'])
+    @config_limit('RATELIMIT_IMPORT')
+    @jwt_required()
+    def import_events():
+        """
+        Bulk-create events from a CSV or NDJSON body (Admin only)
+        Body: text/csv with a header row, or application/x-ndjson, using the
+              field names of POST /api/v1/events; list cells in CSV are
+              JSON arrays or pipe-separated ("dog|cat")
+        Query params:
+        - format: 'csv' or 'ndjson' (default from Content-Type)
+        Returns a per-line error report; valid rows are created even when
+        others fail.
+        """
+        try:
+            jwt_data = get_jwt()
+            if jwt_data.get('role') != UserRoles.ADMIN.value:
+                return error_response("Admin privileges required", 403)
+            
+            import_format = request.args.get('format')
+            if not import_format:
+                import_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+            import_format = import_format.lower()
+            if import_format not in ('csv', 'ndjson'):
+                return error_response("Format must be 'csv' or 'ndjson'", 400)
+            
+            # Decode the body as it streams in; the whole file is never held in memory
+            lines = codecs.iterdecode(request.stream, 'utf-8-sig')
+            result = import_service.import_events(lines, import_format, get_jwt_identity())
+            
+            if not result['success']:
+                return error_response(result['error'], 400)
+            
+            return success_response(result['report'], 201 if result['report']['imported'] else 200)
+            
+        except Exception as e:
+            return error_response(f"Failed to import events: {str(e)}", 500)
+    
+    @app.route('/api/v1/events', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
+    @jwt_required(optional=True)
+    def get_events_batch():
+        """
+        Get details of several events in one request (public, optional auth)
+        Query params:
+        - ids: comma-separated event IDs (or repeated ids=), returned in this order
+        """
+        try:
+            current_user_id = get_jwt_identity()
+            
+            try:
+                event_ids = event_service.event_ids_from_args(request.args)
+            except ValueError as e:
+                return error_response(str(e), 400)
+            
+            result = event_service.get_events_by_ids(event_ids, current_user_id)
+            
+            if not result['success']:
+                return error_response(result['error'], 400)
+            
+            return success_response(result['data'])
+            
+        except Exception as e:
+            return error_response(f"Failed to fetch events: {str(e)}", 500)
+    
     @app.route('/api/v1/events/<int:event_id>', methods=['GET'])
+    @config_limit('RATELIMIT_READ')
     @jwt_required(optional=True)
     def get_event_details(event_id):
         """Get event details (public endpoint with optional auth)"""
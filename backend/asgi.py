@@ -0,0 +1,337 @@
+"""
+ASGI entry point with async read endpoints
+
+Serves the read-heavy GET endpoints (event search, event details, batch
+event details, registrations, waitlist position, profile, pet details)
+on async SQLAlchemy sessions, so a slow query parks a coroutine instead
+of holding a worker thread. The handlers run the same service methods as the Flask views:
+AsyncSession.run_sync() hands them a regular Session that drives the
+async driver, and the queries themselves live in services/queries.py.
+Every other request is passed through to the Flask app unchanged.
+
+Run with any ASGI server, e.g.
+    uvicorn asgi:application --workers 2
+
+Requires asgiref and an async driver (asyncpg for PostgreSQL, aiosqlite
+for SQLite).
+"""
+import asyncio
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from flask_jwt_extended import decode_token
+from jwt.exceptions import ExpiredSignatureError
+from limits import parse as parse_limit
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from werkzeug.datastructures import MultiDict
+
+from app import app as flask_app
+from extensions import limiter, token_denylist
+from services.event_service import EventService
+from services.pet_service import PetService
+from services.user_service import UserService
+from utils.responses import success_body, error_body
+
+logger = logging.getLogger(__name__)
+
+
+class AuthError(Exception):
+    """Raised when a request's bearer token is missing or rejected"""
+
+
+def async_database_url(database_url: str) -> URL:
+    """
+    Map the app's sync database URL onto its async driver
+    
+    Args:
+        database_url: SQLALCHEMY_DATABASE_URI
+    
+    Returns:
+        URL using asyncpg (PostgreSQL) or aiosqlite (SQLite)
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == 'postgresql':
+        # asyncpg spells libpq's sslmode as ssl
+        query = dict(url.query)
+        sslmode = query.pop('sslmode', None)
+        if sslmode:
+            query['ssl'] = sslmode
+        return url.set(drivername='postgresql+asyncpg', query=query)
+    if backend == 'sqlite':
+        return url.set(drivername='sqlite+aiosqlite')
+    raise ValueError(f"No async driver configured for {backend}")
+
+
+class AsyncReadApp:
+    """ASGI app serving the read endpoints itself and delegating the rest to Flask"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = WsgiToAsgi(app)
+        self.user_service = UserService()
+        self.pet_service = PetService()
+        self.event_service = EventService()
+        self._engine = None
+        self._session_factory = None
+        
+        # (path pattern, handler, Flask endpoint name, rate limit key, auth required)
+        self.routes: List[Tuple[re.Pattern, Callable, str, str, bool]] = [
+            (re.compile(r'^/api/v1/events/nearby$'), self.get_nearby_events,
+             'get_nearby_events', 'RATELIMIT_SEARCH', False),
+            (re.compile(r'^/api/v1/events$'), self.get_events_batch,
+             'get_events_batch', 'RATELIMIT_READ', False),
+            (re.compile(r'^/api/v1/events/(?P<event_id>\d+)$'), self.get_event_details,
+             'get_event_details', 'RATELIMIT_READ', False),
+            (re.compile(r'^/api/v1/registrations$'), self.get_registrations,
+             'get_registrations', 'RATELIMIT_READ', True),
+            (re.compile(r'^/api/v1/events/(?P<event_id>\d+)/waitlist$'), self.get_waitlist_position,
+             'get_waitlist_position', 'RATELIMIT_READ', True),
+            (re.compile(r'^/api/v1/profile$'), self.get_profile,
+             'get_profile', 'RATELIMIT_READ', True),
+            (re.compile(r'^/api/v1/pets/(?P<pet_id>\d+)$'), self.get_pet,
+             'get_pet', 'RATELIMIT_READ', True)
+        ]
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for pattern, handler, endpoint, limit_key, auth_required in self.routes:
+                match = pattern.match(scope['path'])
+                if match:
+                    status, body, headers = await self._dispatch(
+                        scope, handler, endpoint, limit_key, auth_required,
+                        {name: int(value) for name, value in match.groupdict().items()}
+                    )
+                    await self._send_json(send, status, body, headers)
+                    return
+        
+        await self.wsgi(scope, receive, send)
+    
+    # ============== Read Endpoints ==============
+    
+    async def get_nearby_events(self, identity: Optional[int], args: MultiDict) -> Tuple[int, Dict]:
+        """Async twin of GET /api/v1/events/nearby"""
+        search_params = self.event_service.search_params_from_args(args)
+        
+        # Validate pagination
+        if search_params['page'] < 1 or search_params['per_page'] < 1:
+            return 400, error_body("Invalid pagination parameters")
+        
+        if search_params['per_page'] > 100:
+            return 400, error_body("Maximum 100 items per page")
+        
+        def search(session: Session) -> Dict[str, Any]:
+            # Get user for default location
+            user = self.user_service.get_user_by_id(identity, session) if identity else None
+            return self.event_service.search_events(search_params, user, session)
+        
+        result = await self._run(search)
+        if not result['success']:
+            return 400, error_body(result['error'])
+        return 200, success_body(result['data'])
+    
+    async def get_event_details(self, identity: Optional[int], args: MultiDict,
+                                event_id: int) -> Tuple[int, Dict]:
+        """Async twin of GET /api/v1/events/<id>"""
+        result = await self._run(
+            lambda session: self.event_service.get_event_details(event_id, identity, session)
+        )
+        if not result['success']:
+            return 404, error_body(result['error'])
+        return 200, success_body(result['data'])
+    
+    async def get_events_batch(self, identity: Optional[int], args: MultiDict) -> Tuple[int, Dict]:
+        """Async twin of GET /api/v1/events?ids="""
+        try:
+            event_ids = self.event_service.event_ids_from_args(args)
+        except ValueError as e:
+            return 400, error_body(str(e))
+        
+        result = await self._run(
+            lambda session: self.event_service.get_events_by_ids(event_ids, identity, session)
+        )
+        if not result['success']:
+            return 400, error_body(result['error'])
+        return 200, success_body(result['data'])
+    
+    async def get_registrations(self, identity: int, args: MultiDict) -> Tuple[int, Dict]:
+        """Async twin of GET /api/v1/registrations"""
+        per_page = args.get('per_page', 20, type=int)
+        
+        if per_page < 1:
+            return 400, error_body("Invalid pagination parameters")
+        
+        if per_page > 100:
+            return 400, error_body("Maximum 100 items per page")
+        
+        result = await self._run(
+            lambda session: self.event_service.get_user_registrations(
+                identity, args.get('when'), args.get('cursor'), per_page, session
+            )
+        )
+        if not result['success']:
+            return 400, error_body(result['error'])
+        return 200, success_body(result['data'])
+    
+    async def get_waitlist_position(self, identity: int, args: MultiDict,
+                                    event_id: int) -> Tuple[int, Dict]:
+        """Async twin of GET /api/v1/events/<id>/waitlist"""
+        result = await self._run(
+            lambda session: self.event_service.get_waitlist_position(event_id, identity, session)
+        )
+        if not result['success']:
+            return result.get('status_code', 400), error_body(result['error'])
+        return 200, success_body(result['data'])
+    
+    async def get_profile(self, identity: int, args: MultiDict) -> Tuple[int, Dict]:
+        """Async twin of GET /api/v1/profile"""
+        result = await self._run(
+            lambda session: self.user_service.get_user_profile(identity, session)
+        )
+        if not result['success']:
+            return 404, error_body(result['error'])
+        return 200, success_body(result['data'])
+    
+    async def get_pet(self, identity: int, args: MultiDict, pet_id: int) -> Tuple[int, Dict]:
+        """Async twin of GET /api/v1/pets/<id>"""
+        result = await self._run(
+            lambda session: self.pet_service.get_pet_details(pet_id, identity, session)
+        )
+        if not result['success']:
+            return result.get('status_code', 404), error_body(result['error'])
+        return 200, success_body(result['data'])
+    
+    # ============== Plumbing ==============
+    
+    async def _dispatch(self, scope, handler: Callable, endpoint: str, limit_key: str,
+                        auth_required: bool, path_params: Dict[str, int]) -> Tuple[int, Dict, List]:
+        """Apply rate limiting and JWT auth, then run the handler"""
+        headers = {
+            name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope['headers']
+        }
+        response_headers = self._cors_headers(headers)
+        
+        try:
+            client_ip = scope['client'][0] if scope.get('client') else '127.0.0.1'
+            if not await self._hit_rate_limit(client_ip, endpoint, limit_key):
+                return 429, {
+                    'success': False,
+                    'error': 'Rate limit exceeded',
+                    'message': 'Too many requests. Please try again later.'
+                }, response_headers
+            
+            identity = await self._identify(headers.get('authorization'), auth_required)
+            args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1')))
+            status, body = await handler(identity, args, **path_params)
+            return status, body, response_headers
+        
+        except AuthError as e:
+            return 401, error_body(str(e)), response_headers
+        except Exception as e:
+            logger.error(f"Error serving {scope['path']}: {str(e)}")
+            return 500, error_body("Internal server error"), response_headers
+    
+    async def _identify(self, authorization: Optional[str], required: bool) -> Optional[int]:
+        """Decode the bearer token the way flask_jwt_extended does for these views"""
+        if not authorization or not authorization.startswith('Bearer '):
+            if required:
+                raise AuthError("Authorization required")
+            return None
+        
+        try:
+            with self.app.app_context():
+                payload = decode_token(authorization[len('Bearer '):])
+        except ExpiredSignatureError:
+            raise AuthError("Token has expired")
+        except Exception:
+            raise AuthError("Invalid token")
+        
+        if payload.get('type') != 'access':
+            raise AuthError("Invalid token")
+        
+        # The denylist only hits the database on its periodic refresh
+        if token_denylist.sync_due:
+            await asyncio.to_thread(self._sync_denylist)
+        if token_denylist.is_revoked(payload['jti']):
+            raise AuthError("Token has been revoked")
+        
+        return payload[self.app.config['JWT_IDENTITY_CLAIM']]
+    
+    def _sync_denylist(self) -> None:
+        with self.app.app_context():
+            token_denylist.sync()
+    
+    async def _hit_rate_limit(self, client_ip: str, endpoint: str, limit_key: str) -> bool:
+        """Count the hit against the same storage keys the Flask views use"""
+        if not limiter.enabled:
+            return True
+        limit = parse_limit(self.app.config[limit_key])
+        # Storage backends are sync (and the db:// one may write), so keep them off the loop
+        return await asyncio.to_thread(limiter.limiter.hit, limit, client_ip, endpoint)
+    
+    def _cors_headers(self, headers: Dict[str, str]) -> List[Tuple[bytes, bytes]]:
+        """Mirror the Flask-CORS headers for allowed origins"""
+        origin = headers.get('origin')
+        origins = self.app.config['CORS_ORIGINS']
+        if not origin or (origin not in origins and '*' not in origins):
+            return []
+        return [
+            (b'access-control-allow-origin', origin.encode('latin-1')),
+            (b'access-control-allow-credentials', b'true'),
+            (b'vary', b'Origin')
+        ]
+    
+    async def _run(self, fn: Callable[[Session], Any]) -> Any:
+        """Run sync service code on an AsyncSession's connection"""
+        async with self._get_session_factory()() as session:
+            return await session.run_sync(fn)
+    
+    def _get_session_factory(self) -> async_sessionmaker:
+        if self._session_factory is None:
+            config = self.app.config
+            url = async_database_url(config['SQLALCHEMY_DATABASE_URI'])
+            options = {'pool_pre_ping': True}
+            if url.get_backend_name() != 'sqlite':
+                options.update(
+                    pool_size=config['ASYNC_DB_POOL_SIZE'],
+                    max_overflow=config['ASYNC_DB_MAX_OVERFLOW']
+                )
+            self._engine = create_async_engine(url, **options)
+            self._session_factory = async_sessionmaker(self._engine, expire_on_commit=False)
+        return self._session_factory
+    
+    async def _send_json(self, send, status: int, body: Dict, headers: List) -> None:
+        payload = (self.app.json.dumps(body) + '\n').encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(payload)).encode())
+            ] + headers
+        })
+        await send({'type': 'http.response.body', 'body': payload})
+    
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._engine is not None:
+                    await self._engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = AsyncReadApp(flask_app)
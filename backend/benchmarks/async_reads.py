@@ -0,0 +1,206 @@
+"""
+Read endpoint throughput: WSGI worker threads vs the ASGI async path
+
+Drives the profile, pet, event details and area search endpoints with a
+fixed number of concurrent clients, once through the Flask app behind a
+bounded pool of worker threads (like gunicorn --threads) and once through
+asgi.AsyncReadApp on a single event loop. With a slow database the WSGI
+path queues once every thread is parked on a query; the async path keeps
+all clients in flight up to the connection pool size.
+
+Usage (from backend/):
+    python -m benchmarks.async_reads [--concurrency 200] [--requests 4000]
+                                     [--wsgi-threads 8] [--db-latency-ms 20]
+
+Set BENCH_DATABASE_URL to run against PostgreSQL (needs asyncpg);
+defaults to a temporary SQLite file (needs aiosqlite), where
+--db-latency-ms adds a per-statement delay to stand in for a network hop.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+
+from config import Config
+from app import create_app
+from asgi import AsyncReadApp
+from models import db, Owner, Pet, Event
+from utils.enums import Species
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCH_DATABASE_URL') or \
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'async_bench.db')}"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    RATELIMIT_ENABLED = False
+    RATELIMIT_STORAGE_URI = 'memory://'
+    RATELIMIT_STORAGE_OPTIONS = {}
+    ASYNC_DB_POOL_SIZE = 50
+    ASYNC_DB_MAX_OVERFLOW = 50
+
+
+def seed(event_count: int) -> None:
+    """One owner with a pet plus upcoming events in one city"""
+    owner = Owner(google_id='bench', email='bench@example.com', name='Bench',
+                  user_role='user', coins_balance=0, latitude=18.5, longitude=73.8)
+    db.session.add(owner)
+    db.session.flush()
+    db.session.add(Pet(owner_id=owner.id, name='Rex', species=list(Species)[0]))
+    now = datetime.utcnow()
+    db.session.execute(Event.__table__.insert(), [{
+        'creator_id': owner.id,
+        'name': f'Bench {i}',
+        'event_type': 'meetup',
+        'start_datetime': now + timedelta(days=1, hours=i),
+        'end_datetime': now + timedelta(days=1, hours=i + 2),
+        'address': 'bench',
+        'city': 'Pune',
+        'country': 'India',
+        'latitude': 18.5,
+        'longitude': 73.8,
+        'status': 'upcoming',
+        'is_active': True
+    } for i in range(event_count)])
+    db.session.commit()
+
+
+def add_statement_latency(sync_engine, seconds: float) -> None:
+    """Delay every SQLite statement inside the thread that executes it"""
+    def delay(_statement):
+        time.sleep(seconds)
+    
+    @event.listens_for(sync_engine, 'connect')
+    def on_connect(_dbapi_connection, connection_record):
+        driver_connection = connection_record.driver_connection
+        if hasattr(driver_connection, 'set_trace_callback') and \
+                asyncio.iscoroutinefunction(driver_connection.set_trace_callback):
+            await_only(driver_connection.set_trace_callback(delay))  # aiosqlite worker thread
+        else:
+            driver_connection.set_trace_callback(delay)
+
+
+def summarize(name: str, latencies: List[float], elapsed: float) -> None:
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:>5} {len(latencies) / elapsed:>10.1f} "
+          f"{statistics.median(latencies):>9.1f} {p99:>9.1f}")
+
+
+def run_wsgi(app, paths: List[str], headers: dict, concurrency: int,
+             total: int, threads: int) -> None:
+    """Closed-loop clients against the Flask app with `threads` request workers"""
+    workers = threading.Semaphore(threads)
+    latencies: List[float] = []
+    issued = iter(range(total))
+    lock = threading.Lock()
+    
+    def client():
+        http = app.test_client()
+        while True:
+            with lock:
+                index = next(issued, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            with workers:
+                response = http.get(paths[index % len(paths)], headers=headers)
+            assert response.status_code == 200, response.get_json()
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+    
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    summarize('wsgi', latencies, time.perf_counter() - start)
+
+
+async def run_asgi(application: AsyncReadApp, paths: List[str], headers: dict,
+                   concurrency: int, total: int) -> None:
+    """Closed-loop clients calling the ASGI app directly"""
+    latencies: List[float] = []
+    issued = iter(range(total))
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    
+    async def request(path: str) -> int:
+        route, _, query = path.partition('?')
+        scope = {
+            'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': route, 'root_path': '', 'query_string': query.encode(),
+            'headers': raw_headers, 'client': ('127.0.0.1', 0), 'server': ('bench', 80)
+        }
+        status = {}
+        
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+        
+        await application(scope, receive, send)
+        return status['code']
+    
+    async def client():
+        for index in issued:
+            start = time.perf_counter()
+            assert await request(paths[index % len(paths)]) == 200
+            latencies.append((time.perf_counter() - start) * 1000)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    summarize('asgi', latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=200, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=4000, help='Requests per mode')
+    parser.add_argument('--wsgi-threads', type=int, default=8,
+                        help='Request worker threads on the WSGI path')
+    parser.add_argument('--db-latency-ms', type=float, default=20.0,
+                        help='Per-statement delay (SQLite only)')
+    parser.add_argument('--events', type=int, default=200)
+    args = parser.parse_args()
+    
+    app = create_app(BenchConfig)
+    application = AsyncReadApp(app)
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite' and args.db_latency_ms:
+            add_statement_latency(db.engine, args.db_latency_ms / 1000)
+            application._get_session_factory()
+            add_statement_latency(application._engine.sync_engine, args.db_latency_ms / 1000)
+        
+        db.drop_all()
+        db.create_all()
+        seed(args.events)
+        headers = {'Authorization': f"Bearer {create_access_token(identity=1)}"}
+        
+        pet_id = db.session.query(Pet.id).scalar()
+        event_id = db.session.query(Event.id).order_by(Event.id).limit(1).scalar()
+    
+    paths = [
+        '/api/v1/profile',
+        f'/api/v1/pets/{pet_id}',
+        f'/api/v1/events/{event_id}',
+        '/api/v1/events/nearby?search_type=area&city=Pune&per_page=20'
+    ]
+    
+    print(f"{'mode':>5} {'req/s':>10} {'p50_ms':>9} {'p99_ms':>9}")
+    run_wsgi(app, paths, headers, args.concurrency, args.requests, args.wsgi_threads)
+    asyncio.run(run_asgi(application, paths, headers, args.concurrency, args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Cold-start benchmark: fresh interpreter to first response
+
+Each run starts a new Python process (like a new serverless instance)
+that imports app (which runs create_app), then serves a health check and an
+area event search through the test client. Reports median timings per
+phase over all runs, plus the per-module import profile of one cold import.
+
+Usage (from backend/):
+    python -m benchmarks.cold_start [--runs 10] [--profile]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from utils.startup_profile import profile_imports, format_report
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+client.get('/api/health')
+health = time.perf_counter()
+client.get('/api/v1/events/nearby?search_type=area&city=Pune')
+search = time.perf_counter()
+print(json.dumps({
+    'import_and_create_app_ms': (imported - start) * 1000,
+    'first_health_ms': (health - imported) * 1000,
+    'first_search_ms': (search - health) * 1000,
+    'total_ms': (search - start) * 1000
+}))
+"""
+
+
+def prepare_database(path: str):
+    """Create an empty schema so the search request hits real tables"""
+    subprocess.run(
+        [sys.executable, '-c', 'import app; from extensions import db\n'
+                               'with app.app.app_context(): db.create_all()'],
+        cwd=BACKEND_DIR, env={**os.environ, 'DATABASE_URL': f'sqlite:///{path}'}, check=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--profile', action='store_true',
+                        help='Also print the per-module import profile')
+    args = parser.parse_args()
+    
+    db_path = os.path.join(tempfile.mkdtemp(), 'cold_start.db')
+    prepare_database(db_path)
+    env = {**os.environ, 'DATABASE_URL': f'sqlite:///{db_path}'}
+    
+    samples = []
+    for _ in range(args.runs):
+        result = subprocess.run([sys.executable, '-c', CHILD], cwd=BACKEND_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    
+    for phase in samples[0]:
+        values = [sample[phase] for sample in samples]
+        print(f"{phase:>26}: median {statistics.median(values):7.1f} ms  "
+              f"(min {min(values):.1f}, max {max(values):.1f})")
+    
+    if args.profile:
+        print()
+        print(format_report(profile_imports('app', cwd=BACKEND_DIR)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Ledger history/summary latency as total ledger volume grows
+
+Inserts ledger rows in steps for many owners spread over two years, then
+times one owner's 30-day summary, history page and cursor page at each
+step. Latency should stay flat: the (owner_id, created_at, id) index (and,
+on PostgreSQL, monthly partition pruning) keeps each query bounded by the
+owner's recent rows rather than total table size.
+
+Usage (from backend/):
+    python -m benchmarks.ledger_history [--steps 10000 100000 500000] [--partition]
+
+Set BENCH_DATABASE_URL to run against PostgreSQL; defaults to a temporary
+SQLite file.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from config import Config
+from app import create_app
+from models import db, Owner, Ledger
+from services.ledger_service import LedgerService
+from services.partition_service import LedgerPartitionService
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCH_DATABASE_URL') or \
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'ledger_bench.db')}"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+
+
+def insert_rows(count: int, owner_count: int, chunk_size: int = 5000):
+    """Insert synthetic ledger rows spread over the last two years"""
+    now = datetime.utcnow()
+    remaining = count
+    while remaining:
+        size = min(chunk_size, remaining)
+        db.session.execute(Ledger.__table__.insert(), [{
+            'owner_id': random.randint(1, owner_count),
+            'transaction_type': random.choice(['credit', 'debit']),
+            'amount': random.randint(1, 100),
+            'balance_after': 0,
+            'category': random.choice(['reward', 'event_registration', 'referral_bonus']),
+            'description': 'bench',
+            'created_at': now - timedelta(minutes=random.randint(0, 2 * 365 * 24 * 60))
+        } for _ in range(size)])
+        db.session.commit()
+        remaining -= size
+
+
+def time_call(fn, repeat: int = 20) -> float:
+    """Median wall time of fn in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--steps', type=int, nargs='+', default=[10000, 100000, 500000],
+                        help='Cumulative ledger sizes to measure at')
+    parser.add_argument('--owners', type=int, default=2000)
+    parser.add_argument('--partition', action='store_true',
+                        help='Convert to monthly partitions first (PostgreSQL only)')
+    args = parser.parse_args()
+    
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(Owner.__table__.insert(), [{
+            'google_id': f'bench-{i}',
+            'email': f'bench-{i}@example.com',
+            'name': f'Bench {i}',
+            'user_role': 'user',
+            'coins_balance': 0
+        } for i in range(1, args.owners + 1)])
+        db.session.commit()
+        
+        partition_service = LedgerPartitionService()
+        if args.partition and partition_service.is_supported():
+            partition_service.migrate(months_ahead=3)
+        
+        ledger_service = LedgerService()
+        owner_id = 1
+        total = 0
+        
+        print(f"{'rows':>10} {'summary_ms':>11} {'history_ms':>11} {'cursor_ms':>10}")
+        for step in args.steps:
+            insert_rows(step - total, args.owners)
+            total = step
+            
+            summary_ms = time_call(lambda: ledger_service.get_transaction_summary(owner_id, days=30))
+            history_ms = time_call(lambda: ledger_service.get_transaction_history(
+                owner_id, per_page=20, days=30))
+            cursor_ms = time_call(lambda: ledger_service.get_transaction_history(
+                owner_id, per_page=20, days=30, cursor_mode=True))
+            print(f"{total:>10} {summary_ms:>11.2f} {history_ms:>11.2f} {cursor_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
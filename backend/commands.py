@@ -0,0 +1,300 @@
+import os
+import time
+import logging
+from datetime import datetime
+
+import click
+
+logger = logging.getLogger(__name__)
+
+
+def register_commands(app):
+    """Register CLI commands with the Flask app"""
+    
+    @app.cli.group('events')
+    def events_cli():
+        """Event maintenance commands"""
+    
+    @events_cli.command('advance-status')
+    @click.option('--batch-size', default=500, show_default=True,
+                  help='Maximum events updated per statement')
+    @click.option('--loop', is_flag=True,
+                  help='Keep running, waking at the next start/end boundary')
+    @click.option('--max-wait', default=300, show_default=True,
+                  help='Maximum seconds to sleep between passes in --loop mode')
+    def advance_status(batch_size, loop, max_wait):
+        """Move due events to ongoing/completed"""
+        from services.lifecycle_service import EventLifecycleService
+        
+        lifecycle_service = EventLifecycleService(batch_size=batch_size)
+        
+        while True:
+            result = lifecycle_service.advance_statuses()
+            if not result['success']:
+                raise click.ClickException(result['error'])
+            
+            click.echo(f"ongoing={result['ongoing']} completed={result['completed']}")
+            
+            if not loop:
+                break
+            
+            time.sleep(lifecycle_service.seconds_until_next_boundary(max_wait) + 1)
+    
+    @events_cli.command('archive')
+    @click.option('--days', default=90, show_default=True,
+                  help='Archive completed/cancelled events that ended this many days ago')
+    @click.option('--batch-size', default=200, show_default=True,
+                  help='Events moved per transaction')
+    @click.option('--max-batches', default=None, type=int,
+                  help='Stop after this many batches')
+    def archive_events(days, batch_size, max_batches):
+        """Move old completed/cancelled events and their registrations to archive tables"""
+        from services.archive_service import ArchiveService
+        
+        result = ArchiveService(batch_size=batch_size).archive_events(days, max_batches)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"events={result['events']} registrations={result['registrations']}")
+    
+    @events_cli.command('backfill-eligibility')
+    @click.option('--batch-size', default=500, show_default=True,
+                  help='Events updated per transaction')
+    def backfill_eligibility(batch_size):
+        """Fill species_mask and age columns from allowed_species/age_restrictions"""
+        from services.event_service import EventService
+        
+        result = EventService().backfill_eligibility(batch_size)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"updated={result['updated']} invalid={len(result['invalid'])}")
+        for event_id in result['invalid']:
+            click.echo(f"  event {event_id}: unparseable allowed_species/age_restrictions")
+    
+    @events_cli.command('cancel')
+    @click.argument('event_id', type=int)
+    @click.option('--reason', default=None, help='Shown to attendees in their notification')
+    @click.option('--chunk-size', default=None, type=int,
+                  help='Registrations refunded per batch (default EVENT_CANCEL_CHUNK_SIZE)')
+    def cancel_event(event_id, reason, chunk_size):
+        """Cancel an event, refunding every registration"""
+        from services.event_service import EventService
+        
+        result = EventService().cancel_event(event_id, reason, chunk_size)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        data = result['data']
+        click.echo(f"cancelled={data['registrations_cancelled']} refunds={data['refunds']} "
+                   f"coins={data['coins_refunded']} waitlist={data['waitlist_cleared']}")
+    
+    @events_cli.command('import')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--creator-id', required=True, type=int,
+                  help='Admin user the events are created for')
+    @click.option('--format', 'import_format', type=click.Choice(['csv', 'ndjson']),
+                  default=None, help='File format (default from the extension)')
+    @click.option('--chunk-size', default=None, type=int,
+                  help='Rows per INSERT and commit (default EVENT_IMPORT_CHUNK_SIZE)')
+    def import_events(path, creator_id, import_format, chunk_size):
+        """Bulk-create events from a CSV or NDJSON file"""
+        from services.import_service import EventImportService
+        
+        import_format = import_format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        with open(path, encoding='utf-8-sig', newline='') as lines:
+            result = EventImportService(chunk_size=chunk_size).import_events(
+                lines, import_format, creator_id
+            )
+        
+        report = result['report'] if 'report' in result else {}
+        click.echo(f"imported={report.get('imported', 0)} failed={report.get('failed', 0)}")
+        for error in report.get('errors', []):
+            click.echo(f"  line {error['line']}: {error['error']}")
+        if report.get('errors_truncated'):
+            click.echo('  (more errors not shown)')
+        if not result['success']:
+            raise click.ClickException(result['error'])
+    
+    @events_cli.command('search-index')
+    def search_index():
+        """Create the full-text search index on an existing database and index all events"""
+        from models import db
+        from utils import text_search
+        
+        with db.engine.begin() as connection:
+            installed = text_search.install(connection)
+        if not installed:
+            raise click.ClickException(
+                f'No full-text engine for {db.engine.dialect.name}; search falls back to substring matching'
+            )
+        
+        click.echo('search index ready')
+    
+    @app.cli.group('feeds')
+    def feeds_cli():
+        """Precomputed feed commands"""
+    
+    @feeds_cli.command('build')
+    @click.option('--all', 'rebuild_all', is_flag=True,
+                  help='Rebuild every feed, not just missing or stale ones')
+    @click.option('--batch-size', default=200, show_default=True,
+                  help='Owners built per transaction')
+    def build_feeds(rebuild_all, batch_size):
+        """Materialize "events for you" feeds for active owners"""
+        from services.feed_service import FeedService
+        
+        result = FeedService().build_feeds(stale_only=not rebuild_all, batch_size=batch_size)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"built={result['built']}")
+    
+    @app.cli.group('geo')
+    def geo_cli():
+        """Offline geocoding commands"""
+    
+    @geo_cli.command('build-gazetteer')
+    @click.option('--source', default=None,
+                  help='Source CSV or GeoNames postal .txt (default GAZETTEER_SOURCE)')
+    @click.option('--output', default=None, help='Compiled file (default GAZETTEER_PATH)')
+    def build_gazetteer(source, output):
+        """Compile the pincode/city dataset into the memory-mapped gazetteer file"""
+        from utils.gazetteer import Gazetteer, compile_gazetteer, read_source
+        
+        source = source or app.config['GAZETTEER_SOURCE']
+        output = output or app.config['GAZETTEER_PATH']
+        
+        data = compile_gazetteer(read_source(source))
+        with open(output + '.tmp', 'wb') as compiled:
+            compiled.write(data)
+        os.replace(output + '.tmp', output)
+        
+        click.echo(f"places={len(Gazetteer(data))} bytes={len(data)} path={output}")
+    
+    @geo_cli.command('backfill-owners')
+    @click.option('--batch-size', default=500, show_default=True,
+                  help='Owners updated per transaction')
+    def backfill_owner_coordinates(batch_size):
+        """Fill missing owner coordinates from their pincode or city"""
+        from services.user_service import UserService
+        
+        result = UserService().backfill_coordinates(batch_size)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"updated={result['updated']} unresolved={result['unresolved']}")
+    
+    @geo_cli.command('backfill-cells')
+    @click.option('--batch-size', default=500, show_default=True,
+                  help='Owners updated per transaction')
+    def backfill_owner_cells(batch_size):
+        """Fill the geo_cell index column for owners that have coordinates"""
+        from services.user_service import UserService
+        
+        result = UserService().backfill_geo_cells(batch_size)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"updated={result['updated']}")
+    
+    @app.cli.group('outbox')
+    def outbox_cli():
+        """Outbox commands"""
+    
+    @outbox_cli.command('work')
+    @click.option('--workers', default=1, show_default=True,
+                  help='Worker threads draining the outbox')
+    @click.option('--loop', is_flag=True,
+                  help='Keep running, polling for new messages')
+    @click.option('--interval', default=None, type=float,
+                  help='Seconds a worker sleeps when the outbox is empty (default OUTBOX_POLL_INTERVAL)')
+    @click.option('--batch-size', default=None, type=int,
+                  help='Messages claimed per transaction (default OUTBOX_BATCH_SIZE)')
+    def work_outbox(workers, loop, interval, batch_size):
+        """Run side effects (notifications, feeds, Slack) for pending outbox messages"""
+        from services.outbox_service import OutboxService
+        
+        result = OutboxService(batch_size=batch_size).run_workers(app, workers, loop, interval)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"processed={result['processed']} retried={result['retried']} "
+                   f"failed={result['failed']}")
+    
+    @outbox_cli.command('requeue-failed')
+    @click.option('--topic', default=None, help='Only requeue messages on this topic')
+    def requeue_failed_messages(topic):
+        """Retry messages that ran out of attempts"""
+        from services.outbox_service import OutboxService
+        
+        result = OutboxService().requeue_failed(topic)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"requeued={result['requeued']}")
+    
+    @app.cli.group('ledger')
+    def ledger_cli():
+        """Ledger maintenance commands"""
+    
+    @ledger_cli.command('partition')
+    @click.option('--months-ahead', default=3, show_default=True,
+                  help='Future monthly partitions to keep available')
+    @click.option('--keep-legacy', is_flag=True,
+                  help='Keep the unpartitioned table as ledger_legacy after migrating')
+    def partition_ledger(months_ahead, keep_legacy):
+        """Convert the ledger to monthly partitions, or create upcoming partitions"""
+        from services.partition_service import LedgerPartitionService
+        
+        partition_service = LedgerPartitionService()
+        if not partition_service.is_supported():
+            click.echo('Ledger partitioning requires PostgreSQL; nothing to do')
+            return
+        
+        result = partition_service.migrate(months_ahead, keep_legacy)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"partitions_created={result['partitions_created']}")
+        if 'rows_copied' in result:
+            click.echo(f"rows_copied={result['rows_copied']}")
+    
+    @ledger_cli.command('compact')
+    @click.option('--older-than-months', default=3, show_default=True,
+                  help='Only compact partitions at least this many months old')
+    def compact_ledger(older_than_months):
+        """Rewrite closed monthly ledger partitions in owner/time order"""
+        from services.partition_service import LedgerPartitionService
+        
+        result = LedgerPartitionService().compact(older_than_months)
+        if not result['success']:
+            raise click.ClickException(result['error'])
+        
+        click.echo(f"partitions_compacted={result['partitions_compacted']}")
+    
+    @app.cli.group('auth')
+    def auth_cli():
+        """Authentication maintenance commands"""
+    
+    @auth_cli.command('purge-revoked')
+    def purge_revoked_tokens():
+        """Delete revoked-token rows whose tokens have expired anyway"""
+        from models import db, RevokedToken
+        
+        deleted = RevokedToken.query.filter(
+            RevokedToken.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        click.echo(f"deleted={deleted}")
+    
+    @app.cli.command('startup-profile')
+    @click.option('--top', default=20, show_default=True, help='Rows to show')
+    @click.option('--depth', default=1, show_default=True,
+                  help='Show modules imported at most this many levels below app')
+    def startup_profile(top, depth):
+        """Report per-module import time of a cold app import"""
+        from utils.startup_profile import profile_imports, format_report
+        
+        entries = profile_imports('app', cwd=os.path.dirname(os.path.abspath(__file__)))
+        click.echo(format_report(entries, top=top, max_depth=depth))
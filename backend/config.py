@@ -9,7 +9,7 @@ load_dotenv()
 class Config:
     """Base configuration class"""
     def _normalize_db_url(url: str) -> str:
-        if not url:
+        if not url or url.startswith("sqlite"):
             return url
         # fix legacy scheme
         if url.startswith("postgres://"):
@@ -45,6 +45,13 @@ class Config:
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
     JWT_ERROR_MESSAGE_KEY = 'error'
+    TOKEN_DENYLIST_SYNC_INTERVAL = 30  # Seconds between pulls of revocations from other instances
+    
+    # Referral codes (key for the owner ID -> code bijection; never rotate once codes are issued)
+    REFERRAL_CODE_SECRET = os.environ.get('REFERRAL_CODE_SECRET') or SECRET_KEY
+    
+    # Check-in QR tokens (rotating invalidates every issued QR code)
+    CHECK_IN_TOKEN_SECRET = os.environ.get('CHECK_IN_TOKEN_SECRET') or SECRET_KEY
     
     # Google OAuth
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
@@ -55,14 +62,76 @@ class Config:
     # Pagination
     DEFAULT_PAGE_SIZE = 10
     MAX_PAGE_SIZE = 100
+    MAX_BATCH_IDS = 50  # IDs per batch lookup (GET /api/v1/events?ids=)
+    
+    # Bulk event import (POST /api/v1/events/import, flask events import)
+    EVENT_IMPORT_CHUNK_SIZE = 500  # Rows per multi-row INSERT and commit
+    EVENT_IMPORT_MAX_ERRORS = 1000  # Row errors listed in the report
+    MAX_CHECK_IN_BATCH = 500  # Registrations per check-in request
+    CHECK_IN_OPENS_MINUTES = 120  # Check-in (and offline scan times) allowed from this long before start
+    EVENT_CANCEL_CHUNK_SIZE = 500  # Registrations cancelled and refunded per statement batch
     
     # File Upload
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
     
-    # Rate Limiting
-    RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL') or 'memory://'
-    RATELIMIT_DEFAULT = "100/hour"
+    # Write-behind last_login updates (0 interval = write through)
+    LAST_LOGIN_FLUSH_INTERVAL = float(os.environ.get('LAST_LOGIN_FLUSH_INTERVAL', 5))
+    LAST_LOGIN_FLUSH_SIZE = 500
+    
+    # Precomputed "events for you" feed
+    FEED_RADIUS_KM = float(os.environ.get('FEED_RADIUS_KM', 25))
+    FEED_SIZE = 100  # Events kept per owner
+    FEED_REFILL_BELOW = 50  # Rebuild a cut-off feed once fewer live entries remain
+    
+    # Transactional outbox. On Vercel a cron calls GET /api/internal/outbox/drain
+    # (see vercel.json; it sends CRON_SECRET as a bearer token). Elsewhere run
+    # `flask outbox work --loop`, or use 'local' mode, which handles messages
+    # in-process after each write request
+    OUTBOX_MODE = os.environ.get('OUTBOX_MODE', 'worker')  # worker, local
+    CRON_SECRET = os.environ.get('CRON_SECRET')  # Drain endpoint is disabled without it
+    OUTBOX_CRON_MAX_MESSAGES = 500  # Per cron call, to stay inside the function time limit
+    OUTBOX_BATCH_SIZE = 100  # Messages claimed per transaction
+    OUTBOX_MAX_ATTEMPTS = 8  # Then the message is marked failed
+    OUTBOX_RETRY_BASE_SECONDS = 5  # Doubled after each failed attempt
+    OUTBOX_RETRY_MAX_SECONDS = 3600
+    OUTBOX_POLL_INTERVAL = 1.0  # Seconds a worker sleeps when the outbox is empty
+    
+    # New-event notifications, fanned out by the outbox worker
+    NOTIFY_RADIUS_KM = float(os.environ.get('NOTIFY_RADIUS_KM', 10))
+    NOTIFICATION_BATCH_SIZE = 1000  # Owners per candidate scan and per INSERT
+    
+    # Offline geocoding (utils.gazetteer); build the compiled file with `flask geo build-gazetteer`
+    GAZETTEER_SOURCE = os.environ.get('GAZETTEER_SOURCE') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer', 'places.csv')
+    GAZETTEER_PATH = os.environ.get('GAZETTEER_PATH') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer', 'gazetteer.bin')
+    
+    # In-memory city/venue autocomplete index
+    PLACE_INDEX_SYNC_INTERVAL = 60  # Seconds between pulls of events created by other instances
+    PLACE_INDEX_REBUILD_INTERVAL = 3600  # Seconds between full rebuilds that settle counts
+    
+    # Async read path (asgi.py); a long-lived server, so it keeps a pool
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE', 10))
+    ASYNC_DB_MAX_OVERFLOW = int(os.environ.get('ASYNC_DB_MAX_OVERFLOW', 20))
+    
+    # Rate Limiting (shared DB-backed counters unless Redis is configured)
+    RATELIMIT_STORAGE_URI = os.environ.get('REDIS_URL') or 'db://'
+    RATELIMIT_STORAGE_OPTIONS = {} if os.environ.get('REDIS_URL') else {
+        'database_url': SQLALCHEMY_DATABASE_URI,
+        'batch_size': 10,  # Hits each instance may take locally before syncing
+        'sync_interval': 1.0
+    }
+    RATELIMIT_STRATEGY = 'fixed-window'
+    RATELIMIT_HEADERS_ENABLED = True
+    RATELIMIT_DEFAULT = "1000/hour"
+    RATELIMIT_SEARCH = "30/minute"  # Event search (expensive)
+    RATELIMIT_AUTH = "20/minute"
+    RATELIMIT_WRITE = "60/minute"
+    RATELIMIT_READ = "300/minute"  # Profile, pet and event detail reads
+    RATELIMIT_AUTOCOMPLETE = "120/minute"  # One request per keystroke
+    RATELIMIT_EXPORT = "5/minute"
+    RATELIMIT_IMPORT = "5/minute"
     
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
@@ -91,6 +160,10 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    LAST_LOGIN_FLUSH_INTERVAL = 0
+    RATELIMIT_STORAGE_URI = 'memory://'
+    RATELIMIT_STORAGE_OPTIONS = {}
+    OUTBOX_MODE = 'local'
 
 
 # Configuration dictionary
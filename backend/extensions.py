@@ -1,8 +1,11 @@
+from functools import lru_cache
+
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from utils.lazy import LazyService
 
 # Database
 db = SQLAlchemy()
@@ -10,14 +13,52 @@ db = SQLAlchemy()
 # JWT Authentication
 jwt = JWTManager()
 
+# Revoked token IDs checked on every protected request
+token_denylist = LazyService('utils.token_denylist', 'TokenDenylist')
+
 # Database Migrations
-migrate = Migrate()
+def init_migrate(app):
+    """
+    Attach Flask-Migrate to the app
+    
+    Flask-Migrate pulls in Alembic, which is a large share of import time and
+    only needed for `flask db` commands, so it is imported on demand.
+    """
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+# City/state/country/venue names for autocomplete
+place_index = LazyService('utils.place_index', 'PlaceIndex')
+
+# Batched last_login writes
+last_login_buffer = LazyService('utils.write_behind', 'LastLoginBuffer')
 
-# Rate Limiting
+# Rate Limiting (per-route limits come from RATELIMIT_* config)
 limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["1000 per hour"]
+    key_func=get_remote_address
 )
 
+def init_limiter(app):
+    """
+    Attach the rate limiter to the app
+    
+    The db:// storage backend registers itself with limits on import, so
+    its module is only imported when the config selects it.
+    """
+    if app.config.get('RATELIMIT_STORAGE_URI', '').startswith('db://'):
+        from utils import rate_limit_storage  # noqa: F401 -- registers the db:// storage
+    limiter.init_app(app)
+
+
+@lru_cache(maxsize=None)
+def config_limit(config_key: str):
+    """
+    Rate limit decorator whose limit string is read from app config per request
+    
+    One decorator per key, so building the app twice in a process (e.g. CLI
+    or benchmarks) re-registers the same limit rather than stacking a copy.
+    """
+    return limiter.limit(lambda: current_app.config[config_key])
+
 
 # ==================== middleware/error_handlers.py ====================
@@ -2,7 +2,6 @@ import logging
 import traceback
 from flask import jsonify
 from sqlalchemy.exc import SQLAlchemyError
-from marshmallow import ValidationError
 from jwt.exceptions import PyJWTError
 from extensions import db
 from utils import slack
@@ -93,15 +92,6 @@ def register_error_handlers(app):
             'message': 'A database error occurred'
         }), 500
     
-    @app.errorhandler(ValidationError)
-    def validation_error(error):
-        """Handle validation errors"""
-        return jsonify({
-            'success': False,
-            'error': 'Validation error',
-            'message': error.messages
-        }), 400
-    
     @app.errorhandler(PyJWTError)
     def jwt_error(error):
         """Handle JWT errors"""
@@ -114,6 +104,14 @@ def register_error_handlers(app):
     @app.errorhandler(Exception)
     def unhandled_exception(error):
         """Handle unhandled exceptions"""
+        # marshmallow is matched by name so it stays off the cold-start import path
+        if type(error).__name__ == 'ValidationError' and type(error).__module__.startswith('marshmallow'):
+            return jsonify({
+                'success': False,
+                'error': 'Validation error',
+                'message': error.messages
+            }), 400
+        
         logger.error(f"Unhandled exception: {str(error)}", exc_info=True)
         return jsonify({
             'success': False,
@@ -1,6 +1,8 @@
 from extensions import db
 from datetime import datetime
 from utils.enums import Species, UserRoles
+from utils.eligibility import ALL_SPECIES_MASK
+from utils import text_search
 
 class Owner(db.Model):
     __tablename__ = 'owners'
@@ -20,6 +22,7 @@ class Owner(db.Model):
     pincode = db.Column(db.String(20), nullable=True)
     latitude = db.Column(db.Float, nullable=True)
     longitude = db.Column(db.Float, nullable=True)
+    geo_cell = db.Column(db.Integer, nullable=True, index=True)  # utils.location.geo_cell(latitude, longitude)
     
     # Account details
     user_role = db.Column(db.String(50), nullable=False, default=UserRoles.USER.value)
@@ -39,6 +42,10 @@ class Owner(db.Model):
     transactions = db.relationship('Ledger', backref='owner', lazy='dynamic')
     event_registrations = db.relationship('EventRegistration', backref='owner', lazy='dynamic')
     created_events = db.relationship('Event', backref='creator', lazy='dynamic')
+    
+    __table_args__ = (
+        db.Index('ix_owners_latitude_longitude', 'latitude', 'longitude'),
+    )
 
 
 class Pet(db.Model):
@@ -107,6 +114,12 @@ class Event(db.Model):
     allowed_species = db.Column(db.JSON, nullable=True)  # List of allowed species
     age_restrictions = db.Column(db.JSON, nullable=True)  # Min/max age requirements
     
+    # Searchable copies of allowed_species/age_restrictions (utils.eligibility)
+    species_mask = db.Column(db.Integer, nullable=False, default=ALL_SPECIES_MASK,
+                             server_default=str(ALL_SPECIES_MASK))
+    min_age_months = db.Column(db.Integer, nullable=True)
+    max_age_months = db.Column(db.Integer, nullable=True)
+    
     # Pricing
     is_free = db.Column(db.Boolean, default=True)
     entry_fee = db.Column(db.Float, nullable=True)
@@ -126,6 +139,15 @@ class Event(db.Model):
     
     # Relationships
     registrations = db.relationship('EventRegistration', backref='event', lazy='dynamic', cascade='all, delete-orphan')
+    
+    # Keyset pagination order for area search
+    __table_args__ = (
+        db.Index('ix_events_start_datetime_id', 'start_datetime', 'id'),
+        db.Index('ix_events_status_start_datetime', 'status', 'start_datetime'),
+    )
+
+# Full-text index on events (tsvector/GIN or FTS5), created with the table
+text_search.register(Event.__table__)
 
 
 class EventRegistration(db.Model):
@@ -158,9 +180,43 @@ class EventRegistration(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Unique constraint to prevent duplicate registrations
+    # Unique constraint to prevent duplicate registrations; keyset order for an owner's registrations
     __table_args__ = (
         db.UniqueConstraint('event_id', 'owner_id', 'pet_id', name='unique_event_registration'),
+        db.Index('ix_event_registrations_owner_registered_at_id',
+                 'owner_id', 'registration_datetime', 'id'),
+    )
+
+
+class EventWaitlist(db.Model):
+    __tablename__ = 'event_waitlists'
+    
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), primary_key=True)
+    
+    # Tickets are issued in join order; tree is a utils.fenwick.FenwickTree
+    # holding 1 for each ticket still waiting (4 bytes per ticket issued)
+    next_ticket = db.Column(db.Integer, nullable=False, default=1)
+    length = db.Column(db.Integer, nullable=False, default=0)
+    tree = db.Column(db.LargeBinary, nullable=False)
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class WaitlistEntry(db.Model):
+    __tablename__ = 'waitlist_entries'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey('owners.id'), nullable=False)
+    ticket = db.Column(db.Integer, nullable=False)
+    pet_ids = db.Column(db.JSON, nullable=True)  # Registered with the owner on promotion
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # One entry per owner per event; the head is looked up by ticket
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'owner_id', name='unique_waitlist_entry'),
+        db.UniqueConstraint('event_id', 'ticket', name='unique_waitlist_ticket'),
     )
 
 
@@ -185,4 +241,125 @@ class Ledger(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships are defined in Owner model
+    
+    # Keyset pagination order for transaction history
+    __table_args__ = (
+        db.Index('ix_ledger_owner_created_at_id', 'owner_id', 'created_at', 'id'),
+    )
+
+
 
+class ArchivedEvent(db.Model):
+    __tablename__ = 'events_archive'
+    
+    # Same ID as the original row in events
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    creator_id = db.Column(db.Integer, nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False)
+    end_datetime = db.Column(db.DateTime, nullable=False)
+    
+    # Full column snapshot of the original row
+    payload = db.Column(db.JSON, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class ArchivedEventRegistration(db.Model):
+    __tablename__ = 'event_registrations_archive'
+    
+    # Same ID as the original row in event_registrations
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    event_id = db.Column(db.Integer, nullable=False, index=True)
+    owner_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=True)
+    
+    # Full column snapshot of the original row
+    payload = db.Column(db.JSON, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_event_registrations_archive_owner_status', 'owner_id', 'status'),
+    )
+
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    token_type = db.Column(db.String(10), nullable=False)  # access, refresh
+    owner_id = db.Column(db.Integer, db.ForeignKey('owners.id'), nullable=True)
+    
+    # Rows can be purged once the token itself would have expired
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RateLimitCounter(db.Model):
+    __tablename__ = 'rate_limit_counters'
+    
+    # Fixed-window counter shared by all app instances
+    key = db.Column(db.String(255), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    expires_at = db.Column(db.Float, nullable=False, index=True)  # Unix time the window ends
+
+
+class OwnerFeed(db.Model):
+    __tablename__ = 'owner_feeds'
+    
+    owner_id = db.Column(db.Integer, db.ForeignKey('owners.id'), primary_key=True)
+    
+    # Ranked [start_timestamp, event_id] pairs, soonest first
+    entries = db.Column(db.JSON, nullable=False, default=list)
+    is_stale = db.Column(db.Boolean, nullable=False, default=False, index=True)
+    # Cut off at FEED_SIZE: more matching events may exist past the last entry
+    is_truncated = db.Column(db.Boolean, nullable=False, default=False)
+    built_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class OutboxMessage(db.Model):
+    __tablename__ = 'outbox'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    
+    # Written in the same transaction as the change it announces
+    topic = db.Column(db.String(50), nullable=False)  # event.created, etc.
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, done, failed
+    
+    # Retries: a failed message waits until available_at, with backoff
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    
+    # Workers pick due pending messages oldest first
+    __table_args__ = (
+        db.Index('ix_outbox_status_id', 'status', 'id'),
+        db.Index('ix_outbox_status_available_at', 'status', 'available_at'),
+    )
+
+
+class Notification(db.Model):
+    __tablename__ = 'notifications'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    owner_id = db.Column(db.Integer, db.ForeignKey('owners.id'), nullable=False)
+    
+    # Notification details
+    kind = db.Column(db.String(50), nullable=False)  # event_nearby, etc.
+    event_id = db.Column(db.Integer, nullable=True)  # No FK: events move to the archive
+    title = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.String(255), nullable=True)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    read_at = db.Column(db.DateTime, nullable=True)
+    
+    # Keyset pagination order for an owner's notifications
+    __table_args__ = (
+        db.Index('ix_notifications_owner_created_at_id', 'owner_id', 'created_at', 'id'),
+    )
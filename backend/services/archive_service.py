@@ -0,0 +1,190 @@
+from typing import Dict, Any, List, Optional, Tuple, Type
+from datetime import datetime, timedelta
+import logging
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Session
+
+from models import db, Event, EventRegistration, ArchivedEvent, ArchivedEventRegistration
+from services.waitlist_service import WaitlistService
+from services import queries
+from utils.enums import EventStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveService:
+    """Service class for moving finished events and their registrations to archive tables"""
+    
+    def __init__(self, batch_size: int = 200):
+        self.batch_size = batch_size
+        self.waitlist_service = WaitlistService()
+    
+    def archive_events(self, older_than_days: int = 90,
+                       max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Move completed/cancelled events older than the cutoff into archive tables
+        
+        Each batch copies up to batch_size events with their registrations,
+        deletes the originals and commits, so locks stay short and an
+        interrupted run loses at most one uncommitted batch.
+        
+        Args:
+            older_than_days: Archive events that ended more than this many days ago
+            max_batches: Stop after this many batches (None for no limit)
+        
+        Returns:
+            Dict with counts of archived events and registrations
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        archived_events = 0
+        archived_registrations = 0
+        batches = 0
+        
+        try:
+            while max_batches is None or batches < max_batches:
+                events = Event.query.filter(
+                    Event.status.in_([EventStatus.COMPLETED.value, EventStatus.CANCELLED.value]),
+                    Event.end_datetime < cutoff
+                ).order_by(Event.id).limit(self.batch_size).all()
+                
+                if not events:
+                    break
+                
+                event_ids = [event.id for event in events]
+                registrations = EventRegistration.query.filter(
+                    EventRegistration.event_id.in_(event_ids)
+                ).all()
+                
+                db.session.bulk_insert_mappings(ArchivedEvent, [{
+                    'id': event.id,
+                    'creator_id': event.creator_id,
+                    'status': event.status,
+                    'end_datetime': event.end_datetime,
+                    'payload': self._to_payload(event),
+                    'archived_at': datetime.utcnow()
+                } for event in events])
+                
+                db.session.bulk_insert_mappings(ArchivedEventRegistration, [{
+                    'id': registration.id,
+                    'event_id': registration.event_id,
+                    'owner_id': registration.owner_id,
+                    'status': registration.status,
+                    'payload': self._to_payload(registration),
+                    'archived_at': datetime.utcnow()
+                } for registration in registrations])
+                
+                EventRegistration.query.filter(
+                    EventRegistration.event_id.in_(event_ids)
+                ).delete(synchronize_session=False)
+                # Waitlists reference the event rows; nobody can be promoted now
+                self.waitlist_service.clear_events(event_ids)
+                Event.query.filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
+                
+                db.session.commit()
+                db.session.expunge_all()
+                
+                archived_events += len(event_ids)
+                archived_registrations += len(registrations)
+                batches += 1
+                
+                if len(event_ids) < self.batch_size:
+                    break
+            
+            if archived_events:
+                logger.info(f"Archived {archived_events} events, {archived_registrations} registrations")
+            
+            return {
+                'success': True,
+                'events': archived_events,
+                'registrations': archived_registrations
+            }
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error archiving events: {str(e)}")
+            return {'success': False, 'error': 'Failed to archive events'}
+    
+    def get_archived_event(self, event_id: int,
+                           session: Optional[Session] = None) -> Optional[Event]:
+        """
+        Rebuild a detached Event from the archive for read-only use
+        
+        Args:
+            event_id: Event ID
+            session: Session to query on (defaults to db.session)
+        
+        Returns:
+            Transient Event instance or None if not archived
+        """
+        archived = queries.archived_event(session or db.session, event_id)
+        if not archived:
+            return None
+        return self._from_payload(Event, archived.payload)
+    
+    def get_archived_registration(self, event_id: int, owner_id: int,
+                                  session: Optional[Session] = None) -> Optional[EventRegistration]:
+        """Rebuild a detached EventRegistration from the archive for read-only use"""
+        archived = queries.archived_registration(session or db.session, event_id, owner_id)
+        if not archived:
+            return None
+        return self._from_payload(EventRegistration, archived.payload)
+    
+    def get_archived_events(self, event_ids: List[int],
+                            session: Optional[Session] = None) -> Dict[int, Event]:
+        """Batch form of get_archived_event, keyed by event ID"""
+        return {
+            archived.id: self._from_payload(Event, archived.payload)
+            for archived in queries.archived_events(session or db.session, event_ids)
+        }
+    
+    def get_archived_registrations(self, event_ids: List[int], owner_id: int,
+                                   session: Optional[Session] = None) -> Dict[int, EventRegistration]:
+        """Batch form of get_archived_registration, keyed by event ID"""
+        return {
+            event_id: self._from_payload(EventRegistration, archived.payload)
+            for event_id, archived in queries.archived_registrations(
+                session or db.session, event_ids, owner_id
+            ).items()
+        }
+    
+    def get_owner_registrations(self, owner_id: int, before_id: Optional[int], limit: int,
+                                session: Optional[Session] = None
+                                ) -> List[Tuple[EventRegistration, Optional[Event]]]:
+        """
+        Rebuild an owner's archived registrations with their events, newest first
+        
+        Args:
+            owner_id: Owner ID
+            before_id: Only registrations with a lower ID (None to start at the newest)
+            limit: Maximum rows
+            session: Session to query on (defaults to db.session)
+        
+        Returns:
+            List of (registration, event) pairs of transient instances
+        """
+        session = session or db.session
+        rows = queries.owner_archived_registrations(session, owner_id, before_id, limit)
+        events = self.get_archived_events(list({row.event_id for row in rows}), session)
+        return [
+            (self._from_payload(EventRegistration, row.payload), events.get(row.event_id))
+            for row in rows
+        ]
+    
+    def _to_payload(self, row: db.Model) -> Dict:
+        """Snapshot all mapped columns as JSON-safe values"""
+        payload = {}
+        for column in row.__table__.columns:
+            value = getattr(row, column.key)
+            payload[column.key] = value.isoformat() if isinstance(value, datetime) else value
+        return payload
+    
+    def _from_payload(self, model: Type[db.Model], payload: Dict) -> db.Model:
+        """Rebuild a transient model instance from a snapshot"""
+        values = {}
+        for column in model.__table__.columns:
+            value = payload.get(column.key)
+            if value is not None and isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            values[column.key] = value
+        return model(**values)
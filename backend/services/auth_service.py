@@ -3,7 +3,8 @@ from datetime import datetime
 from typing import Dict, Optional, Any
 from sqlalchemy.exc import IntegrityError
 
-from models import db, Owner
+from models import db, Owner, RevokedToken
+from extensions import last_login_buffer, token_denylist
 from config import Config
 from services import user_service, ledger_service
 
@@ -45,14 +46,15 @@ class AuthService:
             existing_user = self.user_service.get_user_by_google_id(google_id)
             
             if existing_user:
-                # Existing user - just update last login
-                existing_user.last_login = datetime.now()
+                # Existing user - last login is written behind in batches
+                login_time = datetime.now()
+                last_login_buffer.record(existing_user.id, login_time)
                 
-                # Optionally update profile image if changed
+                # Profile image changes are still written synchronously
                 if profile_image and profile_image != existing_user.profile_image:
                     existing_user.profile_image = profile_image
-                
-                db.session.commit()
+                    existing_user.last_login = login_time
+                    db.session.commit()
                 
                 logger.info(f"Existing user login: {existing_user.email}")
                 
@@ -78,18 +80,18 @@ class AuthService:
             db.session.add(new_user)
             db.session.flush()  # Get user ID before processing bonuses
             
-            # Process signup bonus through ledger service
-            bonus_result = self.ledger_service.process_signup_bonus(new_user.id)
+            # Stage signup and referral bonuses and apply them together:
+            # one ledger insert and one balance update per owner
+            bonus_batch = self.ledger_service.batch()
+            self.ledger_service.stage_signup_bonus(bonus_batch, new_user.id)
+            if referrer:
+                self.ledger_service.stage_referral_bonus(bonus_batch, referrer.id, new_user.id)
+            
+            bonus_result = bonus_batch.apply(commit=False)
             if not bonus_result['success']:
-                logger.error(f"Failed to process signup bonus for user {new_user.id}")
+                logger.error(f"Failed to process signup bonuses for user {new_user.id}")
                 # Don't fail the signup, user can be credited later
             
-            # Process referral bonus if applicable
-            if referrer:
-                referral_result = self.ledger_service.process_referral_bonus(referrer.id, new_user.id)
-                if not referral_result['success']:
-                    logger.warning(f"Referral bonus failed for user {new_user.id}")
-            
             db.session.commit()
             
             logger.info(f"New user created: {new_user.email}")
@@ -117,6 +119,41 @@ class AuthService:
                 'status_code': 500
             }
 
+    def revoke_token(self, jwt_payload: Dict) -> Dict[str, Any]:
+        """
+        Revoke a token until it expires
+        
+        Args:
+            jwt_payload: Decoded JWT claims (jti, type, sub, exp)
+            
+        Returns:
+            Dict with success status
+        """
+        try:
+            jti = jwt_payload['jti']
+            expires_at = datetime.utcfromtimestamp(jwt_payload['exp'])
+            
+            if not RevokedToken.query.filter_by(jti=jti).first():
+                db.session.add(RevokedToken(
+                    jti=jti,
+                    token_type=jwt_payload.get('type', 'access'),
+                    owner_id=jwt_payload.get('sub'),
+                    expires_at=expires_at,
+                    revoked_at=datetime.utcnow()
+                ))
+                db.session.commit()
+            
+            token_denylist.add(jti, expires_at)
+            
+            logger.info(f"Token revoked for user {jwt_payload.get('sub')}")
+            
+            return {'success': True}
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error revoking token: {str(e)}")
+            return {'success': False, 'error': 'Failed to revoke token', 'status_code': 500}
+    
     def _format_user_response(self, user: Owner) -> Dict:
         """Format user data for response"""
         return {
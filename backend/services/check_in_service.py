@@ -0,0 +1,213 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+import logging
+
+from sqlalchemy import case, update
+
+from config import Config
+from models import db, EventRegistration
+from services import queries
+from utils.check_in_tokens import CheckInTokenCodec
+from utils.enums import EventStatus, RegistrationStatus, UserRoles
+
+logger = logging.getLogger(__name__)
+
+
+class CheckInService:
+    """
+    Service class for event-day check-in
+    
+    Scanners send batches of registration IDs or QR tokens, possibly
+    queued while offline. A batch is validated with one query and applied
+    with one UPDATE. Only rows not yet checked in are touched, so replaying
+    a batch is harmless: those entries come back as already_checked_in
+    with their original check-in time.
+    
+    Check-in opens CHECK_IN_OPENS_MINUTES before the event starts; scan
+    times from before then are rejected as invalid_scanned_at.
+    """
+    
+    token_codec = CheckInTokenCodec(Config.CHECK_IN_TOKEN_SECRET)
+    
+    def issue_token(self, registration_id: int) -> str:
+        """QR token for a registration"""
+        return self.token_codec.issue(registration_id)
+    
+    def check_in(self, event_id: int, entries: List[Any], user_id: int,
+                 user_role: Optional[str]) -> Dict[str, Any]:
+        """
+        Check in a batch of registrations for an event
+        
+        Args:
+            event_id: Event ID
+            entries: Registration IDs, QR tokens, or objects with
+                registration_id or token plus an optional scanned_at
+                (ISO datetime, for check-ins queued offline)
+            user_id: Staff member doing the check-in
+            user_role: Their role; admins and moderators can check in any
+                event, other users only events they created
+        
+        Returns:
+            Dict with a result per entry (in input order) and counts
+        """
+        try:
+            if not isinstance(entries, list) or not entries:
+                return {'success': False, 'error': 'registrations must be a non-empty list'}
+            if len(entries) > Config.MAX_CHECK_IN_BATCH:
+                return {'success': False,
+                        'error': f'At most {Config.MAX_CHECK_IN_BATCH} check-ins per request'}
+            
+            event = queries.active_event(db.session, event_id)
+            if not event:
+                return {'success': False, 'error': 'Event not found', 'status_code': 404}
+            
+            staff_roles = (UserRoles.ADMIN.value, UserRoles.MODERATOR.value)
+            if user_role not in staff_roles and event.creator_id != user_id:
+                return {'success': False, 'error': 'Not allowed to check in for this event',
+                        'status_code': 403}
+            
+            if event.status == EventStatus.CANCELLED.value:
+                return {'success': False, 'error': 'Event has been cancelled'}
+            
+            now = datetime.utcnow()
+            opens_at = event.start_datetime - timedelta(minutes=Config.CHECK_IN_OPENS_MINUTES)
+            if now < opens_at:
+                return {'success': False,
+                        'error': f'Check-in opens at {opens_at.isoformat()}',
+                        'status_code': 409}
+            
+            parsed = [self._parse_entry(entry, now, opens_at) for entry in entries]
+            
+            # Earliest scan wins when a registration appears more than once
+            scan_times: Dict[int, datetime] = {}
+            for registration_id, scanned_at, error in parsed:
+                if error is None and (registration_id not in scan_times
+                                      or scanned_at < scan_times[registration_id]):
+                    scan_times[registration_id] = scanned_at
+            
+            # One query to validate the whole batch
+            rows = {}
+            if scan_times:
+                rows = {
+                    row.id: row for row in db.session.query(
+                        EventRegistration.id, EventRegistration.event_id,
+                        EventRegistration.status, EventRegistration.checked_in,
+                        EventRegistration.check_in_time
+                    ).filter(EventRegistration.id.in_(list(scan_times)))
+                }
+            
+            outcomes: Dict[int, Dict[str, Any]] = {}
+            due: Dict[int, datetime] = {}
+            for registration_id, scanned_at in scan_times.items():
+                row = rows.get(registration_id)
+                if row is None or row.event_id != event_id:
+                    outcomes[registration_id] = {'result': 'not_found'}
+                elif row.status == RegistrationStatus.CANCELLED.value:
+                    outcomes[registration_id] = {'result': 'cancelled'}
+                elif row.checked_in:
+                    outcomes[registration_id] = self._already_checked_in(row.check_in_time)
+                else:
+                    due[registration_id] = scanned_at
+            
+            # One UPDATE for the rest; the checked_in guard keeps concurrent
+            # scanners from overwriting each other's check-in time
+            if due:
+                updated = set(db.session.scalars(
+                    update(EventRegistration).where(
+                        EventRegistration.id.in_(list(due)),
+                        EventRegistration.checked_in == False,
+                        EventRegistration.status != RegistrationStatus.CANCELLED.value
+                    ).values(
+                        checked_in=True,
+                        check_in_time=case(due, value=EventRegistration.id, else_=now),
+                        status=RegistrationStatus.ATTENDED.value,
+                        updated_at=now
+                    ).returning(EventRegistration.id),
+                    execution_options={'synchronize_session': False}
+                ).all())
+                db.session.commit()
+                
+                for registration_id, scanned_at in due.items():
+                    if registration_id in updated:
+                        outcomes[registration_id] = {
+                            'result': 'checked_in',
+                            'check_in_time': scanned_at.isoformat()
+                        }
+                    else:
+                        outcomes[registration_id] = self._already_checked_in(None)
+            
+            results = []
+            for registration_id, _, error in parsed:
+                if error is not None:
+                    results.append({'registration_id': registration_id, 'result': error})
+                else:
+                    results.append({'registration_id': registration_id,
+                                    **outcomes[registration_id]})
+            
+            counts: Dict[str, int] = {}
+            for result in results:
+                counts[result['result']] = counts.get(result['result'], 0) + 1
+            
+            logger.info(f"Check-in for event {event_id} by user {user_id}: {counts}")
+            
+            return {
+                'success': True,
+                'data': {
+                    'event_id': event_id,
+                    'results': results,
+                    'counts': counts
+                }
+            }
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error checking in for event {event_id}: {str(e)}")
+            return {'success': False, 'error': 'Check-in failed'}
+    
+    def _parse_entry(self, entry: Any, now: datetime,
+                     opens_at: datetime) -> Tuple[Optional[int], Optional[datetime], Optional[str]]:
+        """
+        Resolve one check-in entry
+        
+        Args:
+            entry: Registration ID, QR token, or object with one plus scanned_at
+            now: Current time; later scan times are capped to it
+            opens_at: When check-in opened; earlier scan times are rejected
+        
+        Returns:
+            Tuple of (registration_id, scanned_at, error); error is None when
+            the entry is usable
+        """
+        scanned_at = now
+        if isinstance(entry, dict):
+            if entry.get('scanned_at'):
+                try:
+                    scanned_at = datetime.fromisoformat(str(entry['scanned_at']))
+                except ValueError:
+                    return entry.get('registration_id'), None, 'invalid_scanned_at'
+                if scanned_at.tzinfo is not None:
+                    scanned_at = datetime.utcfromtimestamp(scanned_at.timestamp())
+                if scanned_at < opens_at:
+                    return entry.get('registration_id'), None, 'invalid_scanned_at'
+                # Scanner clocks can run ahead; never record a future check-in
+                scanned_at = min(scanned_at, now)
+            entry = entry.get('token') or entry.get('registration_id')
+        
+        if isinstance(entry, bool):
+            return None, None, 'invalid_entry'
+        if isinstance(entry, int):
+            return entry, scanned_at, None
+        if isinstance(entry, str):
+            if entry.isdigit():
+                return int(entry), scanned_at, None
+            registration_id = self.token_codec.verify(entry)
+            if registration_id is None:
+                return None, None, 'invalid_token'
+            return registration_id, scanned_at, None
+        return None, None, 'invalid_entry'
+    
+    def _already_checked_in(self, check_in_time: Optional[datetime]) -> Dict[str, Any]:
+        return {
+            'result': 'already_checked_in',
+            'check_in_time': check_in_time.isoformat() if check_in_time else None
+        }
@@ -1,12 +1,24 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, case, insert, update
 import math
 import logging
 
-from models import db, Event, EventRegistration, Owner, Ledger
+from sqlalchemy.orm import Session
+
+from config import Config
+from extensions import place_index
+from models import db, Event, EventRegistration, Owner, Pet, Notification
+from services import queries
+from utils.lazy import LazyService
 from utils.validators import validate_event_data
-from utils.location import calculate_distance
+from utils.enums import EventStatus, RegistrationStatus, TransactionCategory
+from utils.eligibility import species_mask, age_bounds, parse_species, pet_age_months
+from utils.location import calculate_distance, geocode_place
+from utils.text_search import apply_text_search, search_terms
+from utils.pagination import (
+    CountCache, InvalidCursorError, keyset_filter, keyset_page, offset_page, cursor_pagination
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +26,21 @@ logger = logging.getLogger(__name__)
 class EventService:
     """Service class for event operations"""
     
+    # Approximate totals for cursor-mode area search; per process, TTL-bounded
+    _area_count_cache = CountCache(ttl_seconds=60)
+    
+    # Marks get_user_registrations cursors that continue into the archive
+    # ('~' is outside the base64url alphabet of keyset cursors)
+    ARCHIVE_CURSOR_PREFIX = '~'
+    
+    def __init__(self):
+        # Built on first use, so search and detail reads skip their imports
+        self.archive_service = LazyService('services.archive_service', 'ArchiveService')
+        self.check_in_service = LazyService('services.check_in_service', 'CheckInService')
+        self.ledger_service = LazyService('services.ledger_service', 'LedgerService')
+        self.outbox_service = LazyService('services.outbox_service', 'OutboxService')
+        self.waitlist_service = LazyService('services.waitlist_service', 'WaitlistService')
+    
     def create_event(self, event_data: Dict) -> Dict[str, Any]:
         """
         Create a new event (Admin only)
@@ -25,63 +52,22 @@ class EventService:
             Dict with success status and created event data
         """
         try:
-            # Validate event data
-            validation = validate_event_data(event_data)
-            if not validation['valid']:
-                return {'success': False, 'error': validation['error']}
-            
-            # Parse datetime strings
-            start_dt = datetime.fromisoformat(event_data['start_datetime'])
-            end_dt = datetime.fromisoformat(event_data['end_datetime'])
-            
-            # Validate datetime logic
-            if start_dt >= end_dt:
-                return {'success': False, 'error': 'End time must be after start time'}
-            
-            if start_dt < datetime.utcnow():
-                return {'success': False, 'error': 'Event cannot start in the past'}
-            
-            # Parse optional registration deadline
-            reg_deadline = None
-            if event_data.get('registration_deadline'):
-                reg_deadline = datetime.fromisoformat(event_data['registration_deadline'])
-                if reg_deadline > start_dt:
-                    return {'success': False, 'error': 'Registration deadline must be before event start'}
+            prepared = self.prepare_event(event_data)
+            if 'error' in prepared:
+                return {'success': False, 'error': prepared['error']}
             
             # Create event
-            new_event = Event(
-                creator_id=event_data['creator_id'],
-                name=event_data['name'],
-                description=event_data.get('description'),
-                event_type=event_data['event_type'],
-                start_datetime=start_dt,
-                end_datetime=end_dt,
-                registration_deadline=reg_deadline,
-                venue_name=event_data.get('venue_name'),
-                address=event_data['address'],
-                city=event_data['city'],
-                state=event_data.get('state'),
-                country=event_data.get('country', 'India'),
-                pincode=event_data.get('pincode'),
-                latitude=event_data['latitude'],
-                longitude=event_data['longitude'],
-                max_participants=event_data.get('max_participants'),
-                allowed_species=event_data.get('allowed_species'),
-                age_restrictions=event_data.get('age_restrictions'),
-                is_free=event_data.get('is_free', True),
-                entry_fee=event_data.get('entry_fee', 0),
-                coins_required=event_data.get('coins_required', 0),
-                cover_image=event_data.get('cover_image'),
-                gallery_images=event_data.get('gallery_images'),
-                status='upcoming',
-                is_active=True,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
+            new_event = Event(**prepared['values'])
             
+            # Notifications and feeds are updated later from the outbox, not inline
             db.session.add(new_event)
+            db.session.flush()
+            self.outbox_service.publish(self.outbox_service.EVENT_CREATED, [{'event_id': new_event.id}])
             db.session.commit()
             
+            self.invalidate_search_cache()
+            place_index.add_event(new_event)
+            
             logger.info(f"Event created: {new_event.id} by user {event_data['creator_id']}")
             
             return {
@@ -97,26 +83,151 @@ class EventService:
             logger.error(f"Error creating event: {str(e)}")
             return {'success': False, 'error': 'Failed to create event'}
     
-    def search_events(self, search_params: Dict, user: Optional[Owner]) -> Dict[str, Any]:
+    def prepare_event(self, event_data: Dict) -> Dict[str, Any]:
+        """
+        Validate new-event input and build its column values
+        
+        Shared by create_event and the bulk importer.
+        
+        Args:
+            event_data: Event information including creator_id
+        
+        Returns:
+            Dict with Event column values, or error
+        """
+        # Events given only a city or pincode are placed at its centroid
+        if event_data.get('latitude') is None or event_data.get('longitude') is None:
+            coordinates = geocode_place(event_data.get('pincode'), event_data.get('city'),
+                                        event_data.get('state'), event_data.get('country'))
+            if coordinates:
+                event_data = {**event_data, 'latitude': coordinates[0],
+                              'longitude': coordinates[1]}
+        
+        # Validate event data
+        validation = validate_event_data(event_data)
+        if not validation['valid']:
+            return {'error': validation['error']}
+        
+        # Parse datetime strings
+        start_dt = datetime.fromisoformat(event_data['start_datetime'])
+        end_dt = datetime.fromisoformat(event_data['end_datetime'])
+        
+        # Validate datetime logic
+        if start_dt >= end_dt:
+            return {'error': 'End time must be after start time'}
+        
+        if start_dt < datetime.utcnow():
+            return {'error': 'Event cannot start in the past'}
+        
+        # Parse optional registration deadline
+        reg_deadline = None
+        if event_data.get('registration_deadline'):
+            try:
+                reg_deadline = datetime.fromisoformat(event_data['registration_deadline'])
+            except ValueError:
+                return {'error': 'Invalid registration_deadline format. Use ISO format'}
+            if reg_deadline > start_dt:
+                return {'error': 'Registration deadline must be before event start'}
+        
+        # Searchable eligibility columns
+        min_age_months, max_age_months = age_bounds(event_data.get('age_restrictions'))
+        
+        return {
+            'values': {
+                'creator_id': event_data['creator_id'],
+                'name': event_data['name'],
+                'description': event_data.get('description'),
+                'event_type': event_data['event_type'],
+                'start_datetime': start_dt,
+                'end_datetime': end_dt,
+                'registration_deadline': reg_deadline,
+                'venue_name': event_data.get('venue_name'),
+                'address': event_data['address'],
+                'city': event_data['city'],
+                'state': event_data.get('state'),
+                'country': event_data.get('country', 'India'),
+                'pincode': event_data.get('pincode'),
+                'latitude': event_data['latitude'],
+                'longitude': event_data['longitude'],
+                'max_participants': event_data.get('max_participants'),
+                'allowed_species': event_data.get('allowed_species'),
+                'age_restrictions': event_data.get('age_restrictions'),
+                'species_mask': species_mask(event_data.get('allowed_species')),
+                'min_age_months': min_age_months,
+                'max_age_months': max_age_months,
+                'is_free': event_data.get('is_free', True),
+                'entry_fee': event_data.get('entry_fee', 0),
+                'coins_required': event_data.get('coins_required', 0),
+                'cover_image': event_data.get('cover_image'),
+                'gallery_images': event_data.get('gallery_images'),
+                'status': 'upcoming',
+                'is_active': True,
+                'created_at': datetime.utcnow(),
+                'updated_at': datetime.utcnow()
+            }
+        }
+    
+    @staticmethod
+    def search_params_from_args(args) -> Dict:
+        """
+        Build search_events() parameters from query string args
+        
+        Args:
+            args: Werkzeug MultiDict of query parameters
+        
+        Returns:
+            Dict of typed search parameters
+        """
+        return {
+            'search_type': args.get('search_type', 'coordinates'),
+            'latitude': args.get('latitude', type=float),
+            'longitude': args.get('longitude', type=float),
+            'radius_km': args.get('radius_km', 10, type=float),
+            'city': args.get('city'),
+            'state': args.get('state'),
+            'country': args.get('country'),
+            'page': args.get('page', 1, type=int),
+            'per_page': args.get('per_page', 10, type=int),
+            'pagination': args.get('pagination', 'page'),
+            'cursor': args.get('cursor'),
+            'include_total': args.get('include_total', 'false').lower() == 'true',
+            'pet_id': args.get('pet_id', type=int),
+            'species': args.get('species'),
+            'q': args.get('q')
+        }
+    
+    def search_events(self, search_params: Dict, user: Optional[Owner],
+                      session: Optional[Session] = None) -> Dict[str, Any]:
         """
         Search events based on location (coordinates or area)
         
+        An optional q keyword filter matches event name, description, venue
+        and type; results are then ranked by relevance before the location
+        order.
+        
         Args:
             search_params: Search parameters including search_type
             user: Current user for default location
+            session: Session to query on (defaults to db.session)
             
         Returns:
             Dict with events list or error
         """
         try:
+            session = session or db.session
             search_type = search_params.get('search_type', 'coordinates')
             page = search_params.get('page', 1)
             per_page = min(search_params.get('per_page', 10), 100)
             
+            eligibility = self._resolve_eligibility(session, search_params, user)
+            if 'error' in eligibility:
+                return {'success': False, 'error': eligibility['error']}
+            
             if search_type == 'coordinates':
-                return self._search_by_coordinates(search_params, user, page, per_page)
+                return self._search_by_coordinates(session, search_params, user, page, per_page,
+                                                   eligibility)
             elif search_type == 'area':
-                return self._search_by_area(search_params, page, per_page)
+                return self._search_by_area(session, search_params, page, per_page, eligibility)
             else:
                 return {'success': False, 'error': 'Invalid search type'}
                 
@@ -124,8 +235,71 @@ class EventService:
             logger.error(f"Error searching events: {str(e)}")
             return {'success': False, 'error': 'Failed to search events'}
     
-    def _search_by_coordinates(self, params: Dict, user: Optional[Owner], 
-                              page: int, per_page: int) -> Dict[str, Any]:
+    def _resolve_eligibility(self, session: Session, params: Dict,
+                             user: Optional[Owner]) -> Dict[str, Any]:
+        """
+        Work out the species/age filter from pet_id or species
+        
+        pet_id takes the pet's species and age (age is skipped when unset);
+        species alone filters by species only.
+        
+        Returns:
+            Dict with species and age_months (None when not filtering), or error
+        """
+        pet_id = params.get('pet_id')
+        if pet_id:
+            if not user:
+                return {'error': 'Authentication required to filter by pet'}
+            pet = queries.owner_pet(session, pet_id, user.id)
+            if not pet:
+                return {'error': 'Pet not found'}
+            return {
+                'species': pet.species,
+                'age_months': pet_age_months(pet.age_years, pet.age_months),
+                'pet_id': pet.id
+            }
+        
+        if params.get('species'):
+            try:
+                return {'species': parse_species(params['species']), 'age_months': None}
+            except ValueError as e:
+                return {'error': str(e)}
+        
+        return {'species': None, 'age_months': None}
+    
+    def _keyword_criteria(self, params: Dict) -> Dict:
+        """Search criteria entry for the q keyword filter"""
+        return {'q': params['q']} if search_terms(params.get('q')) else {}
+    
+    def _eligibility_criteria(self, eligibility: Dict) -> Dict:
+        """Search criteria entries describing an eligibility filter"""
+        criteria = {}
+        if eligibility.get('species'):
+            criteria['species'] = eligibility['species'].value
+        if eligibility.get('pet_id'):
+            criteria['pet_id'] = eligibility['pet_id']
+        return criteria
+    
+    def _apply_text_search(self, session: Session, query, params: Dict):
+        """
+        Apply the q keyword filter to an event query
+        
+        Returns:
+            Tuple of (query, relevance). With a keyword the query yields
+            (event, relevance) rows instead of events; relevance is None
+            without one.
+        """
+        if not search_terms(params.get('q')):
+            return query, None
+        
+        query, relevance = apply_text_search(
+            query, Event, params['q'], session.get_bind().dialect.name
+        )
+        relevance = relevance.label('relevance')
+        return query.add_columns(relevance), relevance
+    
+    def _search_by_coordinates(self, session: Session, params: Dict, user: Optional[Owner], 
+                              page: int, per_page: int, eligibility: Dict) -> Dict[str, Any]:
         """Search events by distance from coordinates"""
         # Get coordinates
         lat = params.get('latitude')
@@ -140,23 +314,27 @@ class EventService:
         if lat is None or lon is None:
             return {'success': False, 'error': 'Location coordinates required'}
         
-        # Get all active upcoming events
-        query = Event.query.filter(
-            Event.is_active == True,
-            Event.start_datetime > datetime.utcnow(),
-            Event.status == 'upcoming'
+        # Get all active upcoming events the pet can attend
+        query = queries.eligible_events(
+            queries.upcoming_events(session), eligibility['species'], eligibility['age_months']
         )
+        query, relevance = self._apply_text_search(session, query, params)
+        ranked = relevance is not None
         
         # Calculate distance for each event and filter
         events_with_distance = []
-        for event in query.all():
+        for row in query.all():
+            event, relevance = row if ranked else (row, None)
             if event.latitude and event.longitude:
                 distance = calculate_distance(lat, lon, event.latitude, event.longitude)
                 if distance <= radius_km:
-                    events_with_distance.append((event, distance))
+                    events_with_distance.append((event, distance, relevance))
         
-        # Sort by distance
-        events_with_distance.sort(key=lambda x: x[1])
+        # Sort by distance, best keyword matches first
+        if ranked:
+            events_with_distance.sort(key=lambda x: (-x[2], x[1]))
+        else:
+            events_with_distance.sort(key=lambda x: x[1])
         
         # Paginate
         start_idx = (page - 1) * per_page
@@ -165,9 +343,11 @@ class EventService:
         
         # Format response
         events_data = []
-        for event, distance in paginated_events:
+        for event, distance, relevance in paginated_events:
             event_dict = self._format_event_response(event)
             event_dict['distance_km'] = round(distance, 2)
+            if ranked:
+                event_dict['relevance'] = relevance
             events_data.append(event_dict)
         
         return {
@@ -184,12 +364,15 @@ class EventService:
                     'type': 'coordinates',
                     'latitude': lat,
                     'longitude': lon,
-                    'radius_km': radius_km
+                    'radius_km': radius_km,
+                    **self._eligibility_criteria(eligibility),
+                    **self._keyword_criteria(params)
                 }
             }
         }
     
-    def _search_by_area(self, params: Dict, page: int, per_page: int) -> Dict[str, Any]:
+    def _search_by_area(self, session: Session, params: Dict, page: int, per_page: int,
+                        eligibility: Dict) -> Dict[str, Any]:
         """Search events by city/area"""
         city = params.get('city')
         state = params.get('state')
@@ -199,26 +382,71 @@ class EventService:
             return {'success': False, 'error': 'City is required for area search'}
         
         # Build query
-        query = Event.query.filter(
-            Event.is_active == True,
-            Event.start_datetime > datetime.utcnow(),
-            Event.state == 'upcoming',
-            func.lower(Event.city) == func.lower(city)
+        query = queries.eligible_events(
+            queries.area_events(session, city, state, country),
+            eligibility['species'], eligibility['age_months']
         )
         
-        if state:
-            query = query.filter(func.lower(Event.state) == func.lower(state))
-        if country:
-            query = query.filter(func.lower(Event.country) == func.lower(country))
+        search_criteria = {
+            'type': 'area',
+            'city': city,
+            'state': state,
+            'country': country,
+            **self._eligibility_criteria(eligibility),
+            **self._keyword_criteria(params)
+        }
+        
+        query, relevance = self._apply_text_search(session, query, params)
+        ranked = relevance is not None
+        
+        # Cursor mode: keyset on (start_datetime, id), no COUNT per page
+        if params.get('pagination') == 'cursor' or params.get('cursor'):
+            if ranked:
+                return {'success': False,
+                        'error': 'Keyword search uses page pagination; cursor is not supported'}
+            total = None
+            if params.get('include_total'):
+                cache_key = ('area', city.lower(), (state or '').lower(), (country or '').lower(),
+                             eligibility['species'], eligibility['age_months'])
+                total = self._area_count_cache.get_or_compute(cache_key, query.count)
+            
+            cursor = params.get('cursor')
+            if cursor:
+                try:
+                    query = query.filter(keyset_filter(Event.start_datetime, Event.id, cursor))
+                except InvalidCursorError as e:
+                    return {'success': False, 'error': str(e)}
+            
+            query = query.order_by(Event.start_datetime, Event.id)
+            events, next_cursor = keyset_page(query, per_page, 'start_datetime')
+            
+            return {
+                'success': True,
+                'data': {
+                    'events': [self._format_event_response(event) for event in events],
+                    'pagination': cursor_pagination(per_page, next_cursor, total),
+                    'search_criteria': search_criteria
+                }
+            }
         
-        # Order by start date
-        query = query.order_by(Event.start_datetime)
+        # Order by start date, best keyword matches first
+        if ranked:
+            query = query.order_by(relevance.desc(), Event.start_datetime, Event.id)
+        else:
+            query = query.order_by(Event.start_datetime, Event.id)
         
         # Paginate
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        events, total = offset_page(query, page, per_page)
         
         # Format response
-        events_data = [self._format_event_response(event) for event in paginated.items]
+        if ranked:
+            events_data = []
+            for event, relevance in events:
+                event_dict = self._format_event_response(event)
+                event_dict['relevance'] = relevance
+                events_data.append(event_dict)
+        else:
+            events_data = [self._format_event_response(event) for event in events]
         
         return {
             'success': True,
@@ -227,15 +455,10 @@ class EventService:
                 'pagination': {
                     'page': page,
                     'per_page': per_page,
-                    'total': paginated.total,
-                    'total_pages': paginated.pages
+                    'total': total,
+                    'total_pages': math.ceil(total / per_page)
                 },
-                'search_criteria': {
-                    'type': 'area',
-                    'city': city,
-                    'state': state,
-                    'country': country
-                }
+                'search_criteria': search_criteria
             }
         }
     
@@ -253,84 +476,48 @@ class EventService:
             Dict with registration status
         """
         try:
-            # Get event
+            # Get event; the row lock orders seat changes (registrations,
+            # cancellations, waitlist promotions) per event
             event = Event.query.filter_by(
                 id=event_id,
                 is_active=True
-            ).first()
+            ).with_for_update().first()
             
             if not event:
                 return {'success': False, 'error': 'Event not found', 'status_code': 404}
             
-            # Check if event is upcoming
-            if event.start_datetime <= datetime.utcnow():
-                return {'success': False, 'error': 'Cannot register for past events'}
-            
-            # Check registration deadline
-            if event.registration_deadline and datetime.utcnow() > event.registration_deadline:
-                return {'success': False, 'error': 'Registration deadline has passed'}
+            closed = self._registration_closed(event)
+            if closed:
+                return {'success': False, 'error': closed}
             
             # Check capacity
-            if event.max_participants and event.current_participants >= event.max_participants:
-                return {'success': False, 'error': 'Event is full'}
+            if self._is_full(event):
+                return {'success': False, 'error': 'Event is full; join the waitlist instead',
+                        'status_code': 409}
             
             # Check for existing registration
-            existing = EventRegistration.query.filter_by(
-                event_id=event_id,
-                owner_id=user_id
-            ).first()
-            
-            if existing and existing.status != 'cancelled':
+            if self._active_registration(event_id, user_id):
                 return {'success': False, 'error': 'Already registered for this event', 'status_code': 409}
             
             # Verify pet ownership
-            pets_to_register = []
-            if pet_ids:
-                from services.pet_service import PetService
-                pet_service = PetService()
-                for pet_id in pet_ids:
-                    if not pet_service.verify_pet_ownership(pet_id, user_id):
-                        return {'success': False, 'error': f'Pet {pet_id} not found or not owned by you'}
-                    pets_to_register.append(pet_id)
-            
-            # Handle payment if required
-            user = Owner.query.get(user_id)
-            if not event.is_free and event.coins_required > 0:
-                if user.coins_balance < event.coins_required:
-                    return {'success': False, 'error': 'Insufficient coins balance'}
-                
-                # Deduct coins
-                user.coins_balance -= event.coins_required
-                ledger_entry = Ledger(
-                    owner_id=user_id,
-                    transaction_type='debit',
-                    amount=event.coins_required,
-                    balance_after=user.coins_balance,
-                    category='event_registration',
-                    reference_type='event',
-                    reference_id=event_id,
-                    description=f'Registration for {event.name}',
-                    created_at=datetime.utcnow()
-                )
-                db.session.add(ledger_entry)
-            
-            # Create registration
-            registration = EventRegistration(
-                event_id=event_id,
-                owner_id=user_id,
-                pet_id=pets_to_register[0] if len(pets_to_register) == 1 else None,
-                registration_datetime=datetime.utcnow(),
-                status='registered',
-                payment_method='coins' if event.coins_required > 0 else None,
-                coins_used=event.coins_required if event.coins_required > 0 else None,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
+            pets = self._verify_pets(pet_ids, user_id)
+            if 'error' in pets:
+                return {'success': False, 'error': pets['error']}
+            pets_to_register = pets['pet_ids']
             
-            # Update event participant count
-            event.current_participants += 1
+            # Check balance up front for a clear error; the debit itself is guarded too
+            price = self._price(event)
+            if price and Owner.query.get(user_id).coins_balance < price:
+                return {'success': False, 'error': 'Insufficient coins balance'}
             
-            db.session.add(registration)
+            seat = self._take_seat(event, user_id, pets_to_register)
+            if not seat['success']:
+                db.session.rollback()
+                return {'success': False, 'error': seat['error']}
+            registration = seat['registration']
+            
+            # Registering directly gives up any waitlist spot
+            self.waitlist_service.remove(event_id, user_id)
             db.session.commit()
             
             logger.info(f"User {user_id} registered for event {event_id}")
@@ -344,7 +531,8 @@ class EventService:
                         'event_id': event_id,
                         'status': registration.status,
                         'pets_registered': pets_to_register,
-                        'coins_used': registration.coins_used
+                        'coins_used': registration.coins_used,
+                        'check_in_token': self.check_in_service.issue_token(registration.id)
                     }
                 }
             }
@@ -354,31 +542,475 @@ class EventService:
             logger.error(f"Error registering for event: {str(e)}")
             return {'success': False, 'error': 'Registration failed'}
     
-    def get_event_details(self, event_id: int, user_id: Optional[int]) -> Dict[str, Any]:
-        """Get detailed event information"""
+    def cancel_registration(self, event_id: int, user_id: int) -> Dict[str, Any]:
+        """
+        Cancel a user's registration and refund the coins they paid
+        
+        The status change, the freed seat, the refund and the promotion of
+        whoever is first on the waitlist commit together, under the event's
+        row lock.
+        
+        Args:
+            event_id: Event ID
+            user_id: User ID
+            
+        Returns:
+            Dict with the cancelled registration and refund
+        """
+        try:
+            event = Event.query.filter_by(
+                id=event_id,
+                is_active=True
+            ).with_for_update().first()
+            
+            if not event:
+                return {'success': False, 'error': 'Event not found', 'status_code': 404}
+            
+            if event.start_datetime <= datetime.utcnow():
+                return {'success': False, 'error': 'Cannot cancel after the event has started'}
+            
+            registration = self._active_registration(event_id, user_id, lock=True)
+            if not registration or registration.status != RegistrationStatus.REGISTERED.value:
+                return {'success': False, 'error': 'Not registered for this event', 'status_code': 404}
+            
+            registration.status = RegistrationStatus.CANCELLED.value
+            registration.updated_at = datetime.utcnow()
+            event.current_participants = max(event.current_participants - 1, 0)
+            
+            refund = None
+            if registration.coins_used and registration.payment_status != 'refunded':
+                refund = self.ledger_service.process_event_refund(
+                    user_id, event_id, registration.coins_used, event.name, commit=False
+                )
+                if not refund['success']:
+                    db.session.rollback()
+                    return {'success': False, 'error': 'Refund failed'}
+                registration.payment_status = 'refunded'
+            
+            promoted = self.promote_waitlist(event)
+            db.session.commit()
+            
+            logger.info(f"User {user_id} cancelled registration for event {event_id}; "
+                        f"promoted {promoted} from the waitlist")
+            
+            return {
+                'success': True,
+                'data': {
+                    'message': 'Registration cancelled',
+                    'registration': {
+                        'id': registration.id,
+                        'event_id': event_id,
+                        'status': registration.status
+                    },
+                    'coins_refunded': refund['transaction']['amount'] if refund else 0,
+                    'coins_balance': refund['transaction']['balance_after'] if refund else None
+                }
+            }
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error cancelling registration for event {event_id}: {str(e)}")
+            return {'success': False, 'error': 'Cancellation failed'}
+    
+    def cancel_event(self, event_id: int, reason: Optional[str] = None,
+                     chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Cancel an event, refunding everyone registered for it (Admin only)
+        
+        Registrations, including attendees already checked in at an
+        ongoing event, are cancelled a chunk at a time: one UPDATE for the
+        chunk's rows and one LedgerBatch for its refunds, i.e. one balance
+        UPDATE per owner and one multi-row ledger INSERT. All chunks run in
+        one transaction under the event's row lock, so the event is only
+        cancelled once every registrant has been refunded. The waitlist is
+        cleared, and registrants and waiting owners are notified.
+        
+        Args:
+            event_id: Event ID
+            reason: Shown to attendees in their notification
+            chunk_size: Registrations per chunk (default EVENT_CANCEL_CHUNK_SIZE)
+        
+        Returns:
+            Dict with counts of cancelled registrations and refunds
+        """
+        chunk_size = chunk_size or Config.EVENT_CANCEL_CHUNK_SIZE
+        try:
+            event = Event.query.filter_by(
+                id=event_id,
+                is_active=True
+            ).with_for_update().first()
+            
+            if not event:
+                return {'success': False, 'error': 'Event not found', 'status_code': 404}
+            
+            if event.status in (EventStatus.COMPLETED.value, EventStatus.CANCELLED.value):
+                return {'success': False, 'error': f'Event is already {event.status}'}
+            
+            # An ongoing event may already have checked-in attendees; they paid too
+            refundable = [RegistrationStatus.REGISTERED.value, RegistrationStatus.ATTENDED.value]
+            now = datetime.utcnow()
+            cancelled = 0
+            refunds = 0
+            coins_refunded = 0
+            owner_ids = []
+            last_id = 0
+            
+            while True:
+                rows = db.session.query(
+                    EventRegistration.id, EventRegistration.owner_id,
+                    EventRegistration.coins_used, EventRegistration.payment_status
+                ).filter(
+                    EventRegistration.event_id == event_id,
+                    EventRegistration.status.in_(refundable),
+                    EventRegistration.id > last_id
+                ).order_by(EventRegistration.id).limit(chunk_size).with_for_update().all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                
+                # Refunds for the chunk, applied together
+                paid = [row for row in rows if row.coins_used and row.payment_status != 'refunded']
+                batch = self.ledger_service.batch()
+                for row in paid:
+                    self.ledger_service.stage_event_refund(
+                        batch, row.owner_id, event_id, row.coins_used, event.name
+                    )
+                result = batch.apply(commit=False)
+                if not result['success']:
+                    db.session.rollback()
+                    logger.error(f"Refunds failed cancelling event {event_id}: {result['error']}")
+                    return {'success': False, 'error': 'Refund failed'}
+                
+                values = {'status': RegistrationStatus.CANCELLED.value, 'updated_at': now}
+                if paid:
+                    values['payment_status'] = case(
+                        (EventRegistration.id.in_([row.id for row in paid]), 'refunded'),
+                        else_=EventRegistration.payment_status
+                    )
+                db.session.execute(
+                    update(EventRegistration).where(
+                        EventRegistration.id.in_([row.id for row in rows])
+                    ).values(**values),
+                    execution_options={'synchronize_session': False}
+                )
+                
+                cancelled += len(rows)
+                refunds += len(paid)
+                coins_refunded += sum(row.coins_used for row in paid)
+                owner_ids.extend(row.owner_id for row in rows)
+            
+            # Nobody waiting can be promoted any more
+            waiting = self.waitlist_service.clear_events([event_id])
+            
+            event.status = EventStatus.CANCELLED.value
+            event.current_participants = max(event.current_participants - cancelled, 0)
+            event.updated_at = now
+            
+            title = f'Cancelled: {event.name}'[:255]
+            body = (reason or 'The organiser cancelled this event. Any coins you paid have been refunded.')[:255]
+            recipients = list(dict.fromkeys(owner_ids + waiting))
+            for start in range(0, len(recipients), chunk_size):
+                db.session.execute(insert(Notification), [{
+                    'owner_id': owner_id,
+                    'kind': 'event_cancelled',
+                    'event_id': event_id,
+                    'title': title,
+                    'body': body,
+                    'created_at': now
+                } for owner_id in recipients[start:start + chunk_size]])
+            
+            # Feeds drop the event from the outbox worker
+            self.outbox_service.publish(self.outbox_service.EVENT_CANCELLED, [{'event_id': event_id}])
+            db.session.commit()
+            
+            self.invalidate_search_cache()
+            
+            logger.info(f"Event {event_id} cancelled: {cancelled} registrations, "
+                        f"{refunds} refunds ({coins_refunded} coins), {len(waiting)} waitlisted")
+            
+            return {
+                'success': True,
+                'data': {
+                    'message': 'Event cancelled',
+                    'event_id': event_id,
+                    'registrations_cancelled': cancelled,
+                    'refunds': refunds,
+                    'coins_refunded': coins_refunded,
+                    'waitlist_cleared': len(waiting)
+                }
+            }
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error cancelling event {event_id}: {str(e)}")
+            return {'success': False, 'error': 'Failed to cancel event'}
+    
+    def join_waitlist(self, event_id: int, user_id: int, pet_ids: List[int]) -> Dict[str, Any]:
+        """
+        Join the waitlist of a full event
+        
+        Nothing is charged now; coins are debited when the user is promoted.
+        
+        Args:
+            event_id: Event ID
+            user_id: User ID
+            pet_ids: Pets to register on promotion
+            
+        Returns:
+            Dict with the user's waitlist position
+        """
         try:
             event = Event.query.filter_by(
                 id=event_id,
                 is_active=True
-            ).first()
+            ).with_for_update().first()
             
             if not event:
-                return {'success': False, 'error': 'Event not found'}
+                return {'success': False, 'error': 'Event not found', 'status_code': 404}
+            
+            closed = self._registration_closed(event)
+            if closed:
+                return {'success': False, 'error': closed}
+            
+            if not self._is_full(event):
+                return {'success': False, 'error': 'Event has open spots; register instead'}
+            
+            if self._active_registration(event_id, user_id):
+                return {'success': False, 'error': 'Already registered for this event', 'status_code': 409}
+            
+            if self.waitlist_service.is_waiting(event_id, user_id):
+                return {'success': False, 'error': 'Already on the waitlist', 'status_code': 409}
+            
+            pets = self._verify_pets(pet_ids, user_id)
+            if 'error' in pets:
+                return {'success': False, 'error': pets['error']}
+            
+            price = self._price(event)
+            if price and Owner.query.get(user_id).coins_balance < price:
+                return {'success': False, 'error': 'Insufficient coins balance'}
+            
+            position = self.waitlist_service.add(event_id, user_id, pets['pet_ids'])
+            db.session.commit()
+            
+            logger.info(f"User {user_id} joined waitlist for event {event_id} at {position}")
+            
+            return {
+                'success': True,
+                'data': {
+                    'message': 'Added to the waitlist',
+                    'waitlist': {
+                        'event_id': event_id,
+                        'position': position,
+                        'pets_registered': pets['pet_ids'],
+                        'coins_required': price
+                    }
+                }
+            }
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error joining waitlist for event {event_id}: {str(e)}")
+            return {'success': False, 'error': 'Failed to join waitlist'}
+    
+    def leave_waitlist(self, event_id: int, user_id: int) -> Dict[str, Any]:
+        """Leave an event's waitlist"""
+        try:
+            event = Event.query.filter_by(id=event_id).with_for_update().first()
+            if not event or not self.waitlist_service.remove(event_id, user_id):
+                return {'success': False, 'error': 'Not on the waitlist for this event',
+                        'status_code': 404}
+            
+            db.session.commit()
+            return {'success': True, 'data': {'message': 'Removed from the waitlist'}}
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error leaving waitlist for event {event_id}: {str(e)}")
+            return {'success': False, 'error': 'Failed to leave waitlist'}
+    
+    def get_waitlist_position(self, event_id: int, user_id: int,
+                              session: Optional[Session] = None) -> Dict[str, Any]:
+        """A user's position on an event's waitlist"""
+        return self.waitlist_service.get_position(event_id, user_id, session)
+    
+    def promote_waitlist(self, event: Event) -> List[int]:
+        """
+        Fill an event's open seats from the head of its waitlist (no commit)
+        
+        Runs in the transaction that freed the seats, with the event row
+        locked. An owner who can no longer pay is dropped and the next one
+        tried. Either way the owner gets a notification.
+        
+        Returns:
+            IDs of the owners registered
+        """
+        promoted = []
+        now = datetime.utcnow()
+        while not self._is_full(event):
+            head = self.waitlist_service.pop_head(event.id)
+            if head is None:
+                break
+            
+            seat = self._take_seat(event, head['owner_id'], head['pet_ids'])
+            if seat['success']:
+                promoted.append(head['owner_id'])
+                kind, title = 'waitlist_promoted', f"You're registered for {event.name}"
+            else:
+                logger.info(f"Dropped owner {head['owner_id']} from event {event.id} "
+                            f"waitlist: {seat['error']}")
+                kind, title = 'waitlist_dropped', f"We couldn't register you for {event.name}"
+            
+            db.session.add(Notification(
+                owner_id=head['owner_id'],
+                kind=kind,
+                event_id=event.id,
+                title=title[:255],
+                body=(seat['error'] if not seat['success'] else
+                      f"{event.start_datetime:%d %b %Y, %H:%M} at {event.venue_name or event.city}")[:255],
+                created_at=now
+            ))
+        
+        return promoted
+    
+    def _take_seat(self, event: Event, owner_id: int, pet_ids: List[int]) -> Dict[str, Any]:
+        """
+        Charge an owner for an event and register them (no commit)
+        
+        The caller holds the event's row lock. The debit runs in a
+        savepoint, so an owner who cannot pay leaves nothing behind.
+        
+        Returns:
+            Dict with the registration, or error
+        """
+        price = self._price(event)
+        if price:
+            batch = self.ledger_service.batch()
+            batch.debit(
+                owner_id=owner_id,
+                amount=price,
+                category=TransactionCategory.EVENT_REGISTRATION.value,
+                description=f'Registration for {event.name}',
+                reference_type='event',
+                reference_id=event.id
+            )
+            payment = batch.apply(commit=False)
+            if not payment['success']:
+                return payment
+        
+        now = datetime.utcnow()
+        pet_id = pet_ids[0] if len(pet_ids) == 1 else None
+        
+        # Re-registering revives a cancelled row, which the unique key would otherwise block
+        registration = EventRegistration.query.filter_by(
+            event_id=event.id,
+            owner_id=owner_id,
+            pet_id=pet_id,
+            status=RegistrationStatus.CANCELLED.value
+        ).first()
+        if registration is None:
+            registration = EventRegistration(event_id=event.id, owner_id=owner_id,
+                                             pet_id=pet_id, created_at=now)
+            db.session.add(registration)
+        
+        registration.registration_datetime = now
+        registration.status = RegistrationStatus.REGISTERED.value
+        registration.payment_status = 'completed' if price else None
+        registration.payment_method = 'coins' if price else None
+        registration.coins_used = price or None
+        registration.checked_in = False
+        registration.check_in_time = None
+        registration.updated_at = now
+        
+        # Update event participant count
+        event.current_participants += 1
+        
+        # Precomputed feeds are brought in step by the outbox worker
+        self.outbox_service.publish(self.outbox_service.REGISTRATION_CREATED, [
+            {'owner_id': owner_id, 'event_id': event.id}
+        ])
+        
+        return {'success': True, 'registration': registration}
+    
+    def _active_registration(self, event_id: int, owner_id: int,
+                             lock: bool = False) -> Optional[EventRegistration]:
+        """An owner's registration for an event that is not cancelled"""
+        query = EventRegistration.query.filter(
+            EventRegistration.event_id == event_id,
+            EventRegistration.owner_id == owner_id,
+            EventRegistration.status != RegistrationStatus.CANCELLED.value
+        )
+        if lock:
+            query = query.with_for_update()
+        return query.first()
+    
+    def _verify_pets(self, pet_ids: List[int], owner_id: int) -> Dict[str, Any]:
+        """Dict with the pet IDs if the owner owns them all, or error"""
+        if not pet_ids:
+            return {'pet_ids': []}
+        
+        from services.pet_service import PetService
+        pet_service = PetService()
+        for pet_id in pet_ids:
+            if not pet_service.verify_pet_ownership(pet_id, owner_id):
+                return {'error': f'Pet {pet_id} not found or not owned by you'}
+        return {'pet_ids': list(pet_ids)}
+    
+    def _registration_closed(self, event: Event) -> Optional[str]:
+        """Why an event no longer takes registrations, if it doesn't"""
+        if event.status == EventStatus.CANCELLED.value:
+            return 'Event has been cancelled'
+        
+        # Check if event is upcoming
+        if event.start_datetime <= datetime.utcnow():
+            return 'Cannot register for past events'
+        
+        # Check registration deadline
+        if event.registration_deadline and datetime.utcnow() > event.registration_deadline:
+            return 'Registration deadline has passed'
+        
+        return None
+    
+    @staticmethod
+    def _is_full(event: Event) -> bool:
+        return bool(event.max_participants) and event.current_participants >= event.max_participants
+    
+    @staticmethod
+    def _price(event: Event) -> int:
+        """Coins charged to register (0 for free events)"""
+        if event.is_free or not event.coins_required or event.coins_required < 0:
+            return 0
+        return event.coins_required
+    
+    def get_event_details(self, event_id: int, user_id: Optional[int],
+                          session: Optional[Session] = None) -> Dict[str, Any]:
+        """Get detailed event information"""
+        try:
+            session = session or db.session
+            event = queries.active_event(session, event_id)
+            
+            # Fall back to the archive for old completed/cancelled events
+            archived = False
+            if not event:
+                event = self.archive_service.get_archived_event(event_id, session)
+                archived = event is not None and event.is_active
+                if not archived:
+                    return {'success': False, 'error': 'Event not found'}
             
             event_data = self._format_event_response(event, detailed=True)
+            if archived:
+                event_data['archived'] = True
             
             # Add registration status if user is authenticated
             if user_id:
-                registration = EventRegistration.query.filter_by(
-                    event_id=event_id,
-                    owner_id=user_id
-                ).first()
+                if archived:
+                    registration = self.archive_service.get_archived_registration(
+                        event_id, user_id, session
+                    )
+                else:
+                    registration = queries.event_registration(session, event_id, user_id)
                 
                 if registration:
-                    event_data['user_registration'] = {
-                        'status': registration.status,
-                        'registered_at': registration.registration_datetime.isoformat()
-                    }
+                    event_data['user_registration'] = self._format_user_registration(registration)
             
             return {
                 'success': True,
@@ -389,6 +1021,280 @@ class EventService:
             logger.error(f"Error fetching event {event_id}: {str(e)}")
             return {'success': False, 'error': 'Failed to fetch event details'}
     
+    @staticmethod
+    def event_ids_from_args(args) -> List[int]:
+        """
+        Parse the ids query parameter of a batch event lookup
+        
+        Accepts comma-separated values, repeated parameters or both
+        (ids=3,1&ids=2). Duplicates are dropped; first occurrence wins.
+        
+        Raises:
+            ValueError: If an ID is not a positive integer
+        """
+        event_ids = []
+        for value in args.getlist('ids'):
+            for part in value.split(','):
+                part = part.strip()
+                if not part:
+                    continue
+                if not part.isdigit() or int(part) < 1:
+                    raise ValueError(f'Invalid event ID: {part}')
+                if int(part) not in event_ids:
+                    event_ids.append(int(part))
+        return event_ids
+    
+    def get_events_by_ids(self, event_ids: List[int], user_id: Optional[int],
+                          session: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        Batch form of get_event_details
+        
+        One IN query loads the events and one more loads the caller's
+        registrations for them; only IDs missing from the live table are
+        looked up in the archive, the same way.
+        
+        Args:
+            event_ids: Event IDs in the order to return them
+            user_id: Current user, to include their registration status
+            session: Session to query on (defaults to db.session)
+        
+        Returns:
+            Dict with detailed events in input order and IDs not found
+        """
+        try:
+            session = session or db.session
+            if not event_ids:
+                return {'success': False, 'error': 'ids is required'}
+            if len(event_ids) > Config.MAX_BATCH_IDS:
+                return {'success': False,
+                        'error': f'At most {Config.MAX_BATCH_IDS} events per request'}
+            
+            events = {event.id: event for event in queries.active_events(session, event_ids)}
+            registrations = {}
+            if user_id and events:
+                registrations = queries.event_registrations(session, list(events), user_id)
+            
+            # Fall back to the archive for old completed/cancelled events
+            missing = [event_id for event_id in event_ids if event_id not in events]
+            archived = {}
+            if missing:
+                archived = {
+                    event_id: event for event_id, event in
+                    self.archive_service.get_archived_events(missing, session).items()
+                    if event.is_active
+                }
+                if user_id and archived:
+                    registrations.update(self.archive_service.get_archived_registrations(
+                        list(archived), user_id, session
+                    ))
+            
+            events_data = []
+            for event_id in event_ids:
+                event = events.get(event_id) or archived.get(event_id)
+                if event is None:
+                    continue
+                
+                event_data = self._format_event_response(event, detailed=True)
+                if event_id in archived:
+                    event_data['archived'] = True
+                if event_id in registrations:
+                    event_data['user_registration'] = self._format_user_registration(
+                        registrations[event_id]
+                    )
+                events_data.append(event_data)
+            
+            return {
+                'success': True,
+                'data': {
+                    'events': events_data,
+                    'not_found': [event_id for event_id in event_ids
+                                  if event_id not in events and event_id not in archived]
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error fetching events {event_ids}: {str(e)}")
+            return {'success': False, 'error': 'Failed to fetch events'}
+    
+    def get_user_registrations(self, user_id: int, when: Optional[str] = None,
+                               cursor: Optional[str] = None, per_page: int = 20,
+                               session: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        List a user's registrations, most recently registered first
+        
+        Each page is one query: registrations joined with their event and
+        pet, walked by keyset on (registration_datetime, id) along
+        ix_event_registrations_owner_registered_at_id, with no COUNT.
+        
+        Registrations for archived events (all long over) follow once the
+        live ones run out, for 'past' and unfiltered listings, newest
+        archived ID first. Cursors into that tail start with
+        ARCHIVE_CURSOR_PREFIX.
+        
+        Args:
+            user_id: User ID
+            when: 'upcoming' (event not yet over), 'past', or None for all
+            cursor: Cursor from a previous page
+            per_page: Items per page
+            session: Session to query on (defaults to db.session)
+        
+        Returns:
+            Dict with registrations and cursor pagination
+        """
+        try:
+            session = session or db.session
+            if when not in (None, 'upcoming', 'past'):
+                return {'success': False, 'error': "when must be 'upcoming' or 'past'"}
+            
+            registrations, next_cursor, archive_before = [], None, None
+            in_archive = bool(cursor) and cursor.startswith(self.ARCHIVE_CURSOR_PREFIX)
+            if in_archive:
+                try:
+                    archive_before = int(cursor[len(self.ARCHIVE_CURSOR_PREFIX):] or 0) or None
+                except ValueError:
+                    return {'success': False, 'error': 'Invalid cursor'}
+            else:
+                query = queries.owner_registrations(session, user_id)
+                
+                now = datetime.utcnow()
+                if when == 'upcoming':
+                    query = query.filter(Event.end_datetime > now)
+                elif when == 'past':
+                    query = query.filter(Event.end_datetime <= now)
+                
+                if cursor:
+                    try:
+                        query = query.filter(keyset_filter(
+                            EventRegistration.registration_datetime, EventRegistration.id,
+                            cursor, descending=True
+                        ))
+                    except InvalidCursorError as e:
+                        return {'success': False, 'error': str(e)}
+                
+                query = query.order_by(EventRegistration.registration_datetime.desc(),
+                                       EventRegistration.id.desc())
+                registrations, next_cursor = keyset_page(query, per_page, 'registration_datetime')
+            
+            items = [self._format_registration(registration) for registration in registrations]
+            
+            # Live registrations exhausted: fill the page from the archive
+            if next_cursor is None and when != 'upcoming':
+                room = per_page - len(items)
+                archived = self.archive_service.get_owner_registrations(
+                    user_id, archive_before, room + 1, session
+                )
+                pets = {}
+                pet_ids = {registration.pet_id for registration, _ in archived[:room]
+                           if registration.pet_id}
+                if pet_ids:
+                    pets = {pet.id: pet for pet in session.query(Pet).filter(Pet.id.in_(pet_ids))}
+                items.extend(
+                    self._format_registration(registration, event, pets.get(registration.pet_id))
+                    for registration, event in archived[:room]
+                )
+                if len(archived) > room:
+                    last_id = archived[room - 1][0].id if room else archive_before
+                    next_cursor = f"{self.ARCHIVE_CURSOR_PREFIX}{last_id or ''}"
+            
+            return {
+                'success': True,
+                'data': {
+                    'registrations': items,
+                    'pagination': cursor_pagination(per_page, next_cursor)
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error fetching registrations for user {user_id}: {str(e)}")
+            return {'success': False, 'error': 'Failed to fetch registrations'}
+    
+    def _format_registration(self, registration: EventRegistration,
+                             event: Optional[Event] = None, pet: Optional[Pet] = None) -> Dict:
+        """Format a registration with its event and pet (by default the already loaded ones)"""
+        event = event or registration.event
+        pet = pet or registration.pet
+        return {
+            'id': registration.id,
+            'status': registration.status,
+            'registered_at': registration.registration_datetime.isoformat(),
+            'payment_status': registration.payment_status,
+            'coins_used': registration.coins_used,
+            'checked_in': registration.checked_in,
+            'check_in_token': self.check_in_service.issue_token(registration.id),
+            'event': self._format_event_response(event) if event else None,
+            'pet': {
+                'id': pet.id,
+                'name': pet.name,
+                'species': pet.species.value if pet.species else None
+            } if pet else None
+        }
+    
+    def _format_user_registration(self, registration: EventRegistration) -> Dict:
+        return {
+            'status': registration.status,
+            'registered_at': registration.registration_datetime.isoformat()
+        }
+    
+    def backfill_eligibility(self, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Recompute species_mask/min_age_months/max_age_months from the JSON fields
+        
+        For events created before the columns existed. Rows whose JSON
+        cannot be parsed are left unrestricted and reported.
+        
+        Args:
+            batch_size: Events loaded and committed per batch
+        
+        Returns:
+            Dict with counts of updated and invalid events
+        """
+        updated = 0
+        invalid = []
+        last_id = 0
+        
+        try:
+            while True:
+                events = Event.query.filter(Event.id > last_id).order_by(Event.id).limit(batch_size).all()
+                if not events:
+                    break
+                
+                for event in events:
+                    try:
+                        mask = species_mask(event.allowed_species)
+                        min_age_months, max_age_months = age_bounds(event.age_restrictions)
+                    except ValueError:
+                        invalid.append(event.id)
+                        continue
+                    
+                    if (event.species_mask, event.min_age_months, event.max_age_months) != \
+                            (mask, min_age_months, max_age_months):
+                        event.species_mask = mask
+                        event.min_age_months = min_age_months
+                        event.max_age_months = max_age_months
+                        updated += 1
+                
+                last_id = events[-1].id
+                db.session.commit()
+            
+            if updated:
+                self.invalidate_search_cache()
+            
+            return {'success': True, 'updated': updated, 'invalid': invalid}
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error backfilling event eligibility: {str(e)}")
+            return {'success': False, 'error': 'Failed to backfill event eligibility'}
+    
+    @classmethod
+    def invalidate_search_cache(cls) -> None:
+        """
+        Drop cached search state after events are created or change status
+        
+        Area totals count every event in an area, so the whole cache goes.
+        """
+        cls._area_count_cache.clear()
+    
     def _format_event_response(self, event: Event, detailed: bool = False) -> Dict:
         """Format event data for response"""
         response = {
@@ -0,0 +1,332 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from bisect import insort
+import math
+import logging
+
+from sqlalchemy import or_, select
+
+from config import Config
+from models import db, Owner, Pet, Event, EventRegistration, OwnerFeed
+from services import queries
+from utils.eligibility import SPECIES_BITS, is_eligible, pet_age_months
+from utils.location import calculate_distance, get_bounding_box
+
+logger = logging.getLogger(__name__)
+
+
+def utc_timestamp(value: datetime) -> float:
+    """Unix time of a naive UTC datetime"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class FeedService:
+    """
+    Service class for the precomputed "events for you" feed
+    
+    Each owner's feed is one owner_feeds row holding a ranked list of
+    [start_timestamp, event_id] pairs: upcoming events within radius_km of
+    the owner that at least one of their pets can attend, not full and not
+    already registered for, soonest first. Reading a feed is a primary key
+    lookup plus one batched event load.
+    
+    Event-side changes (created, filled, registered for) patch the affected
+    feeds in place, from the outbox worker. Owner-side changes (location,
+    pets) mark the feed stale; it is rebuilt on next read or by
+    `flask feeds build`.
+    
+    A feed cut off at `size` entries does not see events past its last
+    entry, so once its live entries fall below `refill_below`, or a page
+    runs past them, it is rebuilt on read to pull in the tail.
+    """
+    
+    def __init__(self, radius_km: Optional[float] = None, size: Optional[int] = None,
+                 refill_below: Optional[int] = None):
+        self.radius_km = radius_km or Config.FEED_RADIUS_KM
+        self.size = size or Config.FEED_SIZE
+        self.refill_below = min(refill_below or Config.FEED_REFILL_BELOW, self.size)
+    
+    def get_feed(self, owner_id: int, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
+        """
+        Get one page of an owner's feed
+        
+        Args:
+            owner_id: Owner ID
+            page: Page number
+            per_page: Items per page
+        
+        Returns:
+            Dict with events and pagination, or error
+        """
+        try:
+            owner = queries.active_user(db.session, owner_id)
+            if not owner:
+                return {'success': False, 'error': 'User not found', 'status_code': 404}
+            if owner.latitude is None or owner.longitude is None:
+                return {'success': False, 'error': 'Set your location to see events for you'}
+            
+            now = datetime.utcnow()
+            feed = db.session.get(OwnerFeed, owner_id)
+            if feed is None or feed.is_stale or self._needs_refill(feed, page * per_page, now):
+                feed = self._store(owner_id, self._compute_entries(owner))
+                db.session.commit()
+            
+            # Entries are soonest first, so started events sit at the front
+            entries = [entry for entry in feed.entries if entry[0] > utc_timestamp(now)]
+            page_ids = [event_id for _, event_id in entries[(page - 1) * per_page:page * per_page]]
+            
+            events = self._hydrate(owner_id, page_ids, now)
+            
+            # Drop entries that stopped qualifying since the feed was written
+            dropped = set(page_ids) - {event.id for event in events}
+            if dropped or len(entries) < len(feed.entries):
+                entries = [entry for entry in entries if entry[1] not in dropped]
+                feed.entries = entries
+                db.session.commit()
+            
+            from services.event_service import EventService
+            event_service = EventService()
+            
+            return {
+                'success': True,
+                'data': {
+                    'events': [event_service._format_event_response(event) for event in events],
+                    'pagination': {
+                        'page': page,
+                        'per_page': per_page,
+                        'total': len(entries),
+                        'total_pages': math.ceil(len(entries) / per_page)
+                    },
+                    'built_at': feed.built_at.isoformat() if feed.built_at else None
+                }
+            }
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error fetching feed for owner {owner_id}: {str(e)}")
+            return {'success': False, 'error': 'Failed to fetch feed'}
+    
+    def build_feeds(self, stale_only: bool = True, batch_size: int = 200) -> Dict[str, Any]:
+        """
+        Materialize feeds for active owners with a location
+        
+        Args:
+            stale_only: Only owners without a feed or with a stale one
+            batch_size: Owners built per transaction
+        
+        Returns:
+            Dict with the number of feeds built
+        """
+        built = 0
+        last_id = 0
+        
+        try:
+            while True:
+                query = Owner.query.filter(
+                    Owner.id > last_id,
+                    Owner.is_active == True,
+                    Owner.is_deleted == False,
+                    Owner.latitude.isnot(None),
+                    Owner.longitude.isnot(None)
+                )
+                if stale_only:
+                    query = query.outerjoin(OwnerFeed, OwnerFeed.owner_id == Owner.id).filter(
+                        or_(OwnerFeed.owner_id.is_(None), OwnerFeed.is_stale == True)
+                    )
+                owners = query.order_by(Owner.id).limit(batch_size).all()
+                if not owners:
+                    break
+                
+                for owner in owners:
+                    self._store(owner.id, self._compute_entries(owner))
+                    built += 1
+                
+                last_id = owners[-1].id
+                db.session.commit()
+            
+            return {'success': True, 'built': built}
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error building feeds: {str(e)}")
+            return {'success': False, 'error': 'Failed to build feeds'}
+    
+    def on_event_created(self, event: Event) -> None:
+        """Insert a new event into the feeds of nearby owners whose pets can attend it"""
+        self.on_events_created([event])
+    
+    def on_events_created(self, events: List[Event]) -> None:
+        """
+        Insert a batch of new events into nearby owners' feeds
+        
+        Like the other on_* hooks this runs from the outbox worker and does
+        not commit: the feed changes commit with the message's done mark,
+        and an error propagates so the message is retried.
+        """
+        now = datetime.utcnow()
+        for event in events:
+            if not self._is_open(event, now):
+                continue
+            
+            entry = [utc_timestamp(event.start_datetime), event.id]
+            nearby = self._nearby_feeds(event)
+            pets_by_owner = self._pets_by_owner([owner.id for _, owner in nearby])
+            
+            for feed, owner in nearby:
+                if not self._open_to_pets(event, pets_by_owner.get(owner.id, [])):
+                    continue
+                
+                entries = [list(item) for item in feed.entries]
+                # A full feed only covers events up to its last entry
+                if len(entries) >= self.size and entry > entries[-1]:
+                    feed.is_truncated = True
+                    continue
+                insort(entries, entry)
+                if len(entries) > self.size:
+                    feed.is_truncated = True
+                feed.entries = entries[:self.size]
+    
+    def on_event_unavailable(self, event: Event) -> None:
+        """Remove an event that filled up or was cancelled from nearby owners' feeds (no commit)"""
+        for feed, _ in self._nearby_feeds(event):
+            self._remove_entry(feed, event.id)
+    
+    def on_registered(self, owner_id: int, event_id: int) -> None:
+        """Remove an event from the feed of an owner who just registered for it (no commit)"""
+        feed = OwnerFeed.query.filter_by(owner_id=owner_id).with_for_update().first()
+        if feed:
+            self._remove_entry(feed, event_id)
+    
+    def invalidate(self, owner_id: int) -> None:
+        """Mark an owner's feed for rebuild after their location or pets change"""
+        try:
+            OwnerFeed.query.filter_by(owner_id=owner_id).update({'is_stale': True})
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error invalidating feed for owner {owner_id}: {str(e)}")
+    
+    def _compute_entries(self, owner: Owner) -> List[List]:
+        """Rank the events an owner's feed should hold"""
+        now = datetime.utcnow()
+        pets = queries.owner_pets(db.session, owner.id)
+        min_lat, max_lat, min_lon, max_lon = get_bounding_box(
+            owner.latitude, owner.longitude, self.radius_km
+        )
+        
+        registered = select(EventRegistration.event_id).where(
+            EventRegistration.owner_id == owner.id,
+            EventRegistration.status != 'cancelled'
+        )
+        query = queries.upcoming_events(db.session).filter(
+            Event.latitude.between(min_lat, max_lat),
+            Event.longitude.between(min_lon, max_lon),
+            or_(Event.max_participants.is_(None),
+                Event.current_participants < Event.max_participants),
+            or_(Event.registration_deadline.is_(None), Event.registration_deadline > now),
+            Event.id.notin_(registered)
+        )
+        if pets:
+            mask = 0
+            for pet in pets:
+                mask |= SPECIES_BITS[pet.species]
+            query = query.filter(Event.species_mask.op('&')(mask) != 0)
+        
+        entries = []
+        for event in query.order_by(Event.start_datetime, Event.id).yield_per(200):
+            if calculate_distance(owner.latitude, owner.longitude,
+                                  event.latitude, event.longitude) > self.radius_km:
+                continue
+            if not self._open_to_pets(event, pets):
+                continue
+            entries.append([utc_timestamp(event.start_datetime), event.id])
+            if len(entries) >= self.size:
+                break
+        return entries
+    
+    def _needs_refill(self, feed: OwnerFeed, wanted: int, now: datetime) -> bool:
+        """Whether a cut-off feed has too few live entries left, or fewer than a page needs"""
+        if not feed.is_truncated:
+            return False
+        live = sum(1 for entry in feed.entries if entry[0] > utc_timestamp(now))
+        return live < max(self.refill_below, min(wanted, self.size))
+    
+    def _hydrate(self, owner_id: int, event_ids: List[int], now: datetime) -> List[Event]:
+        """Load feed events in rank order, skipping any that no longer qualify"""
+        if not event_ids:
+            return []
+        
+        events = {event.id: event for event in Event.query.filter(Event.id.in_(event_ids)).all()}
+        registered = {
+            event_id for (event_id,) in db.session.query(EventRegistration.event_id).filter(
+                EventRegistration.owner_id == owner_id,
+                EventRegistration.event_id.in_(event_ids),
+                EventRegistration.status != 'cancelled'
+            )
+        }
+        return [
+            events[event_id] for event_id in event_ids
+            if event_id in events
+            and event_id not in registered
+            and events[event_id].status == 'upcoming'
+            and self._is_open(events[event_id], now)
+        ]
+    
+    def _store(self, owner_id: int, entries: List[List]) -> OwnerFeed:
+        feed = db.session.get(OwnerFeed, owner_id)
+        if feed is None:
+            feed = OwnerFeed(owner_id=owner_id)
+            db.session.add(feed)
+        feed.entries = entries
+        feed.is_stale = False
+        feed.is_truncated = len(entries) >= self.size
+        feed.built_at = datetime.utcnow()
+        return feed
+    
+    def _nearby_feeds(self, event: Event) -> List[Tuple[OwnerFeed, Owner]]:
+        """Fresh feeds of owners within radius_km of an event, locked for update"""
+        min_lat, max_lat, min_lon, max_lon = get_bounding_box(
+            event.latitude, event.longitude, self.radius_km
+        )
+        rows = db.session.query(OwnerFeed, Owner).join(Owner, Owner.id == OwnerFeed.owner_id).filter(
+            OwnerFeed.is_stale == False,
+            Owner.latitude.between(min_lat, max_lat),
+            Owner.longitude.between(min_lon, max_lon)
+        ).with_for_update(of=OwnerFeed).all()
+        return [
+            (feed, owner) for feed, owner in rows
+            if calculate_distance(owner.latitude, owner.longitude,
+                                  event.latitude, event.longitude) <= self.radius_km
+        ]
+    
+    def _pets_by_owner(self, owner_ids: List[int]) -> Dict[int, List[Pet]]:
+        pets_by_owner: Dict[int, List[Pet]] = {}
+        if owner_ids:
+            for pet in Pet.query.filter(Pet.owner_id.in_(owner_ids), Pet.is_active == True):
+                pets_by_owner.setdefault(pet.owner_id, []).append(pet)
+        return pets_by_owner
+    
+    def _remove_entry(self, feed: OwnerFeed, event_id: int) -> None:
+        entries = [entry for entry in feed.entries if entry[1] != event_id]
+        if len(entries) != len(feed.entries):
+            feed.entries = entries
+    
+    def _is_open(self, event: Event, now: datetime) -> bool:
+        """Whether an event can still take registrations"""
+        if not event.is_active or event.start_datetime <= now:
+            return False
+        if event.registration_deadline and event.registration_deadline <= now:
+            return False
+        if event.max_participants and event.current_participants >= event.max_participants:
+            return False
+        return True
+    
+    def _open_to_pets(self, event: Event, pets: List[Pet]) -> bool:
+        """Whether at least one pet meets the event's species and age rules"""
+        if not pets:
+            return True
+        return any(
+            is_eligible(event.species_mask, event.min_age_months, event.max_age_months,
+                        pet.species, pet_age_months(pet.age_years, pet.age_months))
+            for pet in pets
+        )
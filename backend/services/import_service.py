@@ -0,0 +1,208 @@
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import csv
+import json
+import logging
+
+from sqlalchemy import insert
+
+from config import Config
+from extensions import place_index
+from models import db, Event
+from services.event_service import EventService
+from services.outbox_service import OutboxService
+
+logger = logging.getLogger(__name__)
+
+
+# Columns accepted from an import file; anything else is ignored
+IMPORT_FIELDS = [
+    'name', 'description', 'event_type', 'start_datetime', 'end_datetime',
+    'registration_deadline', 'venue_name', 'address', 'city', 'state', 'country',
+    'pincode', 'latitude', 'longitude', 'max_participants', 'allowed_species',
+    'age_restrictions', 'is_free', 'entry_fee', 'coins_required', 'cover_image',
+    'gallery_images'
+]
+
+FLOAT_FIELDS = ('latitude', 'longitude', 'entry_fee')
+INT_FIELDS = ('max_participants', 'coins_required')
+LIST_FIELDS = ('allowed_species', 'gallery_images')  # JSON array or "a|b|c"
+
+
+def read_rows(lines: Iterable[str], import_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Parse an import file lazily, one record at a time
+    
+    Args:
+        lines: Text lines of the file (a file object or decoded request stream)
+        import_format: 'csv' (header row required) or 'ndjson'
+    
+    Yields:
+        Tuples of (line number, record). A record that cannot be parsed is
+        yielded as a ValueError so the caller can report it and move on.
+    """
+    if import_format == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, ValueError('Invalid JSON')
+            continue
+        if not isinstance(record, dict):
+            record = ValueError('Each line must be a JSON object')
+        yield line_number, record
+
+
+def coerce_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn an import record into create_event input
+    
+    CSV cells arrive as strings; blanks become None and numeric, boolean,
+    list and age_restrictions cells are converted. NDJSON values that are
+    already typed pass through unchanged.
+    
+    Raises:
+        ValueError: If a cell cannot be converted
+    """
+    event_data = {}
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+            try:
+                if field in FLOAT_FIELDS:
+                    value = float(value)
+                elif field in INT_FIELDS:
+                    value = int(value)
+                elif field == 'is_free':
+                    value = value.lower() in ('1', 'true', 'yes', 'y')
+                elif field in LIST_FIELDS:
+                    value = json.loads(value) if value.startswith('[') else [
+                        part.strip() for part in value.split('|') if part.strip()
+                    ]
+                elif field == 'age_restrictions':
+                    value = json.loads(value)
+            except ValueError:
+                raise ValueError(f'Invalid value for {field}')
+        if value is not None:
+            event_data[field] = value
+    return event_data
+
+
+class EventImportService:
+    """
+    Service class for importing events in bulk from CSV or NDJSON
+    
+    Rows are validated one at a time as the file streams in, exactly as
+    POST /api/v1/events would validate them. Valid rows are inserted in
+    chunks with one multi-row INSERT and one commit per chunk, which also
+    queues their event.created outbox messages (notifications and feeds);
+    search caches and the place index are then updated once per chunk
+    rather than once per event.
+    """
+    
+    def __init__(self, chunk_size: Optional[int] = None, max_errors: Optional[int] = None):
+        self.chunk_size = chunk_size or Config.EVENT_IMPORT_CHUNK_SIZE
+        self.max_errors = max_errors or Config.EVENT_IMPORT_MAX_ERRORS
+        self.event_service = EventService()
+    
+    def import_events(self, lines: Iterable[str], import_format: str,
+                      creator_id: int) -> Dict[str, Any]:
+        """
+        Validate and insert the events in an import file
+        
+        Args:
+            lines: Text lines of the file, read lazily
+            import_format: 'csv' or 'ndjson'
+            creator_id: Admin the events are created for
+        
+        Returns:
+            Dict with counts, created event IDs and a per-row error report
+        """
+        report = {
+            'imported': 0,
+            'failed': 0,
+            'event_ids': [],
+            'errors': [],
+            'errors_truncated': False
+        }
+        chunk: List[Tuple[int, Dict]] = []
+        
+        try:
+            for line_number, record in read_rows(lines, import_format):
+                prepared = self._prepare_row(record, creator_id)
+                if 'error' in prepared:
+                    self._add_error(report, line_number, prepared['error'])
+                    continue
+                
+                chunk.append((line_number, prepared['values']))
+                if len(chunk) >= self.chunk_size:
+                    self._insert_chunk(chunk, report)
+                    chunk = []
+            
+            if chunk:
+                self._insert_chunk(chunk, report)
+            
+        except Exception as e:
+            # Unreadable input (e.g. bad encoding); rows committed so far stay
+            logger.error(f"Error reading event import: {str(e)}")
+            return {'success': False, 'error': 'Failed to read import file', 'report': report}
+        
+        logger.info(f"Event import by user {creator_id}: "
+                    f"{report['imported']} imported, {report['failed']} failed")
+        
+        return {'success': True, 'report': report}
+    
+    def _prepare_row(self, record: Any, creator_id: int) -> Dict[str, Any]:
+        """Column values for one import record, or error"""
+        if isinstance(record, Exception):
+            return {'error': str(record)}
+        try:
+            event_data = coerce_row(record)
+            event_data['creator_id'] = creator_id
+            return self.event_service.prepare_event(event_data)
+        except (TypeError, ValueError) as e:
+            return {'error': str(e)}
+    
+    def _insert_chunk(self, chunk: List[Tuple[int, Dict]], report: Dict) -> None:
+        """Insert one chunk of prepared rows and update indexes for it"""
+        try:
+            event_ids = db.session.scalars(
+                insert(Event).returning(Event.id, sort_by_parameter_order=True),
+                [values for _, values in chunk]
+            ).all()
+            self.event_service.outbox_service.publish(
+                OutboxService.EVENT_CREATED, [{'event_id': event_id} for event_id in event_ids]
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error inserting event import chunk: {str(e)}")
+            for line_number, _ in chunk:
+                self._add_error(report, line_number, 'Failed to save event')
+            return
+        
+        report['imported'] += len(event_ids)
+        report['event_ids'].extend(event_ids)
+        
+        # One SELECT for the whole chunk, then every index update in one go
+        events = Event.query.filter(Event.id.in_(event_ids)).order_by(Event.id).all()
+        self.event_service.invalidate_search_cache()
+        place_index.add_events(events)
+        
+        db.session.expunge_all()
+    
+    def _add_error(self, report: Dict, line_number: int, error: str) -> None:
+        report['failed'] += 1
+        if len(report['errors']) < self.max_errors:
+            report['errors'].append({'line': line_number, 'error': error})
+        else:
+            report['errors_truncated'] = True
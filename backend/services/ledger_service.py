@@ -1,16 +1,33 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime, timedelta
+import csv
+import io
+import json
 import logging
 
+from sqlalchemy import func, insert, update
+
 from models import db, Owner, Ledger
 from utils.enums import TransactionType, TransactionCategory
+from utils.pagination import (
+    CountCache, InvalidCursorError, keyset_filter, keyset_page, cursor_pagination
+)
 
 logger = logging.getLogger(__name__)
 
 
+EXPORT_FIELDS = [
+    'id', 'created_at', 'type', 'amount', 'balance_after',
+    'category', 'reference_type', 'reference_id', 'description'
+]
+
+
 class LedgerService:
     """Service class for managing coin transactions and ledger"""
     
+    # Approximate totals for cursor-mode history, shared across instances
+    _history_count_cache = CountCache(ttl_seconds=60)
+    
     def __init__(self):
         self.signup_bonus = 100
         self.referral_bonus_referrer = 50
@@ -88,6 +105,50 @@ class LedgerService:
             logger.error(f"Error adding transaction: {str(e)}")
             return {'success': False, 'error': 'Transaction failed'}
     
+    def batch(self) -> 'LedgerBatch':
+        """Start a unit of work that applies several transactions in one go"""
+        return LedgerBatch()
+    
+    def stage_signup_bonus(self, batch: 'LedgerBatch', owner_id: int) -> None:
+        """Stage the signup bonus for a new user on a batch"""
+        batch.credit(
+            owner_id=owner_id,
+            amount=self.signup_bonus,
+            category=TransactionCategory.SIGNUP_BONUS.value,
+            description='Welcome bonus for joining Pet Community'
+        )
+    
+    def stage_referral_bonus(self, batch: 'LedgerBatch', referrer_id: int, referee_id: int) -> None:
+        """Stage referral bonuses for both referrer and referee on a batch"""
+        batch.credit(
+            owner_id=referrer_id,
+            amount=self.referral_bonus_referrer,
+            category=TransactionCategory.REFERRAL_BONUS.value,
+            description='Referral bonus for inviting a new user',
+            reference_type='referral',
+            reference_id=referee_id
+        )
+        batch.credit(
+            owner_id=referee_id,
+            amount=self.referral_bonus_referee,
+            category=TransactionCategory.REFERRAL_BONUS.value,
+            description='Bonus for joining via referral',
+            reference_type='referral',
+            reference_id=referrer_id
+        )
+    
+    def stage_event_refund(self, batch: 'LedgerBatch', owner_id: int, event_id: int,
+                           refund_amount: int, event_name: str) -> None:
+        """Stage a refund for a cancelled registration on a batch"""
+        batch.credit(
+            owner_id=owner_id,
+            amount=refund_amount,
+            category=TransactionCategory.EVENT_REFUND.value,
+            description=f'Refund for cancelled registration - {event_name}',
+            reference_type='event',
+            reference_id=event_id
+        )
+    
     def process_signup_bonus(self, owner_id: int) -> Dict[str, Any]:
         """
         Process signup bonus for new user
@@ -98,18 +159,21 @@ class LedgerService:
         Returns:
             Dict with transaction result
         """
-        return self.add_transaction(
-            owner_id=owner_id,
-            transaction_type=TransactionType.CREDIT.value,
-            amount=self.signup_bonus,
-            category=TransactionCategory.SIGNUP_BONUS.value,
-            description='Welcome bonus for joining Pet Community'
-        )
+        batch = self.batch()
+        self.stage_signup_bonus(batch, owner_id)
+        result = batch.apply()
+        if not result['success']:
+            return result
+        
+        return {'success': True, 'transaction': result['transactions'][0]}
     
     def process_referral_bonus(self, referrer_id: int, referee_id: int) -> Dict[str, Any]:
         """
         Process referral bonuses for both referrer and referee
         
+        Both credits are applied atomically: either both owners are paid or
+        neither is.
+        
         Args:
             referrer_id: ID of user who referred
             referee_id: ID of new user who was referred
@@ -117,48 +181,18 @@ class LedgerService:
         Returns:
             Dict with transaction results
         """
-        try:
-            # Bonus for referrer
-            referrer_result = self.add_transaction(
-                owner_id=referrer_id,
-                transaction_type=TransactionType.CREDIT.value,
-                amount=self.referral_bonus_referrer,
-                category=TransactionCategory.REFERRAL_BONUS.value,
-                description='Referral bonus for inviting a new user',
-                reference_type='referral',
-                reference_id=referee_id
-            )
-            
-            if not referrer_result['success']:
-                return referrer_result
-            
-            # Bonus for referee
-            referee_result = self.add_transaction(
-                owner_id=referee_id,
-                transaction_type=TransactionType.CREDIT.value,
-                amount=self.referral_bonus_referee,
-                category=TransactionCategory.REFERRAL_BONUS.value,
-                description='Bonus for joining via referral',
-                reference_type='referral',
-                reference_id=referrer_id
-            )
-            
-            if not referee_result['success']:
-                # Rollback referrer bonus if referee bonus fails
-                db.session.rollback()
-                return referee_result
-            
-            logger.info(f"Referral bonuses processed: referrer {referrer_id}, referee {referee_id}")
-            
-            return {
-                'success': True,
-                'message': 'Referral bonuses processed successfully'
-            }
-            
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error processing referral bonus: {str(e)}")
-            return {'success': False, 'error': 'Failed to process referral bonus'}
+        batch = self.batch()
+        self.stage_referral_bonus(batch, referrer_id, referee_id)
+        result = batch.apply()
+        if not result['success']:
+            return result
+        
+        logger.info(f"Referral bonuses processed: referrer {referrer_id}, referee {referee_id}")
+        
+        return {
+            'success': True,
+            'message': 'Referral bonuses processed successfully'
+        }
     
     def process_event_registration(self, owner_id: int, event_id: int, 
                                   coins_required: int, event_name: str) -> Dict[str, Any]:
@@ -185,7 +219,8 @@ class LedgerService:
         )
     
     def process_event_refund(self, owner_id: int, event_id: int, 
-                           refund_amount: int, event_name: str) -> Dict[str, Any]:
+                           refund_amount: int, event_name: str,
+                           commit: bool = True) -> Dict[str, Any]:
         """
         Process refund for event cancellation
         
@@ -194,19 +229,19 @@ class LedgerService:
             event_id: Event ID
             refund_amount: Amount to refund
             event_name: Name of the event
+            commit: Commit afterwards; with commit=False the refund joins the
+                caller's transaction (e.g. with the cancellation it pays for)
             
         Returns:
             Dict with transaction result
         """
-        return self.add_transaction(
-            owner_id=owner_id,
-            transaction_type=TransactionType.CREDIT.value,
-            amount=refund_amount,
-            category=TransactionCategory.EVENT_REFUND.value,
-            description=f'Refund for cancelled registration - {event_name}',
-            reference_type='event',
-            reference_id=event_id
-        )
+        batch = self.batch()
+        self.stage_event_refund(batch, owner_id, event_id, refund_amount, event_name)
+        result = batch.apply(commit=commit)
+        if not result['success']:
+            return result
+        
+        return {'success': True, 'transaction': result['transactions'][0]}
     
     def get_balance(self, owner_id: int) -> Dict[str, Any]:
         """
@@ -233,7 +268,10 @@ class LedgerService:
             return {'success': False, 'error': 'Failed to fetch balance'}
     
     def get_transaction_history(self, owner_id: int, page: int = 1, 
-                              per_page: int = 20, days: Optional[int] = None) -> Dict[str, Any]:
+                              per_page: int = 20, days: Optional[int] = None,
+                              cursor: Optional[str] = None,
+                              cursor_mode: bool = False,
+                              include_total: bool = False) -> Dict[str, Any]:
         """
         Get transaction history for an owner
         
@@ -242,6 +280,9 @@ class LedgerService:
             page: Page number
             per_page: Items per page
             days: Number of days to look back (optional)
+            cursor: Cursor from a previous page; implies cursor mode
+            cursor_mode: Use keyset pagination on (created_at, id) instead of pages
+            include_total: In cursor mode, include a cached approximate total
             
         Returns:
             Dict with transaction history
@@ -254,24 +295,38 @@ class LedgerService:
                 start_date = datetime.utcnow() - timedelta(days=days)
                 query = query.filter(Ledger.created_at >= start_date)
             
+            if cursor_mode or cursor:
+                total = None
+                if include_total:
+                    total = self._history_count_cache.get_or_compute(
+                        ('history', owner_id, days), query.count
+                    )
+                
+                if cursor:
+                    try:
+                        query = query.filter(
+                            keyset_filter(Ledger.created_at, Ledger.id, cursor, descending=True)
+                        )
+                    except InvalidCursorError as e:
+                        return {'success': False, 'error': str(e)}
+                
+                query = query.order_by(Ledger.created_at.desc(), Ledger.id.desc())
+                items, next_cursor = keyset_page(query, per_page, 'created_at')
+                
+                return {
+                    'success': True,
+                    'transactions': [self._format_transaction(t) for t in items],
+                    'pagination': cursor_pagination(per_page, next_cursor, total)
+                }
+            
             # Order by most recent first
-            query = query.order_by(Ledger.created_at.desc())
+            query = query.order_by(Ledger.created_at.desc(), Ledger.id.desc())
             
             # Paginate
             paginated = query.paginate(page=page, per_page=per_page, error_out=False)
             
             # Format transactions
-            transactions = []
-            for transaction in paginated.items:
-                transactions.append({
-                    'id': transaction.id,
-                    'type': transaction.transaction_type,
-                    'amount': transaction.amount,
-                    'balance_after': transaction.balance_after,
-                    'category': transaction.category,
-                    'description': transaction.description,
-                    'created_at': transaction.created_at.isoformat()
-                })
+            transactions = [self._format_transaction(t) for t in paginated.items]
             
             return {
                 'success': True,
@@ -290,6 +345,61 @@ class LedgerService:
             logger.error(f"Error fetching transaction history: {str(e)}")
             return {'success': False, 'error': 'Failed to fetch transaction history'}
     
+    def export_transactions(self, owner_id: int, export_format: str = 'ndjson',
+                            start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None,
+                            batch_size: int = 1000) -> Iterator[str]:
+        """
+        Stream an owner's full transaction history as NDJSON or CSV
+        
+        Rows are read through a server-side cursor (yield_per) and emitted in
+        chunks, so memory stays flat regardless of history length.
+        
+        Args:
+            owner_id: Owner ID
+            export_format: 'ndjson' or 'csv'
+            start_date: Only include entries created at or after this time
+            end_date: Only include entries created before this time
+            batch_size: Rows fetched per round trip and per emitted chunk
+            
+        Yields:
+            Text chunks of the export body
+        """
+        query = Ledger.query.filter(Ledger.owner_id == owner_id)
+        if start_date:
+            query = query.filter(Ledger.created_at >= start_date)
+        if end_date:
+            query = query.filter(Ledger.created_at < end_date)
+        
+        query = query.order_by(Ledger.created_at, Ledger.id).yield_per(batch_size)
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == 'csv' else None
+        if writer:
+            writer.writerow(EXPORT_FIELDS)
+        
+        rows_in_buffer = 0
+        for transaction in query:
+            row = self._format_export_row(transaction)
+            if writer:
+                writer.writerow([row[field] for field in EXPORT_FIELDS])
+            else:
+                buffer.write(json.dumps(row, separators=(',', ':')))
+                buffer.write('\n')
+            
+            rows_in_buffer += 1
+            if rows_in_buffer >= batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows_in_buffer = 0
+        
+        remaining = buffer.getvalue()
+        if remaining:
+            yield remaining
+        
+        logger.info(f"Ledger export ({export_format}) completed for owner {owner_id}")
+    
     def get_transaction_summary(self, owner_id: int, days: int = 30) -> Dict[str, Any]:
         """
         Get transaction summary for an owner
@@ -304,34 +414,41 @@ class LedgerService:
         try:
             start_date = datetime.utcnow() - timedelta(days=days)
             
-            # Get all transactions in the period
-            transactions = Ledger.query.filter(
+            # Aggregate in the database; the created_at bound also lets
+            # Postgres prune monthly ledger partitions outside the period
+            rows = db.session.query(
+                Ledger.category,
+                Ledger.transaction_type,
+                func.count(Ledger.id),
+                func.coalesce(func.sum(Ledger.amount), 0)
+            ).filter(
                 Ledger.owner_id == owner_id,
                 Ledger.created_at >= start_date
-            ).all()
+            ).group_by(Ledger.category, Ledger.transaction_type).all()
             
-            # Calculate summary
-            total_credits = sum(t.amount for t in transactions 
-                              if t.transaction_type == TransactionType.CREDIT.value)
-            total_debits = sum(t.amount for t in transactions 
-                             if t.transaction_type == TransactionType.DEBIT.value)
-            
-            # Group by category
+            # Calculate summary and group by category
+            total_credits = 0
+            total_debits = 0
+            transaction_count = 0
             category_summary = {}
-            for transaction in transactions:
-                if transaction.category not in category_summary:
-                    category_summary[transaction.category] = {
+            for category, transaction_type, count, amount in rows:
+                if category not in category_summary:
+                    category_summary[category] = {
                         'credits': 0,
                         'debits': 0,
                         'count': 0
                     }
                 
-                if transaction.transaction_type == TransactionType.CREDIT.value:
-                    category_summary[transaction.category]['credits'] += transaction.amount
+                if transaction_type == TransactionType.CREDIT.value:
+                    category_summary[category]['credits'] += amount
+                    total_credits += amount
                 else:
-                    category_summary[transaction.category]['debits'] += transaction.amount
+                    category_summary[category]['debits'] += amount
+                    if transaction_type == TransactionType.DEBIT.value:
+                        total_debits += amount
                 
-                category_summary[transaction.category]['count'] += 1
+                category_summary[category]['count'] += count
+                transaction_count += count
             
             # Get current balance
             owner = Owner.query.get(owner_id)
@@ -344,7 +461,7 @@ class LedgerService:
                     'total_credits': total_credits,
                     'total_debits': total_debits,
                     'net_change': total_credits - total_debits,
-                    'transaction_count': len(transactions),
+                    'transaction_count': transaction_count,
                     'by_category': category_summary
                 }
             }
@@ -369,4 +486,177 @@ class LedgerService:
             return owner and owner.coins_balance >= required_amount
         except Exception as e:
             logger.error(f"Error validating balance: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _format_transaction(self, transaction: Ledger) -> Dict:
+        """Format ledger entry for response"""
+        return {
+            'id': transaction.id,
+            'type': transaction.transaction_type,
+            'amount': transaction.amount,
+            'balance_after': transaction.balance_after,
+            'category': transaction.category,
+            'description': transaction.description,
+            'created_at': transaction.created_at.isoformat()
+        }
+    
+    def _format_export_row(self, transaction: Ledger) -> Dict:
+        """Format ledger entry for export"""
+        return {
+            'id': transaction.id,
+            'created_at': transaction.created_at.isoformat() if transaction.created_at else None,
+            'type': transaction.transaction_type,
+            'amount': transaction.amount,
+            'balance_after': transaction.balance_after,
+            'category': transaction.category,
+            'reference_type': transaction.reference_type,
+            'reference_id': transaction.reference_id,
+            'description': transaction.description
+        }
+
+
+class LedgerBatchError(Exception):
+    """Raised when a staged ledger batch cannot be applied"""
+
+
+class LedgerBatch:
+    """
+    Unit of work for ledger transactions
+    
+    Stage credits/debits for any number of owners, then apply them with one
+    atomic balance UPDATE per owner and a single multi-row ledger INSERT.
+    """
+    
+    def __init__(self):
+        self._entries: List[Dict[str, Any]] = []
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def credit(self, owner_id: int, amount: int, category: str, description: str,
+               reference_type: Optional[str] = None,
+               reference_id: Optional[int] = None) -> 'LedgerBatch':
+        """Stage a credit"""
+        return self._stage(owner_id, TransactionType.CREDIT.value, amount, category,
+                           description, reference_type, reference_id)
+    
+    def debit(self, owner_id: int, amount: int, category: str, description: str,
+              reference_type: Optional[str] = None,
+              reference_id: Optional[int] = None) -> 'LedgerBatch':
+        """Stage a debit; apply fails if the owner's net change would overdraw"""
+        return self._stage(owner_id, TransactionType.DEBIT.value, amount, category,
+                           description, reference_type, reference_id)
+    
+    def apply(self, commit: bool = True) -> Dict[str, Any]:
+        """
+        Apply all staged transactions
+        
+        Args:
+            commit: Commit the session afterwards. With commit=False the work
+                runs in a savepoint inside the caller's transaction, so a
+                failure only undoes this batch.
+            
+        Returns:
+            Dict with created transactions or error
+        """
+        if not self._entries:
+            return {'success': True, 'transactions': []}
+        
+        savepoint = None if commit else db.session.begin_nested()
+        try:
+            # Net change per owner, in staging order
+            net_changes: Dict[int, int] = {}
+            for entry in self._entries:
+                net_changes[entry['owner_id']] = net_changes.get(entry['owner_id'], 0) + entry['signed_amount']
+            
+            # One atomic increment per owner; the balance guard rejects overdrafts
+            final_balances = {}
+            for owner_id, net_change in net_changes.items():
+                statement = update(Owner).where(Owner.id == owner_id)
+                if net_change < 0:
+                    statement = statement.where(Owner.coins_balance >= -net_change)
+                new_balance = db.session.execute(
+                    statement.values(coins_balance=Owner.coins_balance + net_change)
+                    .returning(Owner.coins_balance),
+                    execution_options={'synchronize_session': 'fetch'}
+                ).scalar()
+                if new_balance is None:
+                    raise LedgerBatchError(
+                        'Insufficient balance' if net_change < 0 else 'Owner not found'
+                    )
+                final_balances[owner_id] = new_balance
+            
+            # Walk entries backwards from the final balance to get balance_after
+            running = dict(final_balances)
+            now = datetime.utcnow()
+            rows = []
+            for entry in reversed(self._entries):
+                rows.append({
+                    'owner_id': entry['owner_id'],
+                    'transaction_type': entry['transaction_type'],
+                    'amount': entry['amount'],
+                    'balance_after': running[entry['owner_id']],
+                    'category': entry['category'],
+                    'reference_type': entry['reference_type'],
+                    'reference_id': entry['reference_id'],
+                    'description': entry['description'],
+                    'created_at': now
+                })
+                running[entry['owner_id']] -= entry['signed_amount']
+            rows.reverse()
+            
+            ids = db.session.scalars(
+                insert(Ledger).returning(Ledger.id, sort_by_parameter_order=True), rows
+            ).all()
+            
+            if savepoint is not None:
+                savepoint.commit()
+            else:
+                db.session.commit()
+            
+            logger.info(f"Ledger batch applied: {len(rows)} transactions for {len(final_balances)} owners")
+            
+            return {
+                'success': True,
+                'transactions': [{
+                    'id': ledger_id,
+                    'owner_id': row['owner_id'],
+                    'type': row['transaction_type'],
+                    'amount': row['amount'],
+                    'balance_after': row['balance_after'],
+                    'description': row['description']
+                } for ledger_id, row in zip(ids, rows)],
+                'balances': final_balances
+            }
+            
+        except LedgerBatchError as e:
+            self._rollback(savepoint)
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            self._rollback(savepoint)
+            logger.error(f"Error applying ledger batch: {str(e)}")
+            return {'success': False, 'error': 'Transaction failed'}
+    
+    def _stage(self, owner_id: int, transaction_type: str, amount: int, category: str,
+               description: str, reference_type: Optional[str],
+               reference_id: Optional[int]) -> 'LedgerBatch':
+        if amount <= 0:
+            raise ValueError('Amount must be positive')
+        signed_amount = amount if transaction_type == TransactionType.CREDIT.value else -amount
+        self._entries.append({
+            'owner_id': owner_id,
+            'transaction_type': transaction_type,
+            'amount': amount,
+            'signed_amount': signed_amount,
+            'category': category,
+            'description': description,
+            'reference_type': reference_type,
+            'reference_id': reference_id
+        })
+        return self
+    
+    def _rollback(self, savepoint) -> None:
+        if savepoint is not None:
+            savepoint.rollback()
+        else:
+            db.session.rollback()
@@ -0,0 +1,127 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import logging
+
+from sqlalchemy import func
+
+from models import db, Event
+from services.waitlist_service import WaitlistService
+from utils.enums import EventStatus
+
+logger = logging.getLogger(__name__)
+
+
+class EventLifecycleService:
+    """Service class for moving events through upcoming -> ongoing -> completed"""
+    
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self.waitlist_service = WaitlistService()
+    
+    def advance_statuses(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Apply all status transitions that are due at `now`
+        
+        Transitions are applied as batched UPDATEs of at most batch_size rows,
+        each in its own commit, so a large backlog never holds long locks.
+        
+        Args:
+            now: Reference time (defaults to utcnow)
+        
+        Returns:
+            Dict with counts of events moved to each status
+        """
+        now = now or datetime.utcnow()
+        
+        try:
+            # Events already past their end go straight to completed
+            completed = self._transition(
+                [EventStatus.UPCOMING.value, EventStatus.ONGOING.value],
+                EventStatus.COMPLETED.value,
+                Event.end_datetime <= now
+            )
+            ongoing = self._transition(
+                [EventStatus.UPCOMING.value],
+                EventStatus.ONGOING.value,
+                Event.start_datetime <= now
+            )
+            
+            # Search filters on status, so moved events drop out of results at
+            # once. This runs in the CLI process, so it cannot clear the web
+            # processes' area totals cache; those converge within its TTL.
+            if completed or ongoing:
+                logger.info(f"Event lifecycle: {len(ongoing)} ongoing, {len(completed)} completed")
+            
+            return {
+                'success': True,
+                'ongoing': len(ongoing),
+                'completed': len(completed)
+            }
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error advancing event statuses: {str(e)}")
+            return {'success': False, 'error': 'Failed to advance event statuses'}
+    
+    def next_boundary(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Get the next time at which an event changes status
+        
+        Args:
+            now: Reference time (defaults to utcnow)
+        
+        Returns:
+            Earliest pending start/end datetime, or None if nothing is pending
+        """
+        now = now or datetime.utcnow()
+        
+        next_start = db.session.query(func.min(Event.start_datetime)).filter(
+            Event.status == EventStatus.UPCOMING.value,
+            Event.start_datetime > now
+        ).scalar()
+        next_end = db.session.query(func.min(Event.end_datetime)).filter(
+            Event.status.in_([EventStatus.UPCOMING.value, EventStatus.ONGOING.value]),
+            Event.end_datetime > now
+        ).scalar()
+        
+        boundaries = [b for b in (next_start, next_end) if b is not None]
+        return min(boundaries) if boundaries else None
+    
+    def seconds_until_next_boundary(self, max_wait: int = 300,
+                                    now: Optional[datetime] = None) -> float:
+        """Seconds a worker loop should sleep before the next transition, capped at max_wait"""
+        now = now or datetime.utcnow()
+        boundary = self.next_boundary(now)
+        if boundary is None:
+            return float(max_wait)
+        return max(0.0, min(float(max_wait), (boundary - now).total_seconds()))
+    
+    def _transition(self, from_statuses: List[str], to_status: str, due_clause) -> List[int]:
+        """Move due events to to_status in bounded batches, returning the moved IDs"""
+        moved = []
+        while True:
+            ids = [row.id for row in db.session.query(Event.id).filter(
+                Event.status.in_(from_statuses),
+                due_clause
+            ).order_by(Event.id).limit(self.batch_size).all()]
+            
+            if not ids:
+                break
+            
+            db.session.query(Event).filter(
+                Event.id.in_(ids),
+                Event.status.in_(from_statuses)
+            ).update(
+                {Event.status: to_status, Event.updated_at: datetime.utcnow()},
+                synchronize_session=False
+            )
+            # Started and finished events no longer take registrations, so
+            # their waitlists can never be promoted
+            self.waitlist_service.clear_events(ids)
+            db.session.commit()
+            moved.extend(ids)
+            
+            if len(ids) < self.batch_size:
+                break
+        
+        return moved
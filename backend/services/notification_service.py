@@ -0,0 +1,166 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import logging
+
+from sqlalchemy import insert
+
+from config import Config
+from models import db, Owner, Pet, Event, Notification
+from utils.eligibility import ALL_SPECIES_MASK, SPECIES_BITS, is_eligible, pet_age_months
+from utils.enums import EventStatus
+from utils.location import calculate_distance, geo_cells_within, get_bounding_box
+from utils.pagination import InvalidCursorError, keyset_filter, keyset_page, cursor_pagination
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationService:
+    """
+    Service class for telling owners about new events near them
+    
+    Creating an event only adds an event.created message to the outbox, in
+    the same transaction, so its latency does not depend on how many owners
+    get notified. The outbox worker (services.outbox_service) then finds
+    the recipients through the Owner.geo_cell index and inserts their
+    notifications in batches.
+    """
+    
+    def __init__(self, radius_km: Optional[float] = None, batch_size: Optional[int] = None):
+        self.radius_km = radius_km or Config.NOTIFY_RADIUS_KM
+        self.batch_size = batch_size or Config.NOTIFICATION_BATCH_SIZE
+    
+    def notify_nearby_owners(self, event_id: int) -> int:
+        """
+        Create event_nearby notifications for an event (no commit)
+        
+        Returns:
+            Number of notifications created
+        """
+        event = db.session.get(Event, event_id)
+        if not event or not event.is_active or event.status != EventStatus.UPCOMING.value:
+            return 0
+        
+        recipients = self.find_recipients(event)
+        title = f'New event near you: {event.name}'[:255]
+        body = f"{event.start_datetime:%d %b %Y, %H:%M} at {event.venue_name or event.city}"[:255]
+        now = datetime.utcnow()
+        
+        for start in range(0, len(recipients), self.batch_size):
+            db.session.execute(insert(Notification), [{
+                'owner_id': owner_id,
+                'kind': 'event_nearby',
+                'event_id': event.id,
+                'title': title,
+                'body': body,
+                'created_at': now
+            } for owner_id in recipients[start:start + self.batch_size]])
+        
+        logger.info(f"Event {event.id}: notified {len(recipients)} nearby owners")
+        return len(recipients)
+    
+    def find_recipients(self, event: Event) -> List[int]:
+        """
+        Owners within radius_km of an event with an active pet it accepts
+        
+        Candidates come from the geo_cell index (cells overlapping the
+        radius), falling back to the latitude/longitude bounding box for
+        very large radii; exact distance and pet eligibility are checked
+        afterwards.
+        
+        Returns:
+            Owner IDs in ID order
+        """
+        query = db.session.query(Owner.id, Owner.latitude, Owner.longitude).filter(
+            Owner.is_active == True,
+            Owner.is_deleted == False,
+            Owner.id != event.creator_id
+        )
+        cells = geo_cells_within(event.latitude, event.longitude, self.radius_km)
+        if cells is not None:
+            query = query.filter(Owner.geo_cell.in_(cells))
+        else:
+            min_lat, max_lat, min_lon, max_lon = get_bounding_box(
+                event.latitude, event.longitude, self.radius_km
+            )
+            query = query.filter(
+                Owner.latitude.between(min_lat, max_lat),
+                Owner.longitude.between(min_lon, max_lon)
+            )
+        
+        nearby = [
+            owner_id for owner_id, latitude, longitude
+            in query.order_by(Owner.id).yield_per(self.batch_size)
+            if calculate_distance(event.latitude, event.longitude,
+                                  latitude, longitude) <= self.radius_km
+        ]
+        
+        # Keep owners with at least one pet the event accepts
+        recipients = []
+        for start in range(0, len(nearby), self.batch_size):
+            chunk = nearby[start:start + self.batch_size]
+            pets = db.session.query(
+                Pet.owner_id, Pet.species, Pet.age_years, Pet.age_months
+            ).filter(
+                Pet.owner_id.in_(chunk),
+                Pet.is_active == True
+            )
+            if event.species_mask != ALL_SPECIES_MASK:
+                pets = pets.filter(Pet.species.in_([
+                    species for species, bit in SPECIES_BITS.items() if event.species_mask & bit
+                ]))
+            
+            eligible = set()
+            for owner_id, species, age_years, age_months in pets:
+                if owner_id not in eligible and is_eligible(
+                        event.species_mask, event.min_age_months, event.max_age_months,
+                        species, pet_age_months(age_years, age_months)):
+                    eligible.add(owner_id)
+            recipients.extend(owner_id for owner_id in chunk if owner_id in eligible)
+        
+        return recipients
+    
+    def get_notifications(self, owner_id: int, cursor: Optional[str] = None,
+                          per_page: int = 20) -> Dict[str, Any]:
+        """
+        List an owner's notifications, newest first
+        
+        Args:
+            owner_id: Owner ID
+            cursor: Cursor from a previous page
+            per_page: Items per page
+        
+        Returns:
+            Dict with notifications and cursor pagination
+        """
+        try:
+            query = Notification.query.filter_by(owner_id=owner_id)
+            if cursor:
+                try:
+                    query = query.filter(keyset_filter(
+                        Notification.created_at, Notification.id, cursor, descending=True
+                    ))
+                except InvalidCursorError as e:
+                    return {'success': False, 'error': str(e)}
+            
+            query = query.order_by(Notification.created_at.desc(), Notification.id.desc())
+            notifications, next_cursor = keyset_page(query, per_page, 'created_at')
+            
+            return {
+                'success': True,
+                'data': {
+                    'notifications': [{
+                        'id': notification.id,
+                        'kind': notification.kind,
+                        'event_id': notification.event_id,
+                        'title': notification.title,
+                        'body': notification.body,
+                        'created_at': notification.created_at.isoformat(),
+                        'read': notification.read_at is not None
+                    } for notification in notifications],
+                    'pagination': cursor_pagination(per_page, next_cursor)
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error fetching notifications for owner {owner_id}: {str(e)}")
+            return {'success': False, 'error': 'Failed to fetch notifications'}
@@ -0,0 +1,274 @@
+from typing import Dict, Any, Callable, List, Optional
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+
+from sqlalchemy import insert, update
+
+from config import Config
+from models import db, Event, OutboxMessage
+from utils import slack
+from utils.lazy import LazyService
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """
+    Service class for side effects that run after a change commits
+    
+    Request handlers publish a message to the outbox table in the same
+    transaction as the change it announces, so a request only waits for its
+    own commit and no message is lost or sent for a rolled-back change.
+    Workers (`flask outbox work`) claim due messages in batches with SKIP
+    LOCKED where supported and hand each topic's messages to its handler in
+    one call. A handler's database work and the done mark commit together;
+    a failing handler is retried with exponential backoff until
+    OUTBOX_MAX_ATTEMPTS, then the message is marked failed.
+    
+    With OUTBOX_MODE = 'local' the app drains the outbox in-process after
+    each write request instead, for tests and single-process development.
+    """
+    
+    EVENT_CREATED = 'event.created'  # {'event_id'}
+    EVENT_CANCELLED = 'event.cancelled'  # {'event_id'}
+    REGISTRATION_CREATED = 'registration.created'  # {'owner_id', 'event_id'}
+    USER_CREATED = 'user.created'  # {'owner_id', 'email'}
+    
+    def __init__(self, batch_size: Optional[int] = None, max_attempts: Optional[int] = None):
+        self.batch_size = batch_size or Config.OUTBOX_BATCH_SIZE
+        self.max_attempts = max_attempts or Config.OUTBOX_MAX_ATTEMPTS
+        self.feed_service = LazyService('services.feed_service', 'FeedService')
+        self.notification_service = LazyService('services.notification_service', 'NotificationService')
+        
+        # Handlers with side effects outside the database get one message per
+        # call, so a retry never repeats messages that already went out
+        self.single_message_topics = {self.USER_CREATED}
+        
+        # Each handler takes the payloads of a batch of messages on its topic
+        self.handlers: Dict[str, Callable[[List[Dict]], None]] = {
+            self.EVENT_CREATED: self._handle_events_created,
+            self.EVENT_CANCELLED: self._handle_events_cancelled,
+            self.REGISTRATION_CREATED: self._handle_registrations_created,
+            self.USER_CREATED: self._handle_users_created
+        }
+    
+    def publish(self, topic: str, payloads: List[Dict[str, Any]]) -> None:
+        """Stage messages on the caller's transaction (no commit)"""
+        if not payloads:
+            return
+        now = datetime.utcnow()
+        db.session.execute(insert(OutboxMessage), [{
+            'topic': topic,
+            'payload': payload,
+            'status': 'pending',
+            'attempts': 0,
+            'available_at': now,
+            'created_at': now
+        } for payload in payloads])
+    
+    def drain(self, max_messages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Process due outbox messages, oldest first, a batch per transaction
+        
+        Each topic in a batch runs in its own savepoint, so one failing
+        handler only sends its own messages back for a retry. Topics in
+        single_message_topics run one message per savepoint.
+        
+        Args:
+            max_messages: Stop after this many messages (None to empty the outbox)
+        
+        Returns:
+            Dict with counts of messages processed, scheduled for retry and
+            marked failed
+        """
+        counts = {'processed': 0, 'retried': 0, 'failed': 0}
+        
+        try:
+            while True:
+                handled = sum(counts.values())
+                limit = self.batch_size
+                if max_messages is not None:
+                    limit = min(limit, max_messages - handled)
+                if limit <= 0:
+                    break
+                
+                now = datetime.utcnow()
+                messages = OutboxMessage.query.filter(
+                    OutboxMessage.status == 'pending',
+                    OutboxMessage.available_at <= now
+                ).order_by(OutboxMessage.id).limit(limit).with_for_update(skip_locked=True).all()
+                if not messages:
+                    break
+                
+                # One group per topic, or per message for single_message_topics
+                groups: Dict[tuple, List[OutboxMessage]] = {}
+                for message in messages:
+                    single = message.topic in self.single_message_topics
+                    groups.setdefault((message.topic, message.id if single else None), []).append(message)
+                
+                for (topic, _), group in groups.items():
+                    error = self._run_handler(topic, group)
+                    if error is None:
+                        for message in group:
+                            message.status = 'done'
+                            message.processed_at = now
+                        counts['processed'] += len(group)
+                    else:
+                        for message in group:
+                            counts[self._schedule_retry(message, error, now)] += 1
+                
+                db.session.commit()
+            
+            return {'success': True, **counts}
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error draining outbox: {str(e)}")
+            return {'success': False, 'error': 'Failed to drain outbox', **counts}
+    
+    def run_workers(self, app, workers: int = 1, loop: bool = False,
+                    interval: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Drain the outbox from a pool of worker threads
+        
+        Each thread has its own app context and session; SKIP LOCKED keeps
+        them (and workers in other processes) off each other's batches.
+        
+        Args:
+            app: Flask app to run the workers in
+            workers: Number of threads
+            loop: Keep polling for new messages instead of stopping once the
+                outbox is empty
+            interval: Seconds a worker sleeps when it finds nothing to do
+        
+        Returns:
+            Dict with total counts across workers
+        """
+        interval = interval if interval is not None else Config.OUTBOX_POLL_INTERVAL
+        totals = {'processed': 0, 'retried': 0, 'failed': 0}
+        lock = threading.Lock()
+        errors = []
+        
+        def work():
+            with app.app_context():
+                while True:
+                    result = self.drain()
+                    with lock:
+                        for key in totals:
+                            totals[key] += result[key]
+                    
+                    if not loop:
+                        if not result['success']:
+                            errors.append(result['error'])
+                        return
+                    
+                    if not result['success'] or not any(result[key] for key in totals):
+                        time.sleep(interval)
+        
+        threads = [
+            threading.Thread(target=work, name=f'outbox-worker-{number}', daemon=True)
+            for number in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if errors:
+            return {'success': False, 'error': errors[0], **totals}
+        return {'success': True, **totals}
+    
+    def requeue_failed(self, topic: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Give failed messages a fresh set of attempts
+        
+        Args:
+            topic: Only requeue messages on this topic
+        
+        Returns:
+            Dict with the number of messages requeued
+        """
+        try:
+            statement = update(OutboxMessage).where(OutboxMessage.status == 'failed')
+            if topic:
+                statement = statement.where(OutboxMessage.topic == topic)
+            result = db.session.execute(
+                statement.values(status='pending', attempts=0, available_at=datetime.utcnow()),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.commit()
+            return {'success': True, 'requeued': result.rowcount}
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error requeueing outbox messages: {str(e)}")
+            return {'success': False, 'error': 'Failed to requeue messages'}
+    
+    def _run_handler(self, topic: str, group: List[OutboxMessage]) -> Optional[str]:
+        """Run a topic's handler in a savepoint; returns the error, if any"""
+        handler = self.handlers.get(topic)
+        if handler is None:
+            return f'No handler for topic {topic}'
+        
+        savepoint = db.session.begin_nested()
+        try:
+            handler([message.payload for message in group])
+            savepoint.commit()
+            return None
+        except Exception as e:
+            savepoint.rollback()
+            logger.warning(f"Outbox handler for {topic} failed on "
+                           f"{[message.id for message in group]}: {str(e)}")
+            return str(e) or type(e).__name__
+    
+    def _schedule_retry(self, message: OutboxMessage, error: str, now: datetime) -> str:
+        """Back off a message after a failed attempt; returns 'retried' or 'failed'"""
+        message.attempts += 1
+        message.last_error = error[:1000]
+        if message.attempts >= self.max_attempts:
+            message.status = 'failed'
+            logger.error(f"Outbox message {message.id} ({message.topic}) failed "
+                         f"after {message.attempts} attempts: {error}")
+            return 'failed'
+        
+        delay = min(Config.OUTBOX_RETRY_BASE_SECONDS * 2 ** (message.attempts - 1),
+                    Config.OUTBOX_RETRY_MAX_SECONDS)
+        message.available_at = now + timedelta(seconds=delay)
+        return 'retried'
+    
+    # ---------- Handlers ----------
+    
+    def _handle_events_created(self, payloads: List[Dict]) -> None:
+        """Notify nearby owners and add the events to their feeds"""
+        event_ids = [payload['event_id'] for payload in payloads]
+        for event_id in event_ids:
+            self.notification_service.notify_nearby_owners(event_id)
+        
+        events = Event.query.filter(Event.id.in_(event_ids)).order_by(Event.id).all()
+        self.feed_service.on_events_created(events)
+    
+    def _handle_events_cancelled(self, payloads: List[Dict]) -> None:
+        """Take cancelled events out of feeds"""
+        event_ids = [payload['event_id'] for payload in payloads]
+        for event in Event.query.filter(Event.id.in_(event_ids)):
+            self.feed_service.on_event_unavailable(event)
+    
+    def _handle_registrations_created(self, payloads: List[Dict]) -> None:
+        """Drop registered events from owners' feeds, and full events from everyone's"""
+        for payload in payloads:
+            self.feed_service.on_registered(payload['owner_id'], payload['event_id'])
+        
+        event_ids = {payload['event_id'] for payload in payloads}
+        for event in Event.query.filter(Event.id.in_(event_ids)):
+            if event.max_participants and event.current_participants >= event.max_participants:
+                self.feed_service.on_event_unavailable(event)
+    
+    def _handle_users_created(self, payloads: List[Dict]) -> None:
+        """Announce new users on Slack (a no-op when no webhook is configured)"""
+        if not slack.is_configured('backend_log'):
+            return
+        for payload in payloads:
+            if not slack.log_to_slack(f"New User Onboarded : {payload['email']}", "Info", "create_user"):
+                raise RuntimeError('Slack webhook failed')
@@ -0,0 +1,241 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+import logging
+
+from sqlalchemy import text
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of the month containing value"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months"""
+    month_index = value.year * 12 + (value.month - 1) + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the ledger partition holding the given month"""
+    return f"ledger_y{month.year}m{month.month:02d}"
+
+
+class LedgerPartitionService:
+    """
+    Service class for monthly range partitioning of the ledger table
+    
+    Uses native Postgres declarative partitioning on created_at. Queries
+    need no routing: any created_at bound (days/start_date) is pruned by
+    the planner. On other databases the ledger stays a single table and
+    relies on the (owner_id, created_at, id) index.
+    """
+    
+    def is_supported(self) -> bool:
+        """Whether the bound database supports native partitioning"""
+        return db.engine.dialect.name == 'postgresql'
+    
+    def is_partitioned(self) -> bool:
+        """Whether the ledger table has already been converted"""
+        if not self.is_supported():
+            return False
+        relkind = db.session.execute(text(
+            "SELECT c.relkind FROM pg_class c "
+            "WHERE c.relname = 'ledger' AND pg_table_is_visible(c.oid)"
+        )).scalar()
+        return relkind == 'p'
+    
+    def migrate(self, months_ahead: int = 3, keep_legacy: bool = False) -> Dict[str, Any]:
+        """
+        Convert the ledger table into a monthly partitioned table
+        
+        Runs in one transaction: the existing table is renamed, a
+        partitioned table with the same columns takes its place, existing
+        rows are copied into their monthly partitions and the legacy table
+        is dropped (unless keep_legacy is set).
+        
+        Args:
+            months_ahead: Future monthly partitions to pre-create
+            keep_legacy: Keep the old table as ledger_legacy
+        
+        Returns:
+            Dict with created partitions and copied row count
+        """
+        if not self.is_supported():
+            return {'success': False, 'error': 'Native partitioning requires PostgreSQL'}
+        if self.is_partitioned():
+            return self.ensure_partitions(months_ahead)
+        
+        try:
+            db.session.execute(text("LOCK TABLE ledger IN ACCESS EXCLUSIVE MODE"))
+            
+            oldest = db.session.execute(text("SELECT MIN(created_at) FROM ledger")).scalar()
+            
+            # Free the names that the new table and its indexes will take
+            db.session.execute(text("ALTER TABLE ledger RENAME TO ledger_legacy"))
+            db.session.execute(text("ALTER TABLE ledger_legacy RENAME CONSTRAINT ledger_pkey TO ledger_legacy_pkey"))
+            db.session.execute(text(
+                "ALTER INDEX IF EXISTS ix_ledger_owner_created_at_id "
+                "RENAME TO ix_ledger_legacy_owner_created_at_id"
+            ))
+            db.session.execute(text("ALTER SEQUENCE ledger_id_seq OWNED BY NONE"))
+            
+            # The partition key has to be part of the primary key
+            db.session.execute(text("""
+                CREATE TABLE ledger (
+                    id INTEGER NOT NULL DEFAULT nextval('ledger_id_seq'),
+                    owner_id INTEGER NOT NULL REFERENCES owners (id),
+                    transaction_type VARCHAR(20) NOT NULL,
+                    amount INTEGER NOT NULL,
+                    balance_after INTEGER NOT NULL,
+                    category VARCHAR(50) NOT NULL,
+                    reference_type VARCHAR(50),
+                    reference_id INTEGER,
+                    description VARCHAR(255),
+                    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+                        DEFAULT (now() AT TIME ZONE 'utc'),
+                    PRIMARY KEY (id, created_at)
+                ) PARTITION BY RANGE (created_at)
+            """))
+            db.session.execute(text("ALTER SEQUENCE ledger_id_seq OWNED BY ledger.id"))
+            db.session.execute(text("CREATE TABLE ledger_default PARTITION OF ledger DEFAULT"))
+            
+            first_month = month_start(oldest or datetime.utcnow())
+            created = self._create_partitions(first_month, months_ahead)
+            
+            copied = db.session.execute(text("""
+                INSERT INTO ledger (id, owner_id, transaction_type, amount, balance_after,
+                                    category, reference_type, reference_id, description, created_at)
+                SELECT id, owner_id, transaction_type, amount, balance_after,
+                       category, reference_type, reference_id, description,
+                       COALESCE(created_at, now() AT TIME ZONE 'utc')
+                FROM ledger_legacy
+            """)).rowcount
+            
+            db.session.execute(text(
+                "CREATE INDEX ix_ledger_owner_created_at_id ON ledger (owner_id, created_at, id)"
+            ))
+            
+            if not keep_legacy:
+                db.session.execute(text("DROP TABLE ledger_legacy"))
+            
+            db.session.commit()
+            
+            logger.info(f"Ledger partitioned: {len(created)} partitions, {copied} rows copied")
+            
+            return {
+                'success': True,
+                'partitions_created': created,
+                'rows_copied': copied
+            }
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error partitioning ledger: {str(e)}")
+            return {'success': False, 'error': 'Failed to partition ledger'}
+    
+    def ensure_partitions(self, months_ahead: int = 3) -> Dict[str, Any]:
+        """
+        Pre-create monthly partitions up to months_ahead from now
+        
+        Run regularly (e.g. daily) so inserts never fall into the default
+        partition.
+        
+        Args:
+            months_ahead: Future monthly partitions to keep available
+        
+        Returns:
+            Dict with names of newly created partitions
+        """
+        if not self.is_partitioned():
+            return {'success': False, 'error': 'Ledger is not partitioned'}
+        
+        try:
+            created = self._create_partitions(month_start(datetime.utcnow()), months_ahead)
+            db.session.commit()
+            return {'success': True, 'partitions_created': created}
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error creating ledger partitions: {str(e)}")
+            return {'success': False, 'error': 'Failed to create ledger partitions'}
+    
+    def compact(self, older_than_months: int = 3) -> Dict[str, Any]:
+        """
+        Compact closed monthly partitions
+        
+        Closed months never receive new rows, so each one is rewritten once in
+        (owner_id, created_at, id) order. Per-owner history reads from old
+        months then touch contiguous pages, and dead space is reclaimed.
+        
+        Args:
+            older_than_months: Only compact months at least this far in the past
+        
+        Returns:
+            Dict with names of compacted partitions
+        """
+        if not self.is_partitioned():
+            return {'success': False, 'error': 'Ledger is not partitioned'}
+        
+        try:
+            cutoff = add_months(month_start(datetime.utcnow()), -older_than_months)
+            compacted = []
+            for name, month in self._list_partitions():
+                if month < cutoff:
+                    db.session.execute(text(
+                        f"CLUSTER {name} USING {name}_owner_id_created_at_id_idx"
+                    ))
+                    db.session.execute(text(f"ANALYZE {name}"))
+                    compacted.append(name)
+            db.session.commit()
+            return {'success': True, 'partitions_compacted': compacted}
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error compacting ledger partitions: {str(e)}")
+            return {'success': False, 'error': 'Failed to compact ledger partitions'}
+    
+    def _create_partitions(self, first_month: datetime, months_ahead: int) -> List[str]:
+        """Create any missing monthly partitions from first_month through now + months_ahead"""
+        last_month = add_months(month_start(datetime.utcnow()), months_ahead)
+        created = []
+        month = first_month
+        while month <= last_month:
+            name = partition_name(month)
+            exists = db.session.execute(
+                text("SELECT to_regclass(:name)"), {'name': name}
+            ).scalar()
+            if not exists:
+                db.session.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF ledger "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+                created.append(name)
+            month = add_months(month, 1)
+        return created
+    
+    def _list_partitions(self) -> List[Tuple[str, datetime]]:
+        """Monthly partitions of the ledger with the month each one covers"""
+        rows = db.session.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'ledger'"
+        )).all()
+        
+        partitions = []
+        for (name,) in rows:
+            month = self._parse_partition_month(name)
+            if month:
+                partitions.append((name, month))
+        return sorted(partitions, key=lambda partition: partition[1])
+    
+    def _parse_partition_month(self, name: str) -> Optional[datetime]:
+        """Month covered by a partition named ledger_yYYYYmMM"""
+        try:
+            year, month = name[len('ledger_y'):].split('m')
+            return datetime(int(year), int(month), 1)
+        except ValueError:
+            return None
@@ -2,7 +2,11 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
 
+from sqlalchemy.orm import Session
+
 from models import db, Pet, Owner
+from services import queries
+from services.feed_service import FeedService
 from utils.enums import Species
 from utils.validators import validate_pet_data
 
@@ -69,6 +73,9 @@ class PetService:
             
             logger.info(f"Pet created: {new_pet.id} for owner {owner.id}")
             
+            # New species/age changes which events the owner's feed should hold
+            FeedService().invalidate(owner.id)
+            
             return {
                 'success': True,
                 'data': {
@@ -82,23 +89,21 @@ class PetService:
             logger.error(f"Error creating pet: {str(e)}")
             return {'success': False, 'error': 'Failed to add pet'}
     
-    def get_pet_details(self, pet_id: int, owner_id: int) -> Dict[str, Any]:
+    def get_pet_details(self, pet_id: int, owner_id: int,
+                        session: Optional[Session] = None) -> Dict[str, Any]:
         """
         Get pet details
         
         Args:
             pet_id: Pet ID
             owner_id: Owner ID for verification
+            session: Session to query on (defaults to db.session)
             
         Returns:
             Dict with pet details or error
         """
         try:
-            pet = Pet.query.filter_by(
-                id=pet_id,
-                owner_id=owner_id,
-                is_active=True
-            ).first()
+            pet = queries.owner_pet(session or db.session, pet_id, owner_id)
             
             if not pet:
                 return {
@@ -166,6 +171,9 @@ class PetService:
             
             logger.info(f"Pet {pet_id} updated: {updated_fields}")
             
+            if {'age_years', 'age_months'} & set(updated_fields):
+                FeedService().invalidate(owner_id)
+            
             return {
                 'success': True,
                 'data': {
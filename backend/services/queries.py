@@ -0,0 +1,205 @@
+"""
+Read queries shared by the Flask views and the async ASGI entry point
+
+Every function takes the Session to run on. Under Flask that is db.session;
+under asgi.py it is the sync facade handed out by AsyncSession.run_sync(),
+so the same query code drives either a sync or an async driver.
+"""
+from typing import Dict, List, Optional
+from datetime import datetime
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Query, Session, contains_eager, joinedload
+
+from models import (
+    Owner, Pet, Event, EventRegistration, ArchivedEvent, ArchivedEventRegistration
+)
+from utils.eligibility import SPECIES_BITS
+from utils.enums import RegistrationStatus, Species
+
+
+def active_user(session: Session, user_id: int) -> Optional[Owner]:
+    """Active, non-deleted owner by ID"""
+    return session.query(Owner).filter_by(
+        id=user_id,
+        is_active=True,
+        is_deleted=False
+    ).first()
+
+
+def owner_pets(session: Session, owner_id: int) -> List[Pet]:
+    """Owner's active pets, newest first"""
+    return session.query(Pet).filter_by(
+        owner_id=owner_id,
+        is_active=True
+    ).order_by(Pet.created_at.desc()).all()
+
+
+def owner_pet(session: Session, pet_id: int, owner_id: int) -> Optional[Pet]:
+    """Active pet if it belongs to the owner"""
+    return session.query(Pet).filter_by(
+        id=pet_id,
+        owner_id=owner_id,
+        is_active=True
+    ).first()
+
+
+def registration_counts(session: Session, owner_id: int, statuses: List[str]) -> Dict[str, int]:
+    """Owner's live plus archived registrations per status"""
+    counts = {status: 0 for status in statuses}
+    for model in (EventRegistration, ArchivedEventRegistration):
+        rows = session.query(model.status, func.count(model.id)).filter(
+            model.owner_id == owner_id,
+            model.status.in_(statuses)
+        ).group_by(model.status).all()
+        for status, count in rows:
+            counts[status] += count
+    return counts
+
+
+def active_event(session: Session, event_id: int) -> Optional[Event]:
+    """Active event by ID"""
+    return session.query(Event).filter_by(
+        id=event_id,
+        is_active=True
+    ).first()
+
+
+def registration_preference(model):
+    """
+    ORDER BY for picking one of an owner's registrations for an event
+    
+    An owner can hold several rows per event (one per pet), some cancelled;
+    the live one wins, then the earliest.
+    """
+    cancelled = case((model.status == RegistrationStatus.CANCELLED.value, 1), else_=0)
+    return cancelled, model.id
+
+
+def event_registration(session: Session, event_id: int,
+                       owner_id: int) -> Optional[EventRegistration]:
+    """Owner's registration for an event, preferring one that is not cancelled"""
+    return session.query(EventRegistration).filter_by(
+        event_id=event_id,
+        owner_id=owner_id
+    ).order_by(*registration_preference(EventRegistration)).first()
+
+
+def active_events(session: Session, event_ids: List[int]) -> List[Event]:
+    """Active events among the given IDs, in no particular order"""
+    if not event_ids:
+        return []
+    return session.query(Event).filter(
+        Event.id.in_(event_ids),
+        Event.is_active == True
+    ).all()
+
+
+def event_registrations(session: Session, event_ids: List[int],
+                        owner_id: int) -> Dict[int, EventRegistration]:
+    """Owner's registration per event among the given IDs, chosen as in event_registration"""
+    registrations = {}
+    if event_ids:
+        rows = session.query(EventRegistration).filter(
+            EventRegistration.event_id.in_(event_ids),
+            EventRegistration.owner_id == owner_id
+        ).order_by(*registration_preference(EventRegistration))
+        for registration in rows:
+            registrations.setdefault(registration.event_id, registration)
+    return registrations
+
+
+def owner_registrations(session: Session, owner_id: int) -> Query:
+    """
+    Owner's registrations with their event and pet loaded in the same query
+    
+    Events are inner-joined (so callers can filter on Event columns) and
+    pets left-joined, instead of lazy-loading both per row.
+    """
+    return session.query(EventRegistration).join(
+        Event, Event.id == EventRegistration.event_id
+    ).filter(
+        EventRegistration.owner_id == owner_id
+    ).options(
+        contains_eager(EventRegistration.event),
+        joinedload(EventRegistration.pet)
+    )
+
+
+def archived_event(session: Session, event_id: int) -> Optional[ArchivedEvent]:
+    """Archive row for an event"""
+    return session.get(ArchivedEvent, event_id)
+
+
+def archived_registration(session: Session, event_id: int,
+                          owner_id: int) -> Optional[ArchivedEventRegistration]:
+    """Archive row for an owner's registration, chosen as in event_registration"""
+    return session.query(ArchivedEventRegistration).filter_by(
+        event_id=event_id,
+        owner_id=owner_id
+    ).order_by(*registration_preference(ArchivedEventRegistration)).first()
+
+
+def archived_events(session: Session, event_ids: List[int]) -> List[ArchivedEvent]:
+    """Archive rows among the given event IDs"""
+    if not event_ids:
+        return []
+    return session.query(ArchivedEvent).filter(ArchivedEvent.id.in_(event_ids)).all()
+
+
+def archived_registrations(session: Session, event_ids: List[int],
+                           owner_id: int) -> Dict[int, ArchivedEventRegistration]:
+    """Archive rows of the owner's registration per event, chosen as in event_registration"""
+    registrations = {}
+    if event_ids:
+        rows = session.query(ArchivedEventRegistration).filter(
+            ArchivedEventRegistration.event_id.in_(event_ids),
+            ArchivedEventRegistration.owner_id == owner_id
+        ).order_by(*registration_preference(ArchivedEventRegistration))
+        for registration in rows:
+            registrations.setdefault(registration.event_id, registration)
+    return registrations
+
+
+def owner_archived_registrations(session: Session, owner_id: int, before_id: Optional[int],
+                                 limit: int) -> List[ArchivedEventRegistration]:
+    """Owner's archived registrations, newest (highest ID) first"""
+    query = session.query(ArchivedEventRegistration).filter(
+        ArchivedEventRegistration.owner_id == owner_id
+    )
+    if before_id is not None:
+        query = query.filter(ArchivedEventRegistration.id < before_id)
+    return query.order_by(ArchivedEventRegistration.id.desc()).limit(limit).all()
+
+
+def upcoming_events(session: Session) -> Query:
+    """Active events that have not started yet"""
+    return session.query(Event).filter(
+        Event.is_active == True,
+        Event.start_datetime > datetime.utcnow(),
+        Event.status == 'upcoming'
+    )
+
+
+def area_events(session: Session, city: str, state: Optional[str],
+                country: Optional[str]) -> Query:
+    """Upcoming events in a city, optionally narrowed by state and country"""
+    query = upcoming_events(session).filter(func.lower(Event.city) == func.lower(city))
+    if state:
+        query = query.filter(func.lower(Event.state) == func.lower(state))
+    if country:
+        query = query.filter(func.lower(Event.country) == func.lower(country))
+    return query
+
+
+def eligible_events(query: Query, species: Optional[Species],
+                    age_months: Optional[int]) -> Query:
+    """Narrow an event query to events open to a species and pet age"""
+    if species is not None:
+        query = query.filter(Event.species_mask.op('&')(SPECIES_BITS[species]) != 0)
+    if age_months is not None:
+        query = query.filter(
+            or_(Event.min_age_months.is_(None), Event.min_age_months <= age_months),
+            or_(Event.max_age_months.is_(None), Event.max_age_months >= age_months)
+        )
+    return query
@@ -1,19 +1,27 @@
 import logging
-import string
-import secrets
 from typing import Dict, Any, Optional
 from datetime import datetime
-from models import db, Owner, Pet, EventRegistration
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from config import Config
+from extensions import place_index
+from models import db, Owner, Pet
+from services import queries
+from services.feed_service import FeedService
+from services.outbox_service import OutboxService
+from utils.referral_codes import ReferralCodeCodec
 from utils.validators import validate_phone, validate_coordinates
 from utils.enums import UserRoles
-from utils.slack import log_to_slack
+from utils.location import geo_cell, geocode_place
 
 logger = logging.getLogger(__name__)
 
 
 class UserService:
     """Service class for user operations"""
-
+    
+    referral_codec = ReferralCodeCodec(Config.REFERRAL_CODE_SECRET)
+    
     def create_user(self, google_id: str, email: str, name: str, 
                                 profile_image: Optional[str] = None, referee: Optional[Owner] = None):
         new_user = Owner(
@@ -21,7 +29,6 @@ class UserService:
             email=email,
             name=name,
             profile_image=profile_image,
-            referral_code=self._generate_user_referral_code(),
             referred_by=referee.id if referee else None,
             user_role=UserRoles.USER.value,
             coins_balance=0,  # Start with 0, bonus added separately
@@ -32,28 +39,38 @@ class UserService:
             is_deleted=False
         )
         
-        log_to_slack(f"New User Onboarded : {email}", "Info", "create_user")
-        
         db.session.add(new_user)
         db.session.flush() 
+        
+        # Code is derived from the ID, so it can only be assigned after flush
+        new_user.referral_code = self._generate_user_referral_code(new_user.id)
+        
+        # Announced on Slack by the outbox worker once the signup commits
+        OutboxService().publish(OutboxService.USER_CREATED, [
+            {'owner_id': new_user.id, 'email': email}
+        ])
         return new_user
     
-    def _generate_user_referral_code(self, length: int = 8) -> str:
-        """Generate unique referral code"""
-        characters = string.ascii_uppercase + string.digits
+    def _generate_user_referral_code(self, owner_id: int) -> str:
+        """
+        Generate unique referral code for an owner
+        
+        Codes are a keyed bijection of the owner ID, so they never collide
+        with each other. One indexed probe per candidate catches a clash
+        with a code issued under the old random scheme, in which case the
+        next tweak of the permutation is tried.
+        """
+        tweak = 0
         while True:
-            code = ''.join(secrets.choice(characters) for _ in range(length))
-            if not Owner.query.filter_by(referral_code=code).first():
+            code = self.referral_codec.encode(owner_id, tweak)
+            if db.session.query(Owner.id).filter_by(referral_code=code).first() is None:
                 return code
+            tweak += 1
     
-    def get_user_by_id(self, user_id: int) -> Optional[Owner]:
+    def get_user_by_id(self, user_id: int, session: Optional[Session] = None) -> Optional[Owner]:
         """Get active user by ID"""
         try:
-            return Owner.query.filter_by(
-                id=user_id,
-                is_active=True,
-                is_deleted=False
-            ).first()
+            return queries.active_user(session or db.session, user_id)
         except Exception as e:
             logger.error(f"Error fetching user {user_id}: {str(e)}")
             return None
@@ -82,29 +99,28 @@ class UserService:
             logger.error(f"Error fetching user {referral_code}: {str(e)}")
             return None
     
-    def get_user_profile(self, user_id: int) -> Dict[str, Any]:
+    def get_user_profile(self, user_id: int, session: Optional[Session] = None) -> Dict[str, Any]:
         """
         Get complete user profile with pets
         
         Args:
             user_id: User ID
+            session: Session to query on (defaults to db.session)
             
         Returns:
             Dict with profile data or error
         """
         try:
-            user = self.get_user_by_id(user_id)
+            session = session or db.session
+            user = self.get_user_by_id(user_id, session)
             if not user:
                 return {'success': False, 'error': 'User not found'}
             
             # Get user's pets
-            pets = Pet.query.filter_by(
-                owner_id=user_id,
-                is_active=True
-            ).order_by(Pet.created_at.desc()).all()
+            pets = queries.owner_pets(session, user_id)
             
             # Get event statistics
-            event_stats = self._get_event_stats(user_id)
+            event_stats = self._get_event_stats(session, user_id)
             
             return {
                 'success': True,
@@ -164,6 +180,8 @@ class UserService:
                 'country', 'pincode', 'latitude', 'longitude'
             ]
             
+            previous_places = (user.city, user.state, user.country)
+            
             # Validate and update fields
             updated_fields = []
             for field in allowed_fields:
@@ -185,11 +203,27 @@ class UserService:
             if not updated_fields:
                 return {'success': False, 'error': 'No valid fields to update'}
             
+            # Place owners who only gave a city or pincode for coordinate search
+            if user.latitude is None and {'city', 'pincode'} & set(updated_fields):
+                coordinates = geocode_place(user.pincode, user.city, user.state, user.country)
+                if coordinates:
+                    user.latitude, user.longitude = coordinates
+                    updated_fields += ['latitude', 'longitude']
+            
+            # Keep the spatial index used to find owners near new events in step
+            if user.latitude is not None and user.longitude is not None:
+                user.geo_cell = geo_cell(user.latitude, user.longitude)
+            
             user.updated_at = datetime.utcnow()
             db.session.commit()
             
             logger.info(f"Profile updated for user {user_id}: {updated_fields}")
             
+            if {'latitude', 'longitude'} & set(updated_fields):
+                FeedService().invalidate(user_id)
+            if {'city', 'state', 'country'} & set(updated_fields):
+                place_index.update_owner(user, previous_places)
+            
             return {
                 'success': True,
                 'data': {
@@ -203,14 +237,105 @@ class UserService:
             logger.error(f"Error updating profile for user {user_id}: {str(e)}")
             return {'success': False, 'error': 'Profile update failed'}
     
-    def _get_event_stats(self, user_id: int) -> Dict[str, int]:
+    def backfill_coordinates(self, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Fill missing owner latitude/longitude from pincode or city
+        
+        Uses the offline gazetteer, so no external calls; each batch is one
+        bulk UPDATE.
+        
+        Args:
+            batch_size: Owners read and updated per transaction
+        
+        Returns:
+            Dict with counts of updated and unresolved owners
+        """
+        updated = 0
+        unresolved = 0
+        last_id = 0
+        
+        try:
+            while True:
+                rows = db.session.query(
+                    Owner.id, Owner.pincode, Owner.city, Owner.state, Owner.country
+                ).filter(
+                    Owner.id > last_id,
+                    Owner.is_deleted == False,
+                    Owner.latitude.is_(None),
+                    (Owner.pincode.isnot(None)) | (Owner.city.isnot(None))
+                ).order_by(Owner.id).limit(batch_size).all()
+                if not rows:
+                    break
+                
+                changes = []
+                for owner_id, pincode, city, state, country in rows:
+                    coordinates = geocode_place(pincode, city, state, country)
+                    if coordinates:
+                        changes.append({'id': owner_id, 'latitude': coordinates[0],
+                                        'longitude': coordinates[1],
+                                        'geo_cell': geo_cell(*coordinates)})
+                    else:
+                        unresolved += 1
+                
+                if changes:
+                    db.session.execute(update(Owner), changes)
+                    updated += len(changes)
+                
+                last_id = rows[-1].id
+                db.session.commit()
+            
+            return {'success': True, 'updated': updated, 'unresolved': unresolved}
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error backfilling owner coordinates: {str(e)}")
+            return {'success': False, 'error': 'Failed to backfill owner coordinates'}
+    
+    def backfill_geo_cells(self, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Fill geo_cell for owners whose coordinates predate the column
+        
+        Args:
+            batch_size: Owners read and updated per transaction
+        
+        Returns:
+            Dict with count of updated owners
+        """
+        updated = 0
+        last_id = 0
+        
+        try:
+            while True:
+                rows = db.session.query(Owner.id, Owner.latitude, Owner.longitude).filter(
+                    Owner.id > last_id,
+                    Owner.geo_cell.is_(None),
+                    Owner.latitude.isnot(None),
+                    Owner.longitude.isnot(None)
+                ).order_by(Owner.id).limit(batch_size).all()
+                if not rows:
+                    break
+                
+                db.session.execute(update(Owner), [
+                    {'id': owner_id, 'geo_cell': geo_cell(latitude, longitude)}
+                    for owner_id, latitude, longitude in rows
+                ])
+                updated += len(rows)
+                
+                last_id = rows[-1].id
+                db.session.commit()
+            
+            return {'success': True, 'updated': updated}
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error backfilling owner geo cells: {str(e)}")
+            return {'success': False, 'error': 'Failed to backfill owner geo cells'}
+    
+    def _get_event_stats(self, session: Session, user_id: int) -> Dict[str, int]:
         """Get user's event statistics"""
         try:
-            registrations = EventRegistration.query.filter_by(owner_id=user_id).all()
-            return {
-                'registered': len([r for r in registrations if r.status == 'registered']),
-                'attended': len([r for r in registrations if r.status == 'attended'])
-            }
+            # Count live and archived registrations per status
+            return queries.registration_counts(session, user_id, ['registered', 'attended'])
         except Exception as e:
             logger.error(f"Error fetching event stats: {str(e)}")
             return {'registered': 0, 'attended': 0}
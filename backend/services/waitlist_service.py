@@ -0,0 +1,161 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import logging
+
+from sqlalchemy.orm import Session
+
+from models import db, EventWaitlist, WaitlistEntry
+from utils.fenwick import FenwickTree
+
+logger = logging.getLogger(__name__)
+
+
+class WaitlistService:
+    """
+    Service class for event waitlists
+    
+    Each event's waitlist is one event_waitlists row holding a Fenwick tree
+    over ticket numbers, plus a waitlist_entries row per waiting owner.
+    Joining takes the next ticket. An owner's position is the number of
+    tickets still waiting up to theirs: an O(log n) prefix sum read from
+    the stored tree. Leaving or being promoted clears a ticket in O(log n),
+    and the head is found by descending the tree.
+    
+    Writes expect the caller to hold the event's row lock and do not commit.
+    """
+    
+    def add(self, event_id: int, owner_id: int, pet_ids: List[int]) -> int:
+        """
+        Put an owner at the back of an event's waitlist (no commit)
+        
+        Returns:
+            Their position (1 = next to be promoted)
+        """
+        waitlist = db.session.get(EventWaitlist, event_id)
+        if waitlist is None:
+            waitlist = EventWaitlist(event_id=event_id, next_ticket=1, length=0,
+                                     tree=FenwickTree().to_bytes())
+            db.session.add(waitlist)
+        
+        ticket = waitlist.next_ticket
+        tree = FenwickTree(waitlist.tree)
+        tree.add(ticket, 1)
+        
+        waitlist.next_ticket = ticket + 1
+        waitlist.length += 1
+        waitlist.tree = tree.to_bytes()
+        db.session.add(WaitlistEntry(
+            event_id=event_id,
+            owner_id=owner_id,
+            ticket=ticket,
+            pet_ids=pet_ids or None,
+            created_at=datetime.utcnow()
+        ))
+        return tree.prefix_sum(ticket)
+    
+    def remove(self, event_id: int, owner_id: int) -> bool:
+        """
+        Take an owner off an event's waitlist (no commit)
+        
+        Returns:
+            True if they were on it
+        """
+        entry = WaitlistEntry.query.filter_by(event_id=event_id, owner_id=owner_id).first()
+        if entry is None:
+            return False
+        self._clear(event_id, entry)
+        return True
+    
+    def pop_head(self, event_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Take the first owner off an event's waitlist (no commit)
+        
+        Returns:
+            Dict with owner_id and pet_ids, or None if nobody is waiting
+        """
+        waitlist = db.session.get(EventWaitlist, event_id)
+        if waitlist is None or not waitlist.length:
+            return None
+        
+        ticket = FenwickTree(waitlist.tree).find(1)
+        entry = WaitlistEntry.query.filter_by(event_id=event_id, ticket=ticket).first()
+        head = {'owner_id': entry.owner_id, 'pet_ids': entry.pet_ids or []}
+        self._clear(event_id, entry, waitlist)
+        return head
+    
+    def clear_events(self, event_ids: List[int]) -> List[int]:
+        """
+        Drop the waitlists of events that can no longer promote anyone (no commit)
+        
+        Returns:
+            IDs of the owners who were waiting
+        """
+        if not event_ids:
+            return []
+        owner_ids = [owner_id for owner_id, in db.session.query(
+            WaitlistEntry.owner_id
+        ).filter(WaitlistEntry.event_id.in_(event_ids))]
+        WaitlistEntry.query.filter(
+            WaitlistEntry.event_id.in_(event_ids)
+        ).delete(synchronize_session=False)
+        EventWaitlist.query.filter(
+            EventWaitlist.event_id.in_(event_ids)
+        ).delete(synchronize_session=False)
+        return owner_ids
+    
+    def is_waiting(self, event_id: int, owner_id: int) -> bool:
+        return db.session.query(WaitlistEntry.id).filter_by(
+            event_id=event_id, owner_id=owner_id
+        ).first() is not None
+    
+    def get_position(self, event_id: int, owner_id: int,
+                     session: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        An owner's place on an event's waitlist, in one indexed query
+        
+        Args:
+            event_id: Event ID
+            owner_id: Owner ID
+            session: Session to query with (defaults to db.session)
+        
+        Returns:
+            Dict with position, waitlist length and join time, or error
+        """
+        try:
+            session = session or db.session
+            row = session.query(
+                WaitlistEntry.ticket, WaitlistEntry.created_at,
+                EventWaitlist.tree, EventWaitlist.length
+            ).join(
+                EventWaitlist, EventWaitlist.event_id == WaitlistEntry.event_id
+            ).filter(
+                WaitlistEntry.event_id == event_id,
+                WaitlistEntry.owner_id == owner_id
+            ).first()
+            
+            if row is None:
+                return {'success': False, 'error': 'Not on the waitlist for this event',
+                        'status_code': 404}
+            
+            return {
+                'success': True,
+                'data': {
+                    'event_id': event_id,
+                    'position': FenwickTree(row.tree).prefix_sum(row.ticket),
+                    'waitlist_length': row.length,
+                    'joined_at': row.created_at.isoformat() if row.created_at else None
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error fetching waitlist position for owner {owner_id}: {str(e)}")
+            return {'success': False, 'error': 'Failed to fetch waitlist position'}
+    
+    def _clear(self, event_id: int, entry: WaitlistEntry,
+               waitlist: Optional[EventWaitlist] = None) -> None:
+        waitlist = waitlist or db.session.get(EventWaitlist, event_id)
+        tree = FenwickTree(waitlist.tree)
+        tree.add(entry.ticket, -1)
+        waitlist.tree = tree.to_bytes()
+        waitlist.length -= 1
+        db.session.delete(entry)
@@ -0,0 +1,110 @@
+from typing import Any, Iterable, Optional, Tuple
+
+from utils.enums import Species
+
+# One bit per species, in enum declaration order. Append new species to the
+# end of the enum so stored masks keep their meaning.
+SPECIES_BITS = {species: 1 << index for index, species in enumerate(Species)}
+ALL_SPECIES_MASK = sum(SPECIES_BITS.values())
+
+
+def parse_species(value: Any) -> Species:
+    """
+    Resolve a species name or enum member
+    
+    Raises:
+        ValueError: If the species is unknown
+    """
+    if isinstance(value, Species):
+        return value
+    try:
+        return Species(str(value).lower())
+    except ValueError:
+        raise ValueError(f'Invalid species: {value}')
+
+
+def species_mask(allowed_species: Optional[Iterable[Any]]) -> int:
+    """
+    Bitmask for an event's allowed_species list
+    
+    Args:
+        allowed_species: Species names, or None/empty for no restriction
+    
+    Returns:
+        Integer mask with one bit per allowed species
+    
+    Raises:
+        ValueError: If a species is unknown
+    """
+    if not allowed_species:
+        return ALL_SPECIES_MASK
+    if isinstance(allowed_species, str):
+        allowed_species = [allowed_species]
+    
+    mask = 0
+    for value in allowed_species:
+        mask |= SPECIES_BITS[parse_species(value)]
+    return mask
+
+
+def age_bounds(age_restrictions: Optional[dict]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Minimum and maximum pet age in months for an event's age_restrictions
+    
+    age_restrictions uses the same units as Pet: any of min_years,
+    min_months, max_years and max_months, e.g. {"min_months": 6} or
+    {"max_years": 1, "max_months": 6}.
+    
+    Args:
+        age_restrictions: Restriction dict or None
+    
+    Returns:
+        Tuple of (min_age_months, max_age_months), None where unbounded
+    
+    Raises:
+        ValueError: If the restrictions are malformed
+    """
+    if not age_restrictions:
+        return None, None
+    if not isinstance(age_restrictions, dict):
+        raise ValueError('Age restrictions must be an object')
+    
+    bounds = []
+    for prefix in ('min', 'max'):
+        years = age_restrictions.get(f'{prefix}_years')
+        months = age_restrictions.get(f'{prefix}_months')
+        if years is None and months is None:
+            bounds.append(None)
+            continue
+        try:
+            total = int(years or 0) * 12 + int(months or 0)
+        except (TypeError, ValueError):
+            raise ValueError('Age restrictions must be whole numbers')
+        if total < 0:
+            raise ValueError('Age restrictions cannot be negative')
+        bounds.append(total)
+    
+    min_months, max_months = bounds
+    if min_months is not None and max_months is not None and min_months > max_months:
+        raise ValueError('Minimum age cannot exceed maximum age')
+    return min_months, max_months
+
+
+def pet_age_months(age_years: Optional[int], age_months: Optional[int]) -> Optional[int]:
+    """Pet age in months, or None if the owner never set it"""
+    if age_years is None and age_months is None:
+        return None
+    return (age_years or 0) * 12 + (age_months or 0)
+
+
+def is_eligible(mask: int, min_age_months: Optional[int], max_age_months: Optional[int],
+                species: Species, age_months: Optional[int]) -> bool:
+    """Whether a pet meets an event's species mask and age bounds (unknown age passes)"""
+    if not mask & SPECIES_BITS[species]:
+        return False
+    if age_months is not None:
+        if min_age_months is not None and age_months < min_age_months:
+            return False
+        if max_age_months is not None and age_months > max_age_months:
+            return False
+    return True
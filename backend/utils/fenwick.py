@@ -0,0 +1,89 @@
+import struct
+from typing import Optional, Union
+
+
+class FenwickTree:
+    """
+    Binary indexed tree of non-negative counts over positions 1..size
+    
+    Backed by a flat buffer of 4-byte little-endian cells, so it is stored
+    in a LargeBinary column as-is. prefix_sum() and find() read cells
+    straight from the buffer, so a lookup on a stored blob is O(log n)
+    without decoding it; add() is O(log n) too. size stays a power of
+    two, and growing doubles it in O(n).
+    """
+    
+    CELL = struct.Struct('<I')
+    
+    def __init__(self, data: Union[bytes, bytearray, None] = None, size: int = 64):
+        if data is None:
+            if size < 1 or size & (size - 1):
+                raise ValueError('size must be a power of two')
+            data = bytearray(self.CELL.size * size)
+        self._data = data
+        self.size = len(data) // self.CELL.size
+    
+    def to_bytes(self) -> bytes:
+        return bytes(self._data)
+    
+    def add(self, index: int, delta: int) -> None:
+        """Add delta to the count at index (1-based), growing the tree if needed"""
+        if index < 1:
+            raise IndexError('FenwickTree positions start at 1')
+        if not isinstance(self._data, bytearray):
+            self._data = bytearray(self._data)
+        while index > self.size:
+            self._grow()
+        while index <= self.size:
+            self._set(index, self._get(index) + delta)
+            index += index & -index
+    
+    def prefix_sum(self, index: int) -> int:
+        """Sum of counts at positions 1..index"""
+        index = min(index, self.size)
+        total = 0
+        while index > 0:
+            total += self._get(index)
+            index -= index & -index
+        return total
+    
+    def total(self) -> int:
+        """Sum of all counts (the last cell covers the whole range)"""
+        return self._get(self.size) if self.size else 0
+    
+    def find(self, k: int) -> Optional[int]:
+        """
+        Smallest position whose prefix sum reaches k
+        
+        With 0/1 counts this is the position of the k-th set entry.
+        
+        Returns:
+            Position, or None if the counts add up to less than k
+        """
+        if k < 1 or k > self.total():
+            return None
+        position = 0
+        step = self.size
+        while step:
+            candidate = position + step
+            if candidate <= self.size:
+                count = self._get(candidate)
+                if count < k:
+                    position = candidate
+                    k -= count
+            step >>= 1
+        return position + 1
+    
+    def _grow(self) -> None:
+        # Doubling a power-of-two tree: the new last cell covers everything,
+        # every other new cell covers only the empty new half
+        total = self.total()
+        self._data.extend(bytes(len(self._data)))
+        self.size *= 2
+        self._set(self.size, total)
+    
+    def _get(self, index: int) -> int:
+        return self.CELL.unpack_from(self._data, (index - 1) * self.CELL.size)[0]
+    
+    def _set(self, index: int, value: int) -> None:
+        self.CELL.pack_into(self._data, (index - 1) * self.CELL.size, value)
@@ -0,0 +1,281 @@
+"""
+Offline gazetteer of pincode and city centroids
+
+The source is a CSV of pincode,city,state,country,latitude,longitude rows
+(pincode may be blank for city-only or alias rows) or a GeoNames postal
+code dump (tab-separated .txt). compile_gazetteer() turns it into a flat
+binary file of fixed-width arrays that Gazetteer memory-maps, so a process
+pays for the pages it touches rather than parsing the dataset on start:
+
+    header      magic, pincode count, place count, reverse count, blob size
+    pincodes    uint32[pincode count], sorted
+    pin_places  uint32[pincode count], place index per pincode
+    latitudes   float32[place count]
+    longitudes  float32[place count]
+    offsets     uint32[place count + 1], name offsets into blob
+    by_lat      uint32[reverse count], places used for reverse lookup, by latitude
+    blob        "City\\tState\\tCountry" UTF-8 names, places sorted by
+                normalized name
+
+All lookups are binary searches over these arrays.
+"""
+import csv
+import mmap
+import math
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.location import calculate_distance
+from utils.place_index import normalize_place
+
+MAGIC = b'GAZ1'
+HEADER = struct.Struct('<4sIIII')
+KM_PER_DEGREE_LAT = 111.0
+
+
+def place_key(city: str, state: Optional[str] = None, country: Optional[str] = None) -> str:
+    """Sort key of a place: normalized city, state and country"""
+    return '\t'.join(normalize_place(part) for part in (city, state, country))
+
+
+def read_source(path: str) -> List[Tuple]:
+    """
+    Read gazetteer source rows
+    
+    Args:
+        path: CSV in this module's format, or a GeoNames postal .txt dump
+    
+    Returns:
+        List of (pincode or None, city, state, country, latitude, longitude)
+    """
+    rows = []
+    with open(path, newline='', encoding='utf-8') as source:
+        if path.endswith('.txt'):
+            # GeoNames: country code, postal code, place name, admin1 name, ..., lat, lon
+            for record in csv.reader(source, delimiter='\t'):
+                if len(record) < 11 or not record[9] or not record[10]:
+                    continue
+                rows.append((record[1], record[2], record[3], record[0],
+                             float(record[9]), float(record[10])))
+        else:
+            for record in csv.DictReader(source):
+                rows.append((record['pincode'] or None, record['city'], record['state'],
+                             record['country'], float(record['latitude']),
+                             float(record['longitude'])))
+    return rows
+
+
+def compile_gazetteer(rows: Iterable[Tuple]) -> bytes:
+    """
+    Build the binary gazetteer from source rows
+    
+    Rows sharing a city, state and country become one place at the mean of
+    their coordinates; each pincode points at its place.
+    
+    Args:
+        rows: (pincode, city, state, country, latitude, longitude) tuples
+    
+    Returns:
+        File contents for Gazetteer
+    """
+    places: Dict[str, list] = {}
+    pincodes: Dict[int, str] = {}
+    for pincode, city, state, country, latitude, longitude in rows:
+        key = place_key(city, state, country)
+        if not key.split('\t')[0]:
+            continue
+        place = places.setdefault(key, [f'{city.strip()}\t{state or ""}\t{country or ""}',
+                                        0.0, 0.0, 0, False])
+        place[1] += latitude
+        place[2] += longitude
+        place[3] += 1
+        digits = ''.join(ch for ch in str(pincode or '') if ch.isdigit())
+        if digits:
+            pincodes.setdefault(int(digits), key)
+            place[4] = True
+    
+    keys = sorted(places)
+    position = {key: index for index, key in enumerate(keys)}
+    
+    latitudes, longitudes, offsets = array('f'), array('f'), array('I', [0])
+    blob = bytearray()
+    for key in keys:
+        name, lat_sum, lon_sum, count, _ = places[key]
+        latitudes.append(lat_sum / count)
+        longitudes.append(lon_sum / count)
+        blob += name.encode('utf-8')
+        offsets.append(len(blob))
+    
+    # Alias rows without a pincode only serve forward lookups
+    reverse = [i for i, key in enumerate(keys) if places[key][4]] or list(range(len(keys)))
+    by_lat = array('I', sorted(reverse, key=lambda i: latitudes[i]))
+    
+    codes = sorted(pincodes)
+    sections = [
+        array('I', codes),
+        array('I', [position[pincodes[code]] for code in codes]),
+        latitudes, longitudes, offsets, by_lat
+    ]
+    if sys.byteorder != 'little':
+        for section in sections:
+            section.byteswap()
+    
+    return b''.join(
+        [HEADER.pack(MAGIC, len(codes), len(keys), len(by_lat), len(blob))]
+        + [section.tobytes() for section in sections]
+        + [bytes(blob)]
+    )
+
+
+class _Names:
+    """Sequence view of place names in the blob, for bisect"""
+    
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def name(self, index: int) -> str:
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+    
+    def __getitem__(self, index: int) -> str:
+        return place_key(*self.name(index).split('\t'))
+
+
+class Gazetteer:
+    """Read-only lookups over a compiled gazetteer"""
+    
+    def __init__(self, data):
+        """
+        Args:
+            data: Compiled bytes, or an mmap of a compiled file
+        """
+        self._data = data
+        view = memoryview(data)
+        magic, pin_count, place_count, reverse_count, blob_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError('Not a gazetteer file')
+        
+        offset = HEADER.size
+        sections = []
+        for typecode, count in (('I', pin_count), ('I', pin_count), ('f', place_count),
+                                ('f', place_count), ('I', place_count + 1),
+                                ('I', reverse_count)):
+            section = view[offset:offset + 4 * count]
+            if sys.byteorder == 'little':
+                sections.append(section.cast(typecode))
+            else:
+                swapped = array(typecode, section.tobytes())
+                swapped.byteswap()
+                sections.append(swapped)
+            offset += 4 * count
+        
+        (self._pincodes, self._pin_places, self._latitudes, self._longitudes,
+         offsets, self._by_lat) = sections
+        self._names = _Names(offsets, view[offset:offset + blob_size])
+        self._by_lat_keys = _Latitudes(self._by_lat, self._latitudes)
+    
+    @classmethod
+    def open(cls, path: str) -> 'Gazetteer':
+        """Memory-map a compiled gazetteer file"""
+        with open(path, 'rb') as compiled:
+            return cls(mmap.mmap(compiled.fileno(), 0, access=mmap.ACCESS_READ))
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def by_pincode(self, pincode: str) -> Optional[Dict]:
+        """
+        Place for a pincode
+        
+        Unknown pincodes fall back to the nearest known pincode in the same
+        sorting district (first three digits).
+        """
+        digits = ''.join(ch for ch in str(pincode) if ch.isdigit())
+        if len(digits) != 6:
+            return None
+        code = int(digits)
+        
+        index = bisect_left(self._pincodes, code)
+        if index < len(self._pincodes) and self._pincodes[index] == code:
+            return self._place(self._pin_places[index], exact=True)
+        
+        district = code // 1000
+        nearest = None
+        for candidate in (index - 1, index):
+            if 0 <= candidate < len(self._pincodes) and self._pincodes[candidate] // 1000 == district:
+                if nearest is None or (abs(self._pincodes[candidate] - code)
+                                       < abs(self._pincodes[nearest] - code)):
+                    nearest = candidate
+        return None if nearest is None else self._place(self._pin_places[nearest], exact=False)
+    
+    def by_city(self, city: str, state: Optional[str] = None,
+                country: Optional[str] = None) -> Optional[Dict]:
+        """Place for a city name, narrowed by state and country when given"""
+        city_key = normalize_place(city)
+        if not city_key:
+            return None
+        state_key, country_key = normalize_place(state), normalize_place(country)
+        
+        index = bisect_left(self._names, city_key + '\t')
+        while index < len(self._names):
+            key = self._names[index]
+            if not key.startswith(city_key + '\t'):
+                break
+            _, place_state, place_country = key.split('\t')
+            if (not state_key or place_state == state_key) and \
+                    (not country_key or place_country == country_key):
+                return self._place(index, exact=True)
+            index += 1
+        return None
+    
+    def nearest(self, latitude: float, longitude: float,
+                max_distance_km: float = 50) -> Optional[Dict]:
+        """Closest place within max_distance_km of a coordinate"""
+        lat_delta = max_distance_km / KM_PER_DEGREE_LAT
+        start = bisect_left(self._by_lat_keys, latitude - lat_delta)
+        end = bisect_right(self._by_lat_keys, latitude + lat_delta)
+        
+        best, best_distance = None, math.inf
+        for position in range(start, end):
+            index = self._by_lat[position]
+            distance = calculate_distance(latitude, longitude,
+                                          self._latitudes[index], self._longitudes[index])
+            if distance < best_distance:
+                best, best_distance = index, distance
+        
+        if best is None or best_distance > max_distance_km:
+            return None
+        place = self._place(best, exact=True)
+        place['distance_km'] = round(best_distance, 2)
+        return place
+    
+    def _place(self, index: int, exact: bool) -> Dict:
+        city, state, country = self._names.name(index).split('\t')
+        return {
+            'city': city,
+            'state': state or None,
+            'country': country or None,
+            'latitude': round(self._latitudes[index], 5),
+            'longitude': round(self._longitudes[index], 5),
+            'exact': exact
+        }
+
+
+class _Latitudes:
+    """Sequence of latitudes in by_lat order, for bisect"""
+    
+    def __init__(self, by_lat, latitudes):
+        self._by_lat = by_lat
+        self._latitudes = latitudes
+    
+    def __len__(self) -> int:
+        return len(self._by_lat)
+    
+    def __getitem__(self, position: int) -> float:
+        return self._latitudes[self._by_lat[position]]
@@ -0,0 +1,47 @@
+import importlib
+import threading
+from typing import Any
+
+
+class LazyService:
+    """
+    Proxy that imports and constructs a service class on first attribute access
+    
+    Keeps service modules (and their dependencies) off the cold-start path:
+    a serverless instance only imports the services its first requests use.
+    Also works for extensions: init_app(app) is remembered and applied when
+    the instance is built.
+    """
+    
+    def __init__(self, module_path: str, class_name: str):
+        self._module_path = module_path
+        self._class_name = class_name
+        self._instance = None
+        self._app = None
+        self._lock = threading.Lock()
+    
+    def init_app(self, app) -> None:
+        """Initialise the wrapped extension with app once it is built"""
+        with self._lock:
+            self._app = app
+            if self._instance is not None:
+                self._instance.init_app(app)
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the wrapped instance has been built"""
+        return self._instance is not None
+    
+    def _get_instance(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module = importlib.import_module(self._module_path)
+                    instance = getattr(module, self._class_name)()
+                    if self._app is not None:
+                        instance.init_app(self._app)
+                    self._instance = instance
+        return self._instance
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_instance(), name)
@@ -1,8 +1,27 @@
+import os
+import re
 import math
-from typing import Tuple, Optional, Dict
+import logging
+import threading
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, List
+
+logger = logging.getLogger(__name__)
 
 R = 6371
 
+PINCODE_PATTERN = re.compile(r'\b(\d{3}\s?\d{3})\b')
+
+# Fixed lat/lon grid for Owner.geo_cell (~11 km cells at the equator)
+GEO_CELL_DEGREES = 0.1
+GEO_CELL_ROWS = 1800
+GEO_CELL_COLS = 3600
+MAX_GEO_CELLS = 400  # Larger areas fall back to a bounding-box scan
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate distance between two coordinates using Haversine formula
@@ -58,10 +77,112 @@ def get_bounding_box(latitude: float, longitude: float,
     return min_lat, max_lat, min_lon, max_lon
 
 
+def geo_cell(latitude: float, longitude: float) -> int:
+    """
+    Grid cell containing a coordinate
+    
+    Args:
+        latitude: Latitude
+        longitude: Longitude
+    
+    Returns:
+        Cell number, row-major from the south-west corner
+    """
+    row = min(max(math.floor((latitude + 90) / GEO_CELL_DEGREES), 0), GEO_CELL_ROWS - 1)
+    col = math.floor(((longitude + 180) % 360) / GEO_CELL_DEGREES) % GEO_CELL_COLS
+    return row * GEO_CELL_COLS + col
+
+
+def geo_cells_within(latitude: float, longitude: float,
+                     radius_km: float) -> Optional[List[int]]:
+    """
+    Grid cells overlapping the bounding box of a circle
+    
+    Args:
+        latitude: Center latitude
+        longitude: Center longitude
+        radius_km: Radius in kilometers
+    
+    Returns:
+        List of cell numbers, or None if the area spans more than
+        MAX_GEO_CELLS cells (or a pole) and should be scanned by bounding box
+    """
+    min_lat, max_lat, min_lon, max_lon = get_bounding_box(latitude, longitude, radius_km)
+    if min_lat < -90 or max_lat > 90 or max_lon - min_lon >= 360:
+        return None
+    
+    min_row = geo_cell(min_lat, 0) // GEO_CELL_COLS
+    max_row = geo_cell(max_lat, 0) // GEO_CELL_COLS
+    first_col = math.floor((min_lon + 180) / GEO_CELL_DEGREES)
+    last_col = math.floor((max_lon + 180) / GEO_CELL_DEGREES)
+    if (max_row - min_row + 1) * (last_col - first_col + 1) > MAX_GEO_CELLS:
+        return None
+    
+    return [
+        row * GEO_CELL_COLS + col % GEO_CELL_COLS
+        for row in range(min_row, max_row + 1)
+        for col in range(first_col, last_col + 1)
+    ]
+
+
+def get_gazetteer():
+    """
+    Process-wide offline gazetteer, opened on first use
+    
+    Memory-maps the compiled file at GAZETTEER_PATH. If it has not been
+    built (`flask geo build-gazetteer`), the bundled source CSV is compiled
+    in memory instead.
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                from config import Config
+                from utils.gazetteer import Gazetteer, compile_gazetteer, read_source
+                
+                if os.path.exists(Config.GAZETTEER_PATH):
+                    _gazetteer = Gazetteer.open(Config.GAZETTEER_PATH)
+                else:
+                    logger.info(f"No compiled gazetteer at {Config.GAZETTEER_PATH}; "
+                                f"compiling {Config.GAZETTEER_SOURCE}")
+                    _gazetteer = Gazetteer(compile_gazetteer(read_source(Config.GAZETTEER_SOURCE)))
+    return _gazetteer
+
+
+@lru_cache(maxsize=4096)
+def geocode_place(pincode: Optional[str] = None, city: Optional[str] = None,
+                  state: Optional[str] = None,
+                  country: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """
+    Coordinates for a pincode or city from the offline gazetteer
+    
+    The pincode wins when both are known. Results, including misses, are
+    cached per distinct argument set.
+    
+    Args:
+        pincode: Postal code
+        city, state, country: Place names
+        
+    Returns:
+        Tuple of (latitude, longitude) or None
+    """
+    gazetteer = get_gazetteer()
+    place = None
+    if pincode:
+        place = gazetteer.by_pincode(pincode)
+    if place is None and city:
+        place = gazetteer.by_city(city, state, country) or gazetteer.by_city(city, state)
+    if place is None:
+        return None
+    return place['latitude'], place['longitude']
+
+
 def geocode_address(address: str) -> Optional[Tuple[float, float]]:
     """
-    Geocode an address to coordinates
-    Note: This is a placeholder. Implement with actual geocoding service
+    Geocode a free-form address to coordinates
+    
+    Uses a six-digit pincode in the address if there is one, otherwise
+    the rightmost comma-separated part that names a known city.
     
     Args:
         address: Address string
@@ -69,23 +190,49 @@ def geocode_address(address: str) -> Optional[Tuple[float, float]]:
     Returns:
         Tuple of (latitude, longitude) or None
     """
-    # TODO: Implement with Google Maps API or similar service
-    # For now, return None
+    if not address:
+        return None
+    
+    match = PINCODE_PATTERN.search(address)
+    if match:
+        coordinates = geocode_place(pincode=match.group(1))
+        if coordinates:
+            return coordinates
+    
+    parts = [PINCODE_PATTERN.sub('', part).strip() for part in address.split(',')]
+    for part in reversed(parts):
+        if part:
+            coordinates = geocode_place(city=part)
+            if coordinates:
+                return coordinates
     return None
 
 
 def reverse_geocode(latitude: float, longitude: float) -> Optional[Dict]:
     """
-    Reverse geocode coordinates to address
-    Note: This is a placeholder. Implement with actual geocoding service
+    Reverse geocode coordinates to the nearest known place
     
     Args:
         latitude: Latitude
         longitude: Longitude
         
     Returns:
-        Dict with address components or None
+        Dict with city, state, country and distance_km, or None if nothing
+        is within 50 km
     """
-    # TODO: Implement with Google Maps API or similar service
-    # For now, return None
-    return None
+    # ~10 m grid, so nearby repeat lookups share a cache entry
+    place = _nearest_place(round(latitude, 4), round(longitude, 4))
+    return dict(place) if place else None
+
+
+@lru_cache(maxsize=4096)
+def _nearest_place(latitude: float, longitude: float) -> Optional[Dict]:
+    place = get_gazetteer().nearest(latitude, longitude)
+    if place is None:
+        return None
+    return {
+        'city': place['city'],
+        'state': place['state'],
+        'country': place['country'],
+        'distance_km': place['distance_km']
+    }
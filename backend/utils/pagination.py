@@ -0,0 +1,166 @@
+import base64
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplies a malformed pagination cursor"""
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """
+    Encode a (datetime, id) keyset position into an opaque cursor
+    
+    Args:
+        sort_value: Value of the sort column for the last row returned
+        row_id: Primary key of the last row returned
+    
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Opaque cursor string from a previous response
+    
+    Returns:
+        Tuple of (sort_value, row_id)
+    
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError('Invalid cursor')
+
+
+def keyset_filter(sort_column, id_column, cursor: str, descending: bool = False):
+    """
+    Build the WHERE clause that resumes a (sort_column, id) ordering after a cursor
+    
+    Args:
+        sort_column: Column the query is ordered by
+        id_column: Primary key column used as tie-breaker
+        cursor: Cursor returned with the previous page
+        descending: True if the query is ordered newest first
+    
+    Returns:
+        SQLAlchemy boolean clause
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id)
+        )
+    return or_(
+        sort_column > sort_value,
+        and_(sort_column == sort_value, id_column > row_id)
+    )
+
+
+def keyset_page(query, per_page: int, sort_attr: str) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one keyset page without issuing a COUNT query
+    
+    Args:
+        query: Ordered query with any cursor filter already applied
+        per_page: Items per page
+        sort_attr: Name of the sort attribute on the returned rows
+    
+    Returns:
+        Tuple of (items, next_cursor); next_cursor is None on the last page
+    """
+    rows = query.limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+    
+    items = rows[:per_page]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, sort_attr), last.id)
+
+
+def offset_page(query, page: int, per_page: int) -> Tuple[list, int]:
+    """
+    Fetch one page-number page and the total row count
+    
+    Works on any session's Query (Flask-SQLAlchemy's paginate() needs
+    db.session).
+    
+    Args:
+        query: Ordered query
+        page: 1-based page number
+        per_page: Items per page
+    
+    Returns:
+        Tuple of (items, total)
+    """
+    total = query.order_by(None).count()
+    items = query.offset((page - 1) * per_page).limit(per_page).all()
+    return items, total
+
+
+class CountCache:
+    """Small TTL cache for approximate totals in cursor pagination"""
+    
+    def __init__(self, ttl_seconds: int = 60, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], int]) -> int:
+        """Return a cached count for key, computing it if missing or stale"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+        
+        value = compute()
+        self._entries[key] = (now + self.ttl_seconds, value)
+        return value
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def cursor_pagination(per_page: int, next_cursor: Optional[str],
+                      total: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Create the pagination block returned in cursor mode
+    
+    Args:
+        per_page: Items per page
+        next_cursor: Cursor for the next page, None on the last page
+        total: Approximate total, only present when requested
+    
+    Returns:
+        Dict with pagination data
+    """
+    pagination = {
+        'mode': 'cursor',
+        'per_page': per_page,
+        'next_cursor': next_cursor,
+        'has_next': next_cursor is not None
+    }
+    if total is not None:
+        pagination['total'] = total
+        pagination['total_is_approximate'] = True
+    return pagination
@@ -0,0 +1,307 @@
+import re
+import time
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PLACE_KINDS = ('city', 'state', 'country', 'venue')
+
+
+def normalize_place(value: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form of a place name"""
+    return ' '.join(re.findall(r'\w+', (value or '').casefold()))
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index over place names
+    
+    Every place is filed under its normalized name and under each later
+    word of it ("new delhi" and "delhi"), so typing any word start finds
+    it. A lookup is a binary search to the first key with the prefix and a
+    scan of the matching run; nothing else is touched.
+    
+    Places are stored as [kind, label, events, owners, key length] where
+    events and owners count the rows using the name. Suggestions rank
+    matches on the start of the name first, then by events, then owners.
+    Results are memoized until the next add(), which keeps one- and
+    two-letter prefixes (the longest scans) cheap on repeat.
+    """
+    
+    MAX_CACHED_RESULTS = 4096
+    
+    def __init__(self):
+        self._keys: List[Tuple[str, int]] = []
+        self._places: List[list] = []
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._results: Dict[tuple, List[Dict]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._places)
+    
+    def add(self, kind: str, label: Optional[str], events: int = 0, owners: int = 0) -> None:
+        """Add a place name or change the counts of an existing one"""
+        normalized = normalize_place(label)
+        if not normalized:
+            return
+        
+        place_id = self._ids.get((kind, normalized))
+        if place_id is not None:
+            place = self._places[place_id]
+            place[2] = max(place[2] + events, 0)
+            place[3] = max(place[3] + owners, 0)
+            self._results = {}
+            return
+        if events <= 0 and owners <= 0:
+            return
+        self._results = {}
+        
+        place_id = len(self._places)
+        self._places.append([kind, label.strip(), events, owners, len(normalized)])
+        self._ids[(kind, normalized)] = place_id
+        words = normalized.split(' ')
+        for start in range(len(words)):
+            insort(self._keys, (' '.join(words[start:]), place_id))
+    
+    def suggest(self, prefix: str, limit: int = 10,
+                kinds: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Best matching places for a typed prefix
+        
+        Args:
+            prefix: Text typed so far
+            limit: Maximum suggestions
+            kinds: Place kinds to include (default all)
+        
+        Returns:
+            List of suggestion dicts, best first
+        """
+        prefix = normalize_place(prefix)
+        if not prefix:
+            return []
+        kinds = frozenset(kinds) if kinds else None
+        cache_key = (prefix, limit, kinds)
+        results = self._results.get(cache_key)
+        if results is not None:
+            return results
+        
+        keys = self._keys
+        places = self._places
+        candidates = {}
+        index = bisect_left(keys, (prefix,))
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            key, place_id = keys[index]
+            index += 1
+            kind, label, events, owners, name_length = places[place_id]
+            if kinds and kind not in kinds:
+                continue
+            rank = (len(key) != name_length, -events, -owners, label)
+            if place_id not in candidates or rank < candidates[place_id]:
+                candidates[place_id] = rank
+        
+        best = heapq.nsmallest(limit, candidates.items(), key=lambda item: item[1])
+        results = [
+            {'type': places[place_id][0], 'value': places[place_id][1],
+             'events': places[place_id][2]}
+            for place_id, _ in best
+        ]
+        
+        if len(self._results) >= self.MAX_CACHED_RESULTS:
+            self._results = {}
+        self._results[cache_key] = results
+        return results
+
+
+class PlaceIndex:
+    """
+    Process-wide autocomplete index of city, state, country and venue names
+    
+    Built from the events and owners tables on the first suggest() call in
+    each process, which waits for it. Events created by this process are
+    added straight away; events created elsewhere are picked up every
+    `sync_interval` seconds by ID, and the whole index is rebuilt every
+    `rebuild_interval` seconds so counts from edited or removed rows settle.
+    Those refreshes run on a background thread and swap in their results,
+    so after the first build suggestions never wait on the database.
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self.sync_interval = 60.0
+        self.rebuild_interval = 3600.0
+        self._index = PrefixIndex()
+        self._last_event_id = 0
+        self._added_event_ids = set()
+        self._next_sync = 0.0
+        self._next_rebuild = 0.0
+        self._refreshing = False
+        self._built = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.app = app
+        self.sync_interval = app.config.get('PLACE_INDEX_SYNC_INTERVAL', 60.0)
+        self.rebuild_interval = app.config.get('PLACE_INDEX_REBUILD_INTERVAL', 3600.0)
+    
+    def suggest(self, prefix: str, limit: int = 10,
+                kinds: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Ranked place suggestions for a typed prefix (queries only on first use)"""
+        if not self._built:
+            self._build_once()
+        elif time.monotonic() >= self._next_sync:
+            self._start_refresh()
+        return self._index.suggest(prefix, limit, kinds)
+    
+    def add_event(self, event) -> None:
+        """Index the place names of an event created by this process"""
+        self.add_events([event])
+    
+    def add_events(self, events) -> None:
+        """Index the place names of a batch of events created by this process"""
+        with self._lock:
+            for event in events:
+                self._add_event_places(self._index, event.city, event.state,
+                                       event.country, event.venue_name, 1)
+                self._added_event_ids.add(event.id)
+    
+    def update_owner(self, owner, previous: Tuple[Optional[str], ...]) -> None:
+        """
+        Move an owner's counts from their old place names to their new ones
+        
+        Args:
+            owner: Owner with the updated city/state/country
+            previous: Their (city, state, country) before the update
+        """
+        with self._lock:
+            for kind, old in zip(('city', 'state', 'country'), previous):
+                new = getattr(owner, kind)
+                if normalize_place(old) == normalize_place(new):
+                    continue
+                self._index.add(kind, old, owners=-1)
+                self._index.add(kind, new, owners=1)
+    
+    def sync(self) -> None:
+        """
+        Pull events created by other processes, or rebuild when due
+        
+        Queries the database outside the lock and swaps results in, so it
+        never blocks suggestions. Needs an app context.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_sync:
+                return
+            self._next_sync = now + self.sync_interval
+            rebuild = now >= self._next_rebuild
+            if rebuild:
+                self._next_rebuild = now + self.rebuild_interval
+        
+        try:
+            if rebuild:
+                self._rebuild()
+            else:
+                self._load_new_events()
+        except Exception as e:
+            if rebuild:
+                self._next_rebuild = 0.0
+            logger.error(f"Error syncing place index: {str(e)}")
+    
+    def _build_once(self) -> None:
+        """First build for this process, in the caller's app context"""
+        with self._build_lock:
+            if self._built:
+                return
+            now = time.monotonic()
+            try:
+                self._rebuild()
+            except Exception as e:
+                # Serve the empty index this time; the next call retries
+                logger.error(f"Error building place index: {str(e)}")
+                return
+            self._next_sync = now + self.sync_interval
+            self._next_rebuild = now + self.rebuild_interval
+            self._built = True
+    
+    def _start_refresh(self) -> None:
+        """Run a due sync on a background thread, at most one at a time"""
+        with self._lock:
+            if self._refreshing or self.app is None:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name='place-index-refresh', daemon=True).start()
+    
+    def _refresh(self) -> None:
+        try:
+            with self.app.app_context():
+                self.sync()
+        finally:
+            self._refreshing = False
+    
+    def _rebuild(self) -> None:
+        from models import db, Owner, Event
+        from sqlalchemy import func
+        
+        index = PrefixIndex()
+        rows = db.session.query(
+            Event.city, Event.state, Event.country, Event.venue_name,
+            func.count(Event.id), func.max(Event.id)
+        ).filter(Event.is_active == True).group_by(
+            Event.city, Event.state, Event.country, Event.venue_name
+        )
+        last_event_id = 0
+        for city, state, country, venue_name, count, max_id in rows:
+            self._add_event_places(index, city, state, country, venue_name, count)
+            last_event_id = max(last_event_id, max_id)
+        
+        rows = db.session.query(
+            Owner.city, Owner.state, Owner.country, func.count(Owner.id)
+        ).filter(
+            Owner.is_active == True,
+            Owner.is_deleted == False
+        ).group_by(Owner.city, Owner.state, Owner.country)
+        for city, state, country, count in rows:
+            index.add('city', city, owners=count)
+            index.add('state', state, owners=count)
+            index.add('country', country, owners=count)
+        
+        # Swap in one step; lookups in flight keep the old index. Events this
+        # process added meanwhile went to the old index, so forget them and
+        # let the next sync load them by ID
+        with self._lock:
+            self._index = index
+            self._last_event_id = last_event_id
+            self._added_event_ids.clear()
+    
+    def _load_new_events(self) -> None:
+        """Add events created since the last sync, skipping ones added locally"""
+        from models import db, Event
+        
+        rows = db.session.query(
+            Event.id, Event.city, Event.state, Event.country, Event.venue_name
+        ).filter(
+            Event.id > self._last_event_id,
+            Event.is_active == True
+        ).order_by(Event.id).all()
+        
+        with self._lock:
+            for event_id, city, state, country, venue_name in rows:
+                if event_id not in self._added_event_ids:
+                    self._add_event_places(self._index, city, state, country, venue_name, 1)
+                self._last_event_id = max(self._last_event_id, event_id)
+            self._added_event_ids = {
+                event_id for event_id in self._added_event_ids if event_id > self._last_event_id
+            }
+    
+    def _add_event_places(self, index: PrefixIndex, city, state, country,
+                          venue_name, count: int) -> None:
+        index.add('city', city, events=count)
+        index.add('state', state, events=count)
+        index.add('country', country, events=count)
+        index.add('venue', venue_name, events=count)
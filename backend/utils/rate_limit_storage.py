@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from limits.storage import Storage
+from sqlalchemy import case, create_engine, delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+
+class _Lease:
+    """Per-process view of one shared counter"""
+    
+    __slots__ = ('shared_count', 'pending', 'window_end', 'next_sync', 'syncing')
+    
+    def __init__(self):
+        self.shared_count = 0  # Count in the database at last sync
+        self.pending = 0  # Local hits not yet written
+        self.window_end = 0.0
+        self.next_sync = 0.0
+        self.syncing = False  # A thread is writing this lease's hits
+
+
+class DatabaseStorage(Storage):
+    """
+    Flask-Limiter storage backed by the app database (SQLite or PostgreSQL)
+    
+    Counters live in the rate_limit_counters table so limits hold across
+    workers and serverless instances without Redis. Each process hands out
+    up to `batch_size` hits per key locally (its lease) and writes them as one
+    upsert, or sooner once `sync_interval` seconds have passed, so most
+    requests never touch storage. A window can overshoot by at most
+    batch_size hits per live instance.
+    
+    The lock only guards the in-memory leases; the upsert runs outside it,
+    one sync per key at a time, so a slow write never stalls requests for
+    other keys. Like the app's own engine it uses NullPool, so idle
+    serverless instances hold no connections.
+    
+    Selected with RATELIMIT_STORAGE_URI = "db://" and
+    RATELIMIT_STORAGE_OPTIONS = {"database_url": ...}. The table is the
+    RateLimitCounter model, created with the rest of the schema.
+    """
+    
+    STORAGE_SCHEME = ['db']
+    
+    CLEANUP_EVERY = 500  # Syncs between deletes of expired counters
+    
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False,
+                 database_url: Optional[str] = None, batch_size: int = 10,
+                 sync_interval: float = 1.0, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.database_url = database_url
+        self.batch_size = int(batch_size)
+        self.sync_interval = float(sync_interval)
+        self._engine = None
+        self._table = None
+        self._leases: Dict[str, _Lease] = {}
+        self._lock = threading.Lock()
+        self._syncs = 0
+    
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+    
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is None or lease.window_end <= now:
+                lease = self._leases[key] = _Lease()
+            
+            lease.pending += amount
+            if lease.syncing or (lease.pending < self.batch_size and now < lease.next_sync):
+                return lease.shared_count + lease.pending
+            
+            # Take the pending hits and write them without holding the lock
+            lease.syncing = True
+            flush = lease.pending
+            lease.pending = 0
+        
+        try:
+            count, expires_at = self._sync(key, flush, expiry, now)
+        except Exception:
+            with self._lock:
+                lease.pending += flush
+                lease.syncing = False
+            raise
+        
+        with self._lock:
+            lease.shared_count = count
+            lease.window_end = expires_at
+            lease.next_sync = now + self.sync_interval
+            lease.syncing = False
+            return lease.shared_count + lease.pending
+    
+    def get(self, key: str) -> int:
+        lease = self._leases.get(key)
+        if lease is not None and lease.window_end > time.time():
+            return lease.shared_count + lease.pending
+        
+        count, _ = self._read(key)
+        return count
+    
+    def get_expiry(self, key: str) -> float:
+        lease = self._leases.get(key)
+        if lease is not None and lease.window_end > time.time():
+            return lease.window_end
+        
+        _, expires_at = self._read(key)
+        return expires_at or time.time()
+    
+    def check(self) -> bool:
+        try:
+            with self._get_engine().connect() as connection:
+                connection.execute(select(1))
+            return True
+        except SQLAlchemyError:
+            return False
+    
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            self._leases.clear()
+        with self._get_engine().begin() as connection:
+            return connection.execute(delete(self._table)).rowcount
+    
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._leases.pop(key, None)
+        with self._get_engine().begin() as connection:
+            connection.execute(delete(self._table).where(self._table.c.key == key))
+    
+    def _sync(self, key: str, hits: int, expiry: int, now: float) -> Tuple[int, float]:
+        """Add hits to the shared counter; returns its new count and expiry"""
+        table = self._get_table()
+        insert = self._insert_for_dialect()
+        statement = insert(table).values(key=key, count=hits, expires_at=now + expiry)
+        expired = table.c.expires_at <= now
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                'count': case((expired, statement.excluded.count),
+                              else_=table.c.count + statement.excluded.count),
+                'expires_at': case((expired, statement.excluded.expires_at),
+                                   else_=table.c.expires_at)
+            }
+        ).returning(table.c.count, table.c.expires_at)
+        
+        with self._get_engine().begin() as connection:
+            count, expires_at = connection.execute(statement).one()
+            
+            self._syncs += 1
+            if self._syncs % self.CLEANUP_EVERY == 0:
+                connection.execute(delete(table).where(table.c.expires_at <= now))
+        
+        return count, expires_at
+    
+    def _read(self, key: str) -> Tuple[int, Optional[float]]:
+        table = self._get_table()
+        with self._get_engine().connect() as connection:
+            row = connection.execute(
+                select(table.c.count, table.c.expires_at).where(table.c.key == key)
+            ).first()
+        if row is None or row.expires_at <= time.time():
+            return 0, None
+        return row.count, row.expires_at
+    
+    def _insert_for_dialect(self):
+        dialect = self._get_engine().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise NotImplementedError(f"Rate limit storage does not support {dialect}")
+        return insert
+    
+    def _get_table(self):
+        if self._table is None:
+            self._get_engine()
+        return self._table
+    
+    def _get_engine(self):
+        """Create the engine on first use, off the cold-start path"""
+        if self._engine is None:
+            if not self.database_url:
+                raise ValueError('database_url storage option is required')
+            from models import RateLimitCounter
+            engine = create_engine(self.database_url, poolclass=NullPool)
+            self._table = RateLimitCounter.__table__
+            self._engine = engine
+        return self._engine
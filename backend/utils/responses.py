@@ -2,6 +2,26 @@ from typing import Any, Dict
 from flask import jsonify
 
 
+def success_body(data: Any = None) -> Dict:
+    """Standard success envelope, shared with the ASGI entry point"""
+    response = {'success': True}
+    if data is not None:
+        response['data'] = data
+    return response
+
+
+def error_body(message: str, details: Any = None) -> Dict:
+    """Standard error envelope, shared with the ASGI entry point"""
+    response = {
+        'success': False,
+        'error': message
+    }
+    
+    if details is not None:
+        response['details'] = details
+    return response
+
+
 def success_response(data: Any = None, status_code: int = 200) -> tuple:
     """
     Create a standardized success response
@@ -13,11 +33,7 @@ def success_response(data: Any = None, status_code: int = 200) -> tuple:
     Returns:
         Flask response tuple
     """
-    response = {'success': True}
-    if data is not None:
-        response['data'] = data
-    
-    return jsonify(response), status_code
+    return jsonify(success_body(data)), status_code
 
 
 def error_response(message: str, status_code: int = 400, details: Any = None) -> tuple:
@@ -32,15 +48,7 @@ def error_response(message: str, status_code: int = 400, details: Any = None) ->
     Returns:
         Flask response tuple
     """
-    response = {
-        'success': False,
-        'error': message
-    }
-    
-    if details is not None:
-        response['details'] = details
-    
-    return jsonify(response), status_code
+    return jsonify(error_body(message, details)), status_code
 
 
 def paginated_response(items: list, page: int, per_page: int, total: int) -> Dict:
@@ -3,7 +3,6 @@ import logging
 import os
 from typing import Dict, Any
 from enum import Enum
-import requests
 import inspect
 
 logger = logging.getLogger(__name__)
@@ -39,6 +38,14 @@ def validate_payload(channel: str, payload: Dict[str, Any]) -> bool:
         return False
 
 
+def is_configured(channel: str = "backend_log") -> bool:
+    """Whether a channel has a webhook to post to"""
+    try:
+        return bool(SlackChannel[channel.upper()].value.get('webhook'))
+    except KeyError:
+        return False
+
+
 def send_to_slack(payload: Dict[str, Any], channel: str = "backend_log") -> bool:
     """
     Send structured payload to Slack channel
@@ -61,6 +68,9 @@ def send_to_slack(payload: Dict[str, Any], channel: str = "backend_log") -> bool
     if not validate_payload(channel, payload):
         return False
     
+    # Imported here to keep requests out of the cold-start import path
+    import requests
+    
     try:
         # Get channel configuration
         channel_config = SlackChannel[channel.upper()].value
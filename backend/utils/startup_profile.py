@@ -0,0 +1,66 @@
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+
+def profile_imports(target: str = 'app', cwd: Optional[str] = None) -> List[Dict]:
+    """
+    Measure import time per module for a fresh interpreter importing target
+    
+    Runs `python -X importtime -c "import <target>"` in a subprocess so the
+    numbers reflect a cold start, not the already-warm current process.
+    
+    Args:
+        target: Module to import
+        cwd: Working directory for the subprocess (defaults to current)
+        
+    Returns:
+        List of dicts with module, depth, self_ms and cumulative_ms,
+        in import order
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+    return entries
+
+
+def format_report(entries: List[Dict], top: int = 20, max_depth: int = 1) -> str:
+    """
+    Format the slowest imports as a table
+    
+    Args:
+        entries: Output of profile_imports
+        top: Number of rows to show
+        max_depth: Only show modules imported at most this many levels deep
+        
+    Returns:
+        Report text
+    """
+    total_ms = sum(entry['self_ms'] for entry in entries)
+    rows = sorted(
+        (entry for entry in entries if entry['depth'] <= max_depth),
+        key=lambda entry: entry['cumulative_ms'],
+        reverse=True
+    )[:top]
+    
+    lines = [f"{'cumulative_ms':>14} {'self_ms':>9}  module"]
+    for entry in rows:
+        indent = '  ' * entry['depth']
+        lines.append(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  {indent}{entry['module']}")
+    lines.append(f"total import time: {total_ms:.1f} ms across {len(entries)} modules")
+    return '\n'.join(lines)
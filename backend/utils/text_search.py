@@ -0,0 +1,143 @@
+"""
+Full-text index over event name, description, venue_name and event_type
+
+PostgreSQL: a generated, weighted tsvector column (events.search_vector)
+with a GIN index. SQLite: an external-content FTS5 table (events_fts) kept
+in sync by triggers. Either way the index follows every insert, update and
+delete on events without application code. The DDL runs after the events
+table is created; install() adds it to an existing database.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DDL, event, func, literal, literal_column, or_, column, table
+
+TEXT_SEARCH_CONFIG = 'english'
+
+POSTGRES_DDL = [
+    f"""
+    ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}',
+                                  coalesce(event_type, '') || ' ' || coalesce(venue_name, '')), 'B') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'C')
+        ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)"
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        name, description, venue_name, event_type,
+        content='events', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    # Column weights for the built-in rank (bm25), name counting most
+    "INSERT INTO events_fts(events_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 4.0, 4.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, name, description, venue_name, event_type)
+        VALUES (new.id, new.name, new.description, new.venue_name, new.event_type);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, name, description, venue_name, event_type)
+        VALUES ('delete', old.id, old.name, old.description, old.venue_name, old.event_type);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_update
+    AFTER UPDATE OF name, description, venue_name, event_type ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, name, description, venue_name, event_type)
+        VALUES ('delete', old.id, old.name, old.description, old.venue_name, old.event_type);
+        INSERT INTO events_fts(rowid, name, description, venue_name, event_type)
+        VALUES (new.id, new.name, new.description, new.venue_name, new.event_type);
+    END
+    """
+]
+
+_events_fts = table('events_fts', column('rowid'), column('rank'))
+
+
+def register(events_table) -> None:
+    """Create the index whenever the events table itself is created"""
+    for statement in POSTGRES_DDL:
+        event.listen(events_table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    for statement in SQLITE_DDL:
+        event.listen(events_table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+
+def install(connection) -> bool:
+    """
+    Add the index to an existing events table and index current rows
+    
+    Args:
+        connection: Connection inside the caller's transaction
+    
+    Returns:
+        False if the database has no supported full-text engine
+    """
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRES_DDL:
+            connection.exec_driver_sql(statement)
+        return True
+    if dialect == 'sqlite':
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+        return True
+    return False
+
+
+def search_terms(search_text: Optional[str]) -> List[str]:
+    """Words in user search text, ignoring punctuation and query syntax"""
+    return re.findall(r'\w+', search_text or '')
+
+
+def apply_text_search(query, event_model, search_text: str, dialect: str) -> Tuple:
+    """
+    Narrow an Event query to rows matching search_text
+    
+    Every word must match; the last one also matches as a prefix so
+    partially typed words still find results.
+    
+    Args:
+        query: Event query
+        event_model: The Event model
+        search_text: Raw user input
+        dialect: Name of the session's database dialect
+    
+    Returns:
+        Tuple of (filtered query, relevance expression, higher is better)
+    """
+    terms = search_terms(search_text)
+    
+    if dialect == 'postgresql':
+        prefix_query = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+        tsquery = func.to_tsquery(TEXT_SEARCH_CONFIG, prefix_query)
+        vector = literal_column('events.search_vector')
+        return query.filter(vector.op('@@')(tsquery)), func.ts_rank_cd(vector, tsquery)
+    
+    if dialect == 'sqlite':
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        query = query.join(_events_fts, _events_fts.c.rowid == event_model.id).filter(
+            literal_column('events_fts').op('MATCH')(' '.join(quoted))
+        )
+        # FTS5 rank is bm25, where lower means more relevant
+        return query, -_events_fts.c.rank
+    
+    # No full-text engine: substring match on every term, unranked
+    for term in terms:
+        pattern = f'%{term}%'
+        query = query.filter(or_(
+            event_model.name.ilike(pattern),
+            event_model.description.ilike(pattern),
+            event_model.venue_name.ilike(pattern),
+            event_model.event_type.ilike(pattern)
+        ))
+    return query, literal(0.0)
@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Set
+
+logger = logging.getLogger(__name__)
+
+
+class TokenDenylist:
+    """
+    In-memory set of revoked JWT IDs, bucketed by expiry hour
+    
+    Lookups are a single set membership test. Each jti is also filed under
+    the hour its token expires so whole buckets can be dropped once every
+    token in them has expired. The set is loaded from the revoked_tokens
+    table on first use and then picks up rows revoked by other processes
+    every `sync_interval` seconds.
+    """
+    
+    BUCKET_SECONDS = 3600
+    
+    def __init__(self, app=None):
+        self.app = None
+        self.sync_interval = 30.0
+        self._jtis: Set[str] = set()
+        self._buckets: Dict[int, Set[str]] = {}
+        self._last_synced_id = 0
+        self._next_sync = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.app = app
+        self.sync_interval = app.config.get('TOKEN_DENYLIST_SYNC_INTERVAL', 30.0)
+    
+    @property
+    def sync_due(self) -> bool:
+        """Whether the next is_revoked() call would query the database"""
+        return time.monotonic() >= self._next_sync
+    
+    def is_revoked(self, jti: str) -> bool:
+        """Check whether a token ID has been revoked"""
+        if self.sync_due:
+            self.sync()
+        return jti in self._jtis
+    
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """Record a revocation made by this process"""
+        with self._lock:
+            self._add(jti, expires_at)
+    
+    def sync(self) -> None:
+        """Load revocations newer than the last sync and drop expired buckets"""
+        from models import db, RevokedToken
+        
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return
+            self._next_sync = time.monotonic() + self.sync_interval
+            
+            try:
+                query = db.session.query(
+                    RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at
+                ).filter(RevokedToken.id > self._last_synced_id)
+                if not self._loaded:
+                    query = query.filter(RevokedToken.expires_at > datetime.utcnow())
+                
+                for row_id, jti, expires_at in query.order_by(RevokedToken.id):
+                    self._add(jti, expires_at)
+                    self._last_synced_id = max(self._last_synced_id, row_id)
+                self._loaded = True
+            except Exception as e:
+                logger.error(f"Error syncing token denylist: {str(e)}")
+            
+            self._evict_expired()
+    
+    def _add(self, jti: str, expires_at: datetime) -> None:
+        bucket = int(expires_at.timestamp()) // self.BUCKET_SECONDS
+        self._buckets.setdefault(bucket, set()).add(jti)
+        self._jtis.add(jti)
+    
+    def _evict_expired(self) -> None:
+        current_bucket = int(datetime.utcnow().timestamp()) // self.BUCKET_SECONDS
+        for bucket in [b for b in self._buckets if b < current_bucket]:
+            self._jtis.difference_update(self._buckets.pop(bucket))
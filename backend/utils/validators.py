@@ -1,6 +1,7 @@
 import re
 from typing import Dict, Any
 from datetime import datetime
+from utils.eligibility import species_mask, age_bounds
 
 
 def validate_email(email: str) -> bool:
@@ -120,6 +121,13 @@ def validate_event_data(data: Dict) -> Dict[str, Any]:
         except (TypeError, ValueError):
             errors.append('Invalid entry fee value')
     
+    # Validate eligibility rules
+    try:
+        species_mask(data.get('allowed_species'))
+        age_bounds(data.get('age_restrictions'))
+    except ValueError as e:
+        errors.append(str(e))
+    
     return {
         'valid': len(errors) == 0,
         'error': ', '.join(errors) if errors else None
@@ -0,0 +1,110 @@
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, update
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Write-behind buffer for Owner.last_login
+    
+    Logins record a timestamp in memory; repeated logins by the same owner
+    coalesce into one entry. Pending entries are written with a single bulk
+    UPDATE at the end of a request, once the buffer reaches `max_entries`
+    or its oldest entry is `flush_interval` seconds old. That runs inside
+    the request, so it also works on serverless instances that are frozen
+    between requests and have no background threads to rely on.
+    Interpreter shutdown flushes too, where it happens.
+    A flush_interval of 0 writes through on every login.
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self.flush_interval = 5.0
+        self.max_entries = 500
+        self._pending: Dict[int, datetime] = {}
+        self._flush_at: Optional[float] = None  # Monotonic deadline of the oldest entry
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.app = app
+        self.flush_interval = app.config.get('LAST_LOGIN_FLUSH_INTERVAL', 5.0)
+        self.max_entries = app.config.get('LAST_LOGIN_FLUSH_SIZE', 500)
+        atexit.register(self.flush)
+    
+    def record(self, owner_id: int, login_time: Optional[datetime] = None) -> None:
+        """
+        Queue a last_login update for an owner
+        
+        Args:
+            owner_id: Owner ID
+            login_time: Login timestamp (defaults to now)
+        """
+        login_time = login_time or datetime.now()
+        with self._lock:
+            current = self._pending.get(owner_id)
+            if current is None or login_time > current:
+                self._pending[owner_id] = login_time
+            if self._flush_at is None:
+                self._flush_at = time.monotonic() + self.flush_interval
+        
+        if self.flush_interval <= 0:
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write all pending last_login values in one bulk UPDATE
+        
+        Returns:
+            Number of owners updated
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_at = None
+        
+        if not pending or self.app is None:
+            return 0
+        
+        from models import db, Owner
+        
+        try:
+            # Own connection and transaction so the caller's session is untouched
+            with self.app.app_context():
+                with db.engine.begin() as connection:
+                    connection.execute(
+                        update(Owner.__table__).where(
+                            Owner.__table__.c.id == bindparam('owner_id')
+                        ).values(last_login=bindparam('login_time')),
+                        [{'owner_id': owner_id, 'login_time': login_time}
+                         for owner_id, login_time in pending.items()]
+                    )
+            return len(pending)
+        
+        except Exception as e:
+            logger.error(f"Error flushing last_login updates: {str(e)}")
+            # Put entries back unless a newer login was recorded meanwhile
+            with self._lock:
+                for owner_id, login_time in pending.items():
+                    current = self._pending.get(owner_id)
+                    if current is None or login_time > current:
+                        self._pending[owner_id] = login_time
+                if self._flush_at is None:
+                    self._flush_at = time.monotonic() + self.flush_interval
+            return 0
+    
+    def flush_if_due(self) -> None:
+        """Flush when the buffer is full or its oldest entry is due (run at request teardown)"""
+        with self._lock:
+            due = self._pending and (
+                len(self._pending) >= self.max_entries or time.monotonic() >= self._flush_at
+            )
+        if due:
+            self.flush()